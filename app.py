@@ -7,9 +7,32 @@ from ta.trend import EMAIndicator, MACD
 from ta.volatility import BollingerBands, AverageTrueRange
 from ta.momentum import RSIIndicator, StochasticOscillator
 from binance.client import Client
+from binance.exceptions import BinanceAPIException
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urlparse, urljoin
+import websocket
 import numpy as np
+from PIL import Image
 import time
+import os
+import json
+import sqlite3
+import threading
+import functools
+import copy
+import pickle
+import inspect
+import io
+import hashlib
+import html
+import re
+import xml.etree.ElementTree as ET
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter, OrderedDict, deque
 
 # Get CoinGecko API Key from Streamlit secrets
 try:
@@ -88,7 +111,7 @@ def send_feedback_email(feedback_type, message, user_email):
         print(f"📤 Sending feedback to Formspree...")
         print(f"Data: {data}")
 
-        response = requests.post(
+        response = get_http_session().post(
             FORMSPREE_ENDPOINT,
             data=data,
             timeout=10
@@ -324,8 +347,8 @@ st.markdown(f"""
 </style>
 """, unsafe_allow_html=True)
 
-# Constants - Coins with >$1B market cap (Top 80+)
-SYMBOLS = {
+# Constants - Coins with >$1B market cap (Top 80+), listed first with these display names
+CURATED_SYMBOLS = {
     'Bitcoin (BTC)': 'BTCUSDT',
     'Ethereum (ETH)': 'ETHUSDT',
     'Binance Coin (BNB)': 'BNBUSDT',
@@ -408,6 +431,38 @@ SYMBOLS = {
     'Band Protocol (BAND)': 'BANDUSDT'
 }
 
+# CoinGecko ids of the curated coins (tickers are ambiguous on CoinGecko, these always win)
+COINGECKO_IDS = {
+    'BTCUSDT': 'bitcoin', 'ETHUSDT': 'ethereum', 'BNBUSDT': 'binancecoin',
+    'SOLUSDT': 'solana', 'XRPUSDT': 'ripple', 'ADAUSDT': 'cardano',
+    'AVAXUSDT': 'avalanche-2', 'DOGEUSDT': 'dogecoin', 'TRXUSDT': 'tron',
+    'DOTUSDT': 'polkadot', 'MATICUSDT': 'matic-network', 'LINKUSDT': 'chainlink',
+    'TONUSDT': 'the-open-network', 'SHIBUSDT': 'shiba-inu', 'LTCUSDT': 'litecoin',
+    'BCHUSDT': 'bitcoin-cash', 'UNIUSDT': 'uniswap', 'XLMUSDT': 'stellar',
+    'ATOMUSDT': 'cosmos', 'ETCUSDT': 'ethereum-classic', 'HBARUSDT': 'hedera-hashgraph',
+    'FILUSDT': 'filecoin', 'ARBUSDT': 'arbitrum', 'OPUSDT': 'optimism',
+    'VETUSDT': 'vechain', 'ALGOUSDT': 'algorand', 'NEARUSDT': 'near',
+    'APTUSDT': 'aptos', 'INJUSDT': 'injective-protocol', 'SUIUSDT': 'sui',
+    'RNDRUSDT': 'render-token', 'FTMUSDT': 'fantom', 'THETAUSDT': 'theta-token',
+    'XMRUSDT': 'monero', 'KASUSDT': 'kaspa', 'STXUSDT': 'blockstack',
+    'IMXUSDT': 'immutable-x', 'CROUSDT': 'crypto-com-chain', 'MNTUSDT': 'mantle',
+    'GRTUSDT': 'the-graph', 'QNTUSDT': 'quant-network', 'LDOUSDT': 'lido-dao',
+    'MKRUSDT': 'maker', 'AAVEUSDT': 'aave', 'ARUSDT': 'arweave',
+    'TIAUSDT': 'celestia', 'SEIUSDT': 'sei-network', 'RUNEUSDT': 'thorchain',
+    'AXSUSDT': 'axie-infinity', 'SANDUSDT': 'the-sandbox', 'MANAUSDT': 'decentraland',
+    'GALAUSDT': 'gala', 'ENJUSDT': 'enjincoin', 'FLOWUSDT': 'flow',
+    'CHZUSDT': 'chiliz', 'FLRUSDT': 'flare-networks', 'KAVAUSDT': 'kava',
+    'SNXUSDT': 'synthetix-network-token', 'CRVUSDT': 'curve-dao-token',
+    'COMPUSDT': 'compound-governance-token', 'SUSHIUSDT': 'sushi',
+    '1INCHUSDT': '1inch', 'ZILUSDT': 'zilliqa', 'ZECUSDT': 'zcash',
+    'DASHUSDT': 'dash', 'QTUMUSDT': 'qtum', 'RVNUSDT': 'ravencoin',
+    'ONEUSDT': 'harmony', 'CELOUSDT': 'celo', 'ANKRUSDT': 'ankr',
+    'IOTAUSDT': 'iota', 'WAVESUSDT': 'waves', 'HOTUSDT': 'holotoken',
+    'RENUSDT': 'republic-protocol', 'OMGUSDT': 'omisego', 'LRCUSDT': 'loopring',
+    'FETUSDT': 'fetch-ai', 'OCEANUSDT': 'ocean-protocol', 'NMRUSDT': 'numeraire',
+    'BANDUSDT': 'band-protocol'
+}
+
 # SIMPLE INTERVAL SYSTEM - Optimized timeframes for specific time ranges
 # User can scroll/zoom the chart to see historical data
 CHART_INTERVALS = {
@@ -417,6 +472,7 @@ CHART_INTERVALS = {
         'limit': 288,  # Last 24 hours (1 day)
         'ema_type': 'short',
         'range': 'Last 24 hours',
+        'cache_ttl': 30,  # Seconds before cached candles are refetched
     },
     '1h': {
         'name': '1 Hour',
@@ -424,6 +480,7 @@ CHART_INTERVALS = {
         'limit': 168,  # Last 7 days (1 week)
         'ema_type': 'mid',
         'range': 'Last 7 days',
+        'cache_ttl': 60,  # Seconds before cached candles are refetched
     },
     '4h': {
         'name': '4 Hours',
@@ -431,6 +488,7 @@ CHART_INTERVALS = {
         'limit': 180,  # Last 30 days (1 month)
         'ema_type': 'mid',
         'range': 'Last 30 days',
+        'cache_ttl': 120,  # Seconds before cached candles are refetched
     },
     '1d': {
         'name': '1 Day',
@@ -438,6 +496,7 @@ CHART_INTERVALS = {
         'limit': 365,  # Last 12 months (1 year)
         'ema_type': 'long',
         'range': 'Last 1 year',
+        'cache_ttl': 300,  # Seconds before cached candles are refetched
     },
     '1w': {
         'name': '1 Week',
@@ -445,6 +504,7 @@ CHART_INTERVALS = {
         'limit': 104,  # Last 24 months (2 years)
         'ema_type': 'long',
         'range': 'Last 2 years',
+        'cache_ttl': 900,  # Seconds before cached candles are refetched
     },
 }
 
@@ -492,22 +552,420 @@ except Exception as e:
     BINANCE_API_KEY = ""
     BINANCE_API_SECRET = ""
 
-# Initialize Binance client with error handling
-BINANCE_AVAILABLE = False
-client = None
-try:
+# Process-wide shared state reachable from worker threads. st.cache_resource only hits
+# inside a script run context, so thread pools, WebSocket and probe threads calling an
+# st.cache_resource accessor would each build (and drop) a private instance.
+@st.cache_resource
+def get_process_resources():
+    """Registry behind @process_resource - resolved in the script thread, so every rerun binds the same dict"""
+    return {'lock': threading.Lock(), 'locks': {}, 'instances': {}}
+
+PROCESS_RESOURCES = get_process_resources()
+
+def process_resource(factory=None, *, ttl=None):
+    """
+    Decorator for zero-argument factories of process-wide singletons, like
+    @st.cache_resource but usable from any thread. With ttl, the instance is rebuilt
+    by the first caller after it has aged out (others keep the old one meanwhile).
+    """
+    def decorator(factory):
+        name = factory.__qualname__
+
+        @functools.wraps(factory)
+        def wrapper():
+            entry = PROCESS_RESOURCES['instances'].get(name)
+            if entry is not None and (ttl is None or time.monotonic() - entry[1] < ttl):
+                return entry[0]
+
+            with PROCESS_RESOURCES['lock']:
+                lock = PROCESS_RESOURCES['locks'].setdefault(name, threading.Lock())
+            with lock:
+                entry = PROCESS_RESOURCES['instances'].get(name)
+                if entry is None or (ttl is not None and time.monotonic() - entry[1] >= ttl):
+                    entry = (factory(), time.monotonic())
+                    PROCESS_RESOURCES['instances'][name] = entry
+            return entry[0]
+
+        def clear():
+            """Drop the instance; the next call builds a new one"""
+            PROCESS_RESOURCES['instances'].pop(name, None)
+
+        wrapper.clear = clear
+        return wrapper
+
+    return decorator(factory) if factory is not None else decorator
+
+# Binance request weight limits per minute (spot API and USDⓈ-M futures API)
+BINANCE_WEIGHT_LIMITS = {'spot': 6000, 'fapi': 2400}
+BINANCE_WEIGHT_HEADROOM = 0.8  # Only use 80% of the limit, the rest is safety margin
+BINANCE_WEIGHT_MAX_WAIT = 2.0  # Seconds a request may queue for weight before it is shed
+
+# (API, request weight) per endpoint, see https://developers.binance.com/docs/binance-spot-api-docs/rest-api/limits
+BINANCE_ENDPOINT_WEIGHTS = {
+    'ping': ('spot', 1),
+    'klines': ('spot', 2),
+    'ticker_24hr': ('spot', 2),
+    'ticker_24hr_all': ('spot', 80),
+    'depth': ('spot', 5),  # Depends on limit, see order_book_weight
+    'recent_trades': ('spot', 25),
+    'agg_trades': ('spot', 4),
+    'exchange_info': ('spot', 20),
+    'fapi_exchange_info': ('fapi', 1),
+    'fapi_open_interest': ('fapi', 1),
+    'fapi_ticker_price': ('fapi', 1),
+    'fapi_long_short_ratio': ('fapi', 1),
+    'fapi_open_interest_hist': ('fapi', 1),
+}
+
+def order_book_weight(limit):
+    """Request weight of the spot order book endpoint for a given depth limit"""
+    if limit <= 100:
+        return 5
+    elif limit <= 500:
+        return 25
+    elif limit <= 1000:
+        return 50
+    return 250
+
+class BinanceRateLimited(Exception):
+    """Raised when a Binance request is shed to stay under the request weight limit"""
+
+class BinanceWeightGovernor:
+    """
+    Process-wide token bucket per Binance API. Tokens refill at the per-minute limit,
+    and are re-synced from the X-MBX-USED-WEIGHT-1M header of every response so
+    weight used by other clients on the same IP is accounted for. A 429/418 response
+    blocks the API until its Retry-After has passed.
+    """
+
+    def __init__(self, limits, headroom):
+        self._cond = threading.Condition()
+        self._capacity = {api: limit * headroom for api, limit in limits.items()}
+        self._tokens = dict(self._capacity)
+        self._updated = {api: time.monotonic() for api in limits}
+        self._banned_until = {api: 0.0 for api in limits}
+
+    def _refill(self, api, now):
+        rate = self._capacity[api] / 60
+        self._tokens[api] = min(self._capacity[api], self._tokens[api] + (now - self._updated[api]) * rate)
+        self._updated[api] = now
+
+    def acquire(self, api, weight, max_wait=BINANCE_WEIGHT_MAX_WAIT):
+        """Take `weight` tokens, waiting up to max_wait seconds; raise BinanceRateLimited otherwise"""
+        deadline = time.monotonic() + max_wait
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if now < self._banned_until[api]:
+                    raise BinanceRateLimited(f"Binance {api} API banned for {self._banned_until[api] - now:.0f}s")
+
+                self._refill(api, now)
+                if self._tokens[api] >= weight:
+                    self._tokens[api] -= weight
+                    return
+
+                wait = (weight - self._tokens[api]) / (self._capacity[api] / 60)
+                if now + wait > deadline:
+                    raise BinanceRateLimited(f"Binance {api} API weight exhausted, request shed")
+                self._cond.wait(wait)
+
+    def available(self, api):
+        """Fraction of the API's weight budget currently available (0 while banned)"""
+        with self._cond:
+            now = time.monotonic()
+            if now < self._banned_until[api]:
+                return 0.0
+            self._refill(api, now)
+            return self._tokens[api] / self._capacity[api]
+
+    def observe(self, response, *args, **kwargs):
+        """requests response hook - sync the bucket with Binance's own used-weight counter"""
+        if 'fapi.binance.com' in response.url:
+            api = 'fapi'
+        elif 'binance.com' in response.url:
+            api = 'spot'
+        else:
+            return
+
+        used = response.headers.get('X-MBX-USED-WEIGHT-1M') or response.headers.get('X-MBX-USED-WEIGHT')
+        with self._cond:
+            self._refill(api, time.monotonic())
+            if used is not None:
+                self._tokens[api] = min(self._tokens[api], self._capacity[api] - int(used))
+
+            if response.status_code in (418, 429):
+                retry_after = int(response.headers.get('Retry-After', 60))
+                self._banned_until[api] = time.monotonic() + retry_after
+                self._tokens[api] = 0
+                print(f"🚫 Binance {api} API returned {response.status_code}, backing off for {retry_after}s")
+
+@process_resource
+def get_binance_governor():
+    """Shared request weight governor for all sessions in this process"""
+    return BinanceWeightGovernor(BINANCE_WEIGHT_LIMITS, BINANCE_WEIGHT_HEADROOM)
+
+# Negative cache for symbol/endpoint pairs that keep failing (delisted or unknown symbols)
+NEGATIVE_CACHE_TTL = 60  # First backoff, doubled on every further failure
+NEGATIVE_CACHE_MAX_TTL = 6 * 3600
+BINANCE_INVALID_SYMBOL_CODE = -1121
+
+class SymbolUnavailable(Exception):
+    """Raised without calling upstream while a symbol/endpoint pair is negatively cached"""
+
+class NegativeCache:
+    """Failing (endpoint, symbol) pairs with an exponential backoff TTL"""
+
+    def __init__(self, ttl, max_ttl):
+        self._lock = threading.Lock()
+        self._ttl = ttl
+        self._max_ttl = max_ttl
+        self._entries = {}  # (endpoint, symbol) -> (blocked until, failures, reason)
+
+    def check(self, endpoint, symbol):
+        """Raise SymbolUnavailable while the pair is blocked"""
+        with self._lock:
+            entry = self._entries.get((endpoint, symbol))
+        if entry is not None and time.monotonic() < entry[0]:
+            raise SymbolUnavailable(f"{symbol} unavailable on {endpoint}: {entry[2]} (cached)")
+
+    def record_failure(self, endpoint, symbol, reason):
+        with self._lock:
+            failures = self._entries.get((endpoint, symbol), (0, 0, None))[1] + 1
+            ttl = min(self._ttl * 2 ** (failures - 1), self._max_ttl)
+            self._entries[(endpoint, symbol)] = (time.monotonic() + ttl, failures, reason)
+        print(f"🚫 {symbol} unavailable on {endpoint} ({reason}), skipping it for {ttl}s")
+
+    def record_success(self, endpoint, symbol):
+        with self._lock:
+            self._entries.pop((endpoint, symbol), None)
+
+@process_resource
+def get_negative_cache():
+    """Shared negative cache for all sessions in this process"""
+    return NegativeCache(NEGATIVE_CACHE_TTL, NEGATIVE_CACHE_MAX_TTL)
+
+def binance_call(endpoint, func, *args, weight=None, **kwargs):
+    """
+    Call a Binance endpoint after reserving its request weight with the governor.
+    Symbols Binance rejects as invalid are negatively cached per endpoint.
+    """
+    symbol = kwargs.get('symbol')
+    if symbol is not None:
+        get_negative_cache().check(endpoint, symbol)
+
+    api, default_weight = BINANCE_ENDPOINT_WEIGHTS.get(endpoint, ('spot', 1))
+    get_binance_governor().acquire(api, default_weight if weight is None else weight)
+    try:
+        return func(*args, **kwargs)
+    except BinanceAPIException as e:
+        if symbol is not None and e.code == BINANCE_INVALID_SYMBOL_CODE:
+            get_negative_cache().record_failure(endpoint, symbol, e.message)
+            raise SymbolUnavailable(f"{symbol} unavailable on {endpoint}: {e.message}") from e
+        raise
+
+# Shared HTTP connection pools (keep-alive, so repeat fetches skip the TCP+TLS handshake)
+HTTP_POOL_SIZES = {
+    'https://api.binance.com': 16,
+    'https://fapi.binance.com': 16,
+    'https://api.coingecko.com': 8,
+    'https://min-api.cryptocompare.com': 4,
+    'https://api.alternative.me': 4,
+    'https://open-api.coinglass.com': 4,
+}
+HTTP_DEFAULT_POOL_SIZE = 4
+
+# Circuit breaker per provider: after repeated failures calls fail fast instead of waiting on timeouts
+PROVIDER_HOSTS = {
+    'api.binance.com': 'binance',
+    'fapi.binance.com': 'binance_futures',
+    'api.coingecko.com': 'coingecko',
+    'min-api.cryptocompare.com': 'cryptocompare',
+    'api.alternative.me': 'alternative.me',
+    'open-api.coinglass.com': 'coinglass',
+}
+# Cheap health endpoints probed in the background while a circuit is open (others get one trial request)
+PROVIDER_HEALTH_URLS = {
+    'binance': 'https://api.binance.com/api/v3/ping',
+    'binance_futures': 'https://fapi.binance.com/fapi/v1/ping',
+    'coingecko': 'https://api.coingecko.com/api/v3/ping',
+}
+CIRCUIT_FAILURE_THRESHOLD = 3  # Consecutive failures that open a circuit
+CIRCUIT_OPEN_SECONDS = 15  # First cooldown before probing, doubled after every failed probe
+CIRCUIT_MAX_OPEN_SECONDS = 300
+CIRCUIT_PROBE_TIMEOUT = 5
+
+class ProviderUnavailable(requests.exceptions.ConnectionError):
+    """Raised instead of sending a request while the provider's circuit is open"""
+
+# Health probe threads bypass their own provider's open circuit (and record the outcome themselves)
+_breaker_local = threading.local()
+
+def is_provider_failure(status_code):
+    """5xx and rate limits count against a provider - other 4xx are caller errors (e.g. invalid symbol)"""
+    return status_code >= 500 or status_code in (418, 429)
+
+class CircuitBreaker:
+    """
+    closed -> open after CIRCUIT_FAILURE_THRESHOLD consecutive failures. While open every
+    call fails fast; once the cooldown has passed the provider is probed (health endpoint
+    in the background, or a single trial request = half-open). Success closes the circuit,
+    failure re-opens it with a doubled cooldown.
+    """
+
+    def __init__(self, provider):
+        self.provider = provider
+        self._lock = threading.Lock()
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self.cooldown = CIRCUIT_OPEN_SECONDS
+        self._trial_in_flight = False
+
+    def allow(self):
+        """Whether a request may be sent now"""
+        with self._lock:
+            if self.state == 'closed':
+                return True
+            if self.state == 'open' and time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            if self._trial_in_flight:
+                return False
+
+            self.state = 'half_open'
+            self._trial_in_flight = True
+            if self.provider in PROVIDER_HEALTH_URLS:
+                threading.Thread(target=self._probe, name=f'probe-{self.provider}', daemon=True).start()
+                return False
+            return True
+
+    def _probe(self):
+        _breaker_local.bypass = True
+        try:
+            response = get_http_session().get(PROVIDER_HEALTH_URLS[self.provider], timeout=CIRCUIT_PROBE_TIMEOUT)
+            healthy = not is_provider_failure(response.status_code)
+        except Exception as e:
+            print(f"{self.provider} health probe failed: {e}")
+            healthy = False
+
+        # Recorded on this breaker directly - either outcome also ends the trial
+        if healthy:
+            self.record_success()
+        else:
+            self.record_failure()
+
+    def record_success(self):
+        with self._lock:
+            if self.state != 'closed':
+                print(f"✅ {self.provider} circuit closed")
+            self.state = 'closed'
+            self.failures = 0
+            self.cooldown = CIRCUIT_OPEN_SECONDS
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == 'half_open':
+                self.cooldown = min(self.cooldown * 2, CIRCUIT_MAX_OPEN_SECONDS)
+            elif self.state == 'closed' and self.failures < CIRCUIT_FAILURE_THRESHOLD:
+                return
+            elif self.state == 'open':
+                return
+
+            self.state = 'open'
+            self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+            print(f"🔌 {self.provider} circuit open for {self.cooldown}s after {self.failures} failures")
+
+@process_resource
+def get_circuit_breakers():
+    """Circuit breaker per provider, shared by all sessions in this process"""
+    return {provider: CircuitBreaker(provider) for provider in set(PROVIDER_HOSTS.values())}
+
+def provider_circuit_open(provider):
+    """Whether calls to provider currently fail fast"""
+    breaker = get_circuit_breakers().get(provider)
+    return breaker is not None and breaker.state != 'closed'
+
+class CircuitBreakerAdapter(HTTPAdapter):
+    """HTTPAdapter that routes every request through its provider's circuit breaker"""
+
+    def send(self, request, **kwargs):
+        breaker = get_circuit_breakers().get(PROVIDER_HOSTS.get(urlparse(request.url).hostname))
+        if breaker is None or getattr(_breaker_local, 'bypass', False):
+            return super().send(request, **kwargs)
+
+        if not breaker.allow():
+            raise ProviderUnavailable(f"{breaker.provider} circuit open, request not sent", request=request)
+
+        try:
+            response = super().send(request, **kwargs)
+        except requests.exceptions.RequestException:
+            breaker.record_failure()
+            raise
+
+        if is_provider_failure(response.status_code):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+def build_http_adapter(pool_size):
+    """
+    Adapter with keep-alive pooling, circuit breaking and retries on connect errors and
+    5xx (GET only, never on 429). Read timeouts are not retried - the server may still be
+    working on the request, and retrying would only multiply the wait and the load.
+    """
+    retry = Retry(
+        total=2,
+        connect=2,
+        read=False,  # Re-raise read timeouts as-is instead of retrying them
+        status=2,
+        backoff_factor=0.3,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset(['GET']),
+        raise_on_status=False
+    )
+    return CircuitBreakerAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+
+@process_resource
+def get_http_session():
+    """Process-wide pooled requests session used by every external fetcher"""
+    session = requests.Session()
+    session.mount('https://', build_http_adapter(HTTP_DEFAULT_POOL_SIZE))
+    for host, pool_size in HTTP_POOL_SIZES.items():
+        session.mount(host, build_http_adapter(pool_size))
+
+    # Binance fapi responses feed the shared request weight governor
+    session.hooks['response'].append(get_binance_governor().observe)
+    return session
+
+@st.cache_resource
+def get_binance_client():
+    """Create the Binance client once per process, with a tuned connection pool"""
     # Initialize with FREE API (no authentication needed for public endpoints)
     # Using empty strings for API keys to use Binance's free public data
-    client = Client("", "", {"timeout": 20})
+    binance_client = Client("", "", {"timeout": 20})
+    binance_client.session.mount('https://', build_http_adapter(HTTP_POOL_SIZES['https://api.binance.com']))
+    # Every Binance response feeds the shared request weight governor
+    binance_client.session.hooks['response'].append(get_binance_governor().observe)
+
     # Test connection with a simple request (but don't fail if ping fails)
     try:
-        client.ping()
+        binance_call('ping', binance_client.ping)
         print("✅ Binance FREE API ping successful")
     except:
         print("⚠️ Binance ping failed, but client may still work for data fetching")
 
-    BINANCE_AVAILABLE = True
     print("✅ Binance FREE API client initialized")
+    return binance_client
+
+# Initialize Binance client with error handling
+BINANCE_AVAILABLE = False
+client = None
+try:
+    client = get_binance_client()
+    BINANCE_AVAILABLE = True
 except Exception as e:
     print(f"⚠️ Warning: Unable to initialize Binance client: {e}")
     print("📊 Using CoinGecko as primary data source")
@@ -527,146 +985,1843 @@ def format_large_number(num):
     else:
         return f"${num:.2f}"
 
-# Cache functions
-# CACHE_VERSION is used to bust cache when we change data fetching logic
-CACHE_VERSION = "v2_free_api_optimized"
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution (process-wide)"""
 
-@st.cache_data(ttl=60)  # Changed from 300 to 60 for faster refresh
-def fetch_data(symbol, interval, limit, _cache_version=CACHE_VERSION):
-    """Fetch data from Binance with CoinGecko fallback and chunked fetching for large limits"""
-    if client is None:
-        # Try CoinGecko as fallback
-        return fetch_data_coingecko_fallback(symbol, limit)
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> in-flight call state
 
-    try:
-        # Binance allows max 1000 candles per request
-        if limit <= 1000:
-            # Single request
-            klines = client.get_klines(symbol=symbol, interval=interval, limit=limit)
-            print(f"📊 Fetched {len(klines)} candles for {symbol} ({interval}, limit={limit})")
-        else:
-            # Multiple requests needed - fetch in chunks backwards from now
-            all_klines = []
-            chunks_needed = (limit // 1000) + 1
-            remaining = limit
+    def do(self, key, func, *args, **kwargs):
+        """Run func once per key at a time; returns (result, shared) where shared means another caller ran it"""
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = {'done': threading.Event(), 'result': None, 'error': None}
+                self._calls[key] = call
 
-            # Start from current time and go backwards
-            end_time = int(datetime.now().timestamp() * 1000)
+        if not is_leader:
+            call['done'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result'], True
 
-            for i in range(chunks_needed):
-                try:
-                    chunk_size = min(1000, remaining)
-                    chunk = client.get_klines(
-                        symbol=symbol,
-                        interval=interval,
-                        limit=chunk_size,
-                        endTime=end_time
-                    )
+        try:
+            call['result'] = func(*args, **kwargs)
+        except Exception as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call['done'].set()
+        return call['result'], False
+
+@process_resource
+def get_single_flight():
+    """Shared in-flight call registry for all sessions in this process"""
+    return SingleFlight()
+
+def single_flight(func):
+    """
+    Decorator: concurrent calls with equal arguments share one upstream call.
+    Sits under @st.cache_data, so a TTL expiry seen by many sessions at once only
+    refetches once; callers waiting on a shared DataFrame get their own copy.
+    """
+    name = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = (name, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return func(*args, **kwargs)  # Unhashable arguments - no coalescing
+
+        result, shared = get_single_flight().do(key, func, *args, **kwargs)
+        if shared and isinstance(result, pd.DataFrame):
+            return result.copy()
+        return result
 
-                    if not chunk:
-                        break
+    return wrapper
 
-                    # Add chunk to beginning (we're going backwards)
-                    all_klines = chunk + all_klines
-                    remaining -= len(chunk)
+# Background workers refreshing stale-while-revalidate cache entries
+SWR_REFRESH_WORKERS = 4
+
+class StaleWhileRevalidateCache:
+    """
+    In-process cache that keeps serving an expired entry (up to max_stale seconds past
+    its ttl) while a background worker refreshes it. Only a cold or too-stale entry
+    makes the caller wait for the upstream call.
+    """
+
+    def __init__(self, workers):
+        self._lock = threading.Lock()
+        self._entries = {}  # key -> (value, stored_at, ttl, max_stale)
+        self._refreshing = set()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='swr-refresh')
+
+    def get(self, key, loader, ttl, max_stale):
+        """Return (value, state) where state is 'fresh', 'stale' or 'miss'"""
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if entry is not None:
+            age = time.monotonic() - entry[1]
+            if age < ttl:
+                return entry[0], 'fresh'
+            if age < ttl + max_stale:
+                self._refresh_in_background(key, loader, ttl, max_stale)
+                return entry[0], 'stale'
+
+        value = loader()
+        self._store(key, value, ttl, max_stale)
+        return value, 'miss'
+
+    def _store(self, key, value, ttl, max_stale):
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = (value, now, ttl, max_stale)
+            # Drop entries past their hard staleness limit
+            expired = [k for k, (_, stored_at, k_ttl, k_stale) in self._entries.items()
+                       if now - stored_at > k_ttl + k_stale]
+            for k in expired:
+                del self._entries[k]
+
+    def invalidate(self, predicate):
+        """Drop every entry whose key matches predicate"""
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                del self._entries[key]
+
+    def _refresh_in_background(self, key, loader, ttl, max_stale):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        # No script run context here - the loader must be a pure fetch without st.* UI calls
+        def refresh():
+            try:
+                value = loader()
+                # A failed refresh keeps serving the last good value
+                if value is None or (isinstance(value, pd.DataFrame) and value.empty):
+                    return
+                self._store(key, value, ttl, max_stale)
+            except Exception as e:
+                print(f"Background refresh of {key[0]} failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._executor.submit(refresh)
+
+@process_resource
+def get_swr_cache():
+    """Shared stale-while-revalidate cache for all sessions in this process"""
+    return StaleWhileRevalidateCache(SWR_REFRESH_WORKERS)
+
+def swr_cache(ttl, max_stale):
+    """
+    Decorator: cache results for ttl seconds, then serve them for up to max_stale more
+    seconds while refreshing in the background. Callers get a copy of the cached value,
+    like with @st.cache_data. ttl may also be a function of the call arguments.
+    """
+    def decorator(func):
+        name = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (name, args, tuple(sorted(kwargs.items())))
+            entry_ttl = ttl(*args, **kwargs) if callable(ttl) else ttl
+            value, _ = get_swr_cache().get(key, lambda: func(*args, **kwargs), entry_ttl, max_stale)
+            if isinstance(value, pd.DataFrame):
+                return value.copy()
+            return copy.deepcopy(value)
+
+        def clear(*args, **kwargs):
+            """Drop the entry for these arguments, or every entry of the function (same API as st.cache_data)"""
+            if args or kwargs:
+                key = (name, args, tuple(sorted(kwargs.items())))
+                get_swr_cache().invalidate(lambda k: k == key)
+            else:
+                get_swr_cache().invalidate(lambda k: k[0] == name)
+
+        wrapper.clear = clear
+        return wrapper
+
+    return decorator
+
+# Local data directory for persistent stores (survives process restarts)
+DATA_DIR = os.environ.get('KRYPTOVIEW_DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.data'))
+KLINE_DB_PATH = os.path.join(DATA_DIR, 'klines.v2.sqlite3')  # v2: slim OHLCV schema
+
+# Kline interval lengths in milliseconds (Binance intervals)
+INTERVAL_MS = {
+    '1m': 60_000,
+    '3m': 3 * 60_000,
+    '5m': 5 * 60_000,
+    '15m': 15 * 60_000,
+    '30m': 30 * 60_000,
+    '1h': 3_600_000,
+    '2h': 2 * 3_600_000,
+    '4h': 4 * 3_600_000,
+    '6h': 6 * 3_600_000,
+    '8h': 8 * 3_600_000,
+    '12h': 12 * 3_600_000,
+    '1d': 86_400_000,
+    '3d': 3 * 86_400_000,
+    '1w': 7 * 86_400_000,
+}
 
-                    # Move end_time to before the first candle of this chunk
-                    end_time = int(chunk[0][0]) - 1
+# Max concurrent Binance requests when a long kline range is split into chunks
+KLINE_FETCH_WORKERS = 4
+
+# Columns of the slim kline frames used by charts, indicators and backtests
+KLINE_COLUMNS = ['timestamp', 'Open', 'High', 'Low', 'Close', 'Volume']
+
+def decode_klines(klines):
+    """Decode a raw Binance kline payload into contiguous numpy columns: open time (int64), OHLC (float64), volume"""
+    if len(klines) == 0:
+        return np.empty(0, dtype=np.int64), np.empty((0, 4), dtype=np.float64), np.empty(0, dtype=np.float64)
+
+    raw = np.asarray(klines, dtype=object)
+    open_time = raw[:, 0].astype(np.int64)
+    ohlc = np.ascontiguousarray(raw[:, 1:5].astype(np.float64))
+    volume = raw[:, 5].astype(np.float64)
+    return open_time, ohlc, volume
+
+def kline_frame(open_time, ohlc, volume):
+    """Build a slim typed kline DataFrame from numpy columns"""
+    return pd.DataFrame({
+        'timestamp': pd.to_datetime(open_time, unit='ms'),
+        'Open': ohlc[:, 0],
+        'High': ohlc[:, 1],
+        'Low': ohlc[:, 2],
+        'Close': ohlc[:, 3],
+        'Volume': volume.astype(np.float32),
+    }, columns=KLINE_COLUMNS)
+
+@process_resource
+def init_kline_store():
+    """Create the kline store schema once per process and return the write lock"""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    conn = sqlite3.connect(KLINE_DB_PATH, timeout=30)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS klines (
+                symbol TEXT NOT NULL,
+                interval TEXT NOT NULL,
+                open_time INTEGER NOT NULL,
+                open REAL, high REAL, low REAL, close REAL, volume REAL,
+                PRIMARY KEY (symbol, interval, open_time)
+            ) WITHOUT ROWID
+        """)
+        # history_start marks the first candle Binance has (listing date), so short
+        # histories are not re-downloaded on every call
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS kline_meta (
+                symbol TEXT NOT NULL,
+                interval TEXT NOT NULL,
+                history_start INTEGER,
+                PRIMARY KEY (symbol, interval)
+            )
+        """)
+        conn.commit()
+    finally:
+        conn.close()
+    return threading.Lock()
+
+def kline_store_connect():
+    """Open a connection to the kline store (one per call, SQLite handles concurrent readers)"""
+    init_kline_store()
+    return sqlite3.connect(KLINE_DB_PATH, timeout=30)
+
+def kline_store_upsert(symbol, interval, klines, history_start=None):
+    """Insert or update raw Binance klines for symbol/interval"""
+    open_time, ohlc, volume = decode_klines(klines)
+    rows = zip([symbol] * len(open_time), [interval] * len(open_time), open_time.tolist(),
+               ohlc[:, 0].tolist(), ohlc[:, 1].tolist(), ohlc[:, 2].tolist(), ohlc[:, 3].tolist(),
+               volume.tolist())
+
+    with init_kline_store():
+        conn = kline_store_connect()
+        try:
+            conn.executemany("INSERT OR REPLACE INTO klines VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            if history_start is not None:
+                conn.execute("INSERT OR REPLACE INTO kline_meta VALUES (?, ?, ?)", (symbol, interval, history_start))
+            conn.commit()
+        finally:
+            conn.close()
+
+def kline_store_coverage(symbol, interval, window_start):
+    """Return (rows since window_start, last open time, history_start) for symbol/interval"""
+    conn = kline_store_connect()
+    try:
+        row_count, last_open = conn.execute(
+            "SELECT COUNT(*), MAX(open_time) FROM klines WHERE symbol = ? AND interval = ? AND open_time >= ?",
+            (symbol, interval, window_start)
+        ).fetchone()
+        meta = conn.execute(
+            "SELECT history_start FROM kline_meta WHERE symbol = ? AND interval = ?",
+            (symbol, interval)
+        ).fetchone()
+    finally:
+        conn.close()
+    return row_count, last_open, meta[0] if meta else None
+
+def kline_store_read(symbol, interval, limit):
+    """Read the latest `limit` stored candles as a slim kline frame (oldest first)"""
+    conn = kline_store_connect()
+    try:
+        rows = conn.execute(
+            """
+            SELECT open_time, open, high, low, close, volume
+            FROM klines WHERE symbol = ? AND interval = ?
+            ORDER BY open_time DESC LIMIT ?
+            """,
+            (symbol, interval, int(limit))
+        ).fetchall()
+    finally:
+        conn.close()
+
+    data = np.array(rows[::-1], dtype=np.float64).reshape(-1, 6)
+    return kline_frame(data[:, 0].astype(np.int64), data[:, 1:5], data[:, 5])
+
+def fetch_klines_range(symbol, interval, start_ms, end_ms):
+    """
+    Fetch raw klines with open time in [start_ms, end_ms] from Binance.
+    The range is split up front into windows of 1000 candles (Binance max per request),
+    which are fetched concurrently on a bounded thread pool and stitched back in order.
+    Returns (klines, complete) - complete is False when a window failed and older
+    windows were dropped.
+    """
+    window_ms = 1000 * INTERVAL_MS[interval]
+    windows = [(w_start, min(w_start + window_ms - 1, end_ms))
+               for w_start in range(start_ms, end_ms + 1, window_ms)]
 
-                    if remaining <= 0:
-                        break
+    def fetch_window(window):
+        return binance_call('klines', client.get_klines, symbol=symbol, interval=interval, limit=1000,
+                            startTime=window[0], endTime=window[1])
 
+    if len(windows) == 1:
+        chunks = [fetch_window(windows[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(KLINE_FETCH_WORKERS, len(windows))) as executor:
+            futures = [executor.submit(fetch_window, window) for window in windows]
+            chunks = []
+            for i, future in enumerate(futures):
+                try:
+                    chunks.append(future.result())
                 except Exception as e:
                     print(f"Error fetching chunk {i}: {e}")
-                    break
+                    chunks.append(None)
+
+    # Keep the newest contiguous run of windows - a failed window would leave a gap
+    kept = []
+    for chunk in reversed(chunks):
+        if chunk is None:
+            break
+        kept.append(chunk)
 
-            klines = all_klines
+    # Stitch in order and dedupe on open time
+    klines_by_open = {}
+    for chunk in reversed(kept):
+        for k in chunk:
+            klines_by_open[int(k[0])] = k
 
-            # Trim to exact limit if we got more
-            if len(klines) > limit:
-                klines = klines[-limit:]
+    return [klines_by_open[t] for t in sorted(klines_by_open)], len(kept) == len(chunks)
 
-            print(f"📊 Fetched {len(klines)} candles for {symbol} ({interval}, limit={limit}) in {chunks_needed} chunks")
+def fetch_latest_klines(symbol, interval, limit):
+    """
+    Fetch the latest `limit` raw klines from Binance (concurrent chunks for limit > 1000).
+    Returns (klines, complete) like fetch_klines_range.
+    """
+    # Binance allows max 1000 candles per request
+    if limit <= 1000 or interval not in INTERVAL_MS:
+        klines = binance_call('klines', client.get_klines, symbol=symbol, interval=interval, limit=min(limit, 1000))
+        return klines, True
+
+    end_ms = int(time.time() * 1000)
+    start_ms = end_ms - limit * INTERVAL_MS[interval]
+    klines, complete = fetch_klines_range(symbol, interval, start_ms, end_ms)
+
+    # Trim to exact limit if we got more
+    return klines[-limit:], complete
 
+@single_flight
+def load_klines(symbol, interval, limit, offline=False):
+    """
+    Return the latest `limit` candles for symbol/interval from the local kline store.
+    Only candles newer than the last stored one are downloaded (the last stored candle
+    is re-fetched too, since it may still have been open). A full download happens only
+    when the store does not cover the requested window yet. offline=True skips the
+    sync and returns whatever is stored.
+    """
+    if offline:
+        return kline_store_read(symbol, interval, limit)
+
+    interval_ms = INTERVAL_MS.get(interval)
+    if interval_ms is None:
+        # Unknown interval length (e.g. 1M) - no incremental sync possible
+        klines, _ = fetch_latest_klines(symbol, interval, limit)
+        return kline_frame(*decode_klines(klines))
+
+    now_ms = int(time.time() * 1000)
+    window_start = now_ms - limit * interval_ms
+    row_count, last_open, history_start = kline_store_coverage(symbol, interval, window_start)
+
+    covered = False
+    if last_open is not None and (now_ms - last_open) // interval_ms < 1000:
+        expected_first = max(window_start, history_start or 0)
+        covered = row_count >= (last_open - expected_first) // interval_ms
+
+    if covered:
+        # Tail request: last stored candle plus anything newer
+        klines = binance_call('klines', client.get_klines, symbol=symbol, interval=interval,
+                              startTime=last_open, limit=1000)
+        kline_store_upsert(symbol, interval, klines)
+        print(f"📊 Synced {len(klines)} new candles for {symbol} ({interval}) into kline store")
+    else:
+        klines, complete = fetch_latest_klines(symbol, interval, limit)
         if not klines:
-            return fetch_data_coingecko_fallback(symbol, limit)
+            return kline_frame(*decode_klines([]))
+        # Fewer candles than requested means we reached the listing date - but only if no
+        # window failed, otherwise the oldest candles are just missing from this download
+        listing_start = int(klines[0][0]) if complete and len(klines) < limit else None
+        kline_store_upsert(symbol, interval, klines, history_start=listing_start)
+        print(f"📊 Fetched {len(klines)} candles for {symbol} ({interval}, limit={limit}) into kline store")
+
+    return kline_store_read(symbol, interval, limit)
+
+# Base intervals kept in the kline store - every other timeframe (4h, 1w, or custom ones
+# like 3h, 2d, 10m) is resampled locally from the coarsest base that divides it
+RESAMPLE_BASE_INTERVALS = ['1m', '5m', '1h', '1d']
+
+# Bucket origins: Binance weeks open on Monday 00:00 UTC, everything else is epoch-aligned
+RESAMPLE_EPOCH_ORIGIN_MS = 0
+RESAMPLE_WEEK_ORIGIN_MS = 4 * 86_400_000  # 1970-01-05 (Monday)
+
+# How each kline column is aggregated when resampling
+RESAMPLE_AGG = {
+    'Open': 'first',
+    'High': 'max',
+    'Low': 'min',
+    'Close': 'last',
+    'Volume': 'sum',
+}
+
+def parse_interval_ms(interval):
+    """Interval length in ms for strings like '10m', '3h', '2d', '1w' (None if unsupported)"""
+    units = {'m': 60_000, 'h': 3_600_000, 'd': 86_400_000, 'w': 7 * 86_400_000}
+    count, unit = interval[:-1], interval[-1:]
+    if not count.isdigit() or unit not in units or int(count) == 0:
+        return None
+    return int(count) * units[unit]
+
+def resample_base_interval(interval):
+    """Base interval to build `interval` from, or None if it is loaded directly"""
+    if interval in RESAMPLE_BASE_INTERVALS:
+        return None
+
+    target_ms = parse_interval_ms(interval)
+    if target_ms is None:
+        return None
 
-        df = pd.DataFrame(klines, columns=['timestamp', 'Open', 'High', 'Low', 'Close', 'Volume',
-                                           'Close_time', 'Quote_asset_volume', 'Number_of_trades',
-                                           'Taker_buy_base_volume', 'Taker_buy_quote_volume', 'Ignore'])
-        df['Close'] = df['Close'].astype(float)
-        df['High'] = df['High'].astype(float)
-        df['Low'] = df['Low'].astype(float)
-        df['Volume'] = df['Volume'].astype(float)
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    for base in reversed(RESAMPLE_BASE_INTERVALS):
+        base_ms = INTERVAL_MS[base]
+        if target_ms > base_ms and target_ms % base_ms == 0:
+            return base
+    return None
 
+def resample_klines(df, interval, base_interval):
+    """Aggregate base_interval OHLCV candles into `interval` candles (vectorized groupby on bucket start)"""
+    if df.empty:
         return df
+
+    target_ms = parse_interval_ms(interval)
+    origin_ms = RESAMPLE_WEEK_ORIGIN_MS if interval.endswith('w') else RESAMPLE_EPOCH_ORIGIN_MS
+
+    open_ms = df['timestamp'].values.astype('datetime64[ms]').astype(np.int64)
+    bucket_ms = (open_ms - origin_ms) // target_ms * target_ms + origin_ms
+
+    grouped = df.groupby(bucket_ms, sort=True)
+    out = grouped.agg({col: how for col, how in RESAMPLE_AGG.items() if col in df.columns})
+
+    # Drop the leading bucket if the base window started in the middle of it
+    base_per_bucket = target_ms // INTERVAL_MS[base_interval]
+    if len(out) > 0 and grouped.size().iloc[0] < base_per_bucket:
+        out = out.iloc[1:]
+
+    out = out.reset_index(names='bucket')
+    out['timestamp'] = pd.to_datetime(out['bucket'], unit='ms')
+
+    columns = [col for col in df.columns if col in out.columns]
+    return out[columns]
+
+def load_candles(symbol, interval, limit, offline=False):
+    """
+    Return the latest `limit` candles for any interval. Base intervals come straight
+    from the kline store; coarser ones are resampled from the stored base candles,
+    so e.g. the 1h, 4h and 12h views share a single 1h download.
+    """
+    base = resample_base_interval(interval)
+    if base is None:
+        return load_klines(symbol, interval, limit, offline=offline)
+
+    base_per_bucket = parse_interval_ms(interval) // INTERVAL_MS[base]
+    # One extra bucket absorbs a partial leading bucket
+    df_base = load_klines(symbol, base, (limit + 1) * base_per_bucket, offline=offline)
+    return resample_klines(df_base, interval, base).tail(limit).reset_index(drop=True)
+
+# Symbol registry: every Binance USDT pair with its CoinGecko id and futures codes, persisted across restarts
+SYMBOL_REGISTRY_PATH = os.path.join(DATA_DIR, 'symbols.json')
+SYMBOL_REGISTRY_MAX_AGE = 24 * 3600  # Rebuilt from the exchanges once a day
+SYMBOL_REGISTRY_VERSION = 1
+COINGECKO_MARKET_PAGES = 2  # Top 500 coins by market cap resolve tickers to CoinGecko ids
+FUTURES_MULTIPLIER_PREFIXES = ('1000000', '1000', '1M')  # e.g. 1000SHIBUSDT is the SHIB perpetual
+
+class SymbolRegistry:
+    """
+    USDT pairs with display name, CoinGecko id, derivatives code (Coinglass coin),
+    USDⓈ-M perpetual symbol, tick size and listing status. Every lookup is a dict hit.
+    """
+
+    def __init__(self, records, built_at):
+        self.records = records
+        self.built_at = built_at
+        self._by_symbol = {r['symbol']: r for r in records}
+        self._by_name = {r['name']: r for r in records}
+        self._by_base = {r['base_asset']: r for r in records}
+        self._by_coingecko_id = {}
+        for r in records:
+            if r['coingecko_id']:
+                self._by_coingecko_id.setdefault(r['coingecko_id'], r)
+
+    def get(self, symbol):
+        return self._by_symbol.get(symbol)
+
+    def _field(self, symbol, field):
+        record = self._by_symbol.get(symbol)
+        return record[field] if record else None
+
+    def display_name(self, symbol):
+        return self._field(symbol, 'name')
+
+    def coingecko_id(self, symbol):
+        return self._field(symbol, 'coingecko_id')
+
+    def derivatives_code(self, symbol):
+        return self._field(symbol, 'derivatives_code')
+
+    def futures_symbol(self, symbol):
+        return self._field(symbol, 'futures_symbol')
+
+    def tick_size(self, symbol):
+        return self._field(symbol, 'tick_size')
+
+    def status(self, symbol):
+        return self._field(symbol, 'status')
+
+    def symbol_for_name(self, name):
+        record = self._by_name.get(name)
+        return record['symbol'] if record else None
+
+    def symbol_for_base(self, base_asset):
+        record = self._by_base.get(base_asset)
+        return record['symbol'] if record else None
+
+    def symbol_for_coingecko_id(self, coingecko_id):
+        record = self._by_coingecko_id.get(coingecko_id)
+        return record['symbol'] if record else None
+
+    def display_symbols(self):
+        """Display name -> symbol for the coin selectors: curated coins first, then trading pairs by market cap"""
+        return {r['name']: r['symbol'] for r in self.records if r['curated'] or r['status'] == 'TRADING'}
+
+    @property
+    def age(self):
+        return time.time() - self.built_at
+
+    def save(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': SYMBOL_REGISTRY_VERSION, 'built_at': self.built_at, 'records': self.records}, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Registry saved at path, or None if missing, unreadable or of another version"""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != SYMBOL_REGISTRY_VERSION:
+            return None
+        return cls(data['records'], data['built_at'])
+
+def symbol_record(symbol, base_asset, name, coingecko_id, curated, futures_symbol=None, tick_size=None,
+                  status='TRADING', market_cap_rank=None):
+    """One registry record - the derivatives code is the base asset of coins with a futures market"""
+    return {
+        'symbol': symbol,
+        'base_asset': base_asset,
+        'name': name,
+        'coingecko_id': coingecko_id,
+        'derivatives_code': base_asset if futures_symbol else None,
+        'futures_symbol': futures_symbol,
+        'tick_size': tick_size,
+        'status': status,
+        'market_cap_rank': market_cap_rank,
+        'curated': curated,
+    }
+
+def curated_symbol_registry():
+    """Registry of the curated coins only, used when the exchanges cannot be reached on first start"""
+    records = [symbol_record(symbol, symbol[:-len('USDT')], name, COINGECKO_IDS.get(symbol), True,
+                             futures_symbol=symbol)
+               for name, symbol in CURATED_SYMBOLS.items()]
+    return SymbolRegistry(records, built_at=0)
+
+def fetch_futures_symbols():
+    """Base asset -> USDⓈ-M perpetual symbol, for trading USDT perpetuals"""
+    r = binance_call('fapi_exchange_info', get_http_session().get,
+                     "https://fapi.binance.com/fapi/v1/exchangeInfo", timeout=10)
+    futures = {}
+    for s in r.json()['symbols']:
+        if s['quoteAsset'] != 'USDT' or s['contractType'] != 'PERPETUAL' or s['status'] != 'TRADING':
+            continue
+        base = s['baseAsset']
+        for prefix in FUTURES_MULTIPLIER_PREFIXES:
+            if base.startswith(prefix) and len(base) > len(prefix) and not base[len(prefix)].isdigit():
+                base = base[len(prefix):]
+                break
+        futures.setdefault(base, s['symbol'])
+    return futures
+
+def fetch_coingecko_market_ranks():
+    """Ticker (lowercase) -> (CoinGecko id, name, market cap rank) of the highest-ranked coin using it"""
+    headers = {}
+    if COINGECKO_API_KEY:
+        headers['x-cg-demo-api-key'] = COINGECKO_API_KEY
+
+    ranks = {}
+    for page in range(1, COINGECKO_MARKET_PAGES + 1):
+        r = get_http_session().get("https://api.coingecko.com/api/v3/coins/markets", params={
+            'vs_currency': 'usd', 'order': 'market_cap_desc', 'per_page': 250, 'page': page
+        }, headers=headers, timeout=15)
+        r.raise_for_status()
+        for coin in r.json():
+            ranks.setdefault(coin['symbol'].lower(), (coin['id'], coin['name'], coin.get('market_cap_rank')))
+    return ranks
+
+def build_symbol_registry():
+    """Build the registry from Binance spot/futures exchangeInfo and the CoinGecko market cap ranking"""
+    exchange_info = binance_call('exchange_info', client.get_exchange_info)
+
+    try:
+        futures = fetch_futures_symbols()
     except Exception as e:
-        print(f"Binance error: {e}, trying CoinGecko fallback...")
-        return fetch_data_coingecko_fallback(symbol, limit)
+        print(f"⚠️ Futures exchangeInfo unavailable, registry built without futures symbols: {e}")
+        futures = {}
 
-def fetch_data_no_cache(symbol, interval, limit):
+    try:
+        ranks = fetch_coingecko_market_ranks()
+    except Exception as e:
+        print(f"⚠️ CoinGecko ranking unavailable, only curated coins get CoinGecko ids: {e}")
+        ranks = {}
+
+    curated_names = {symbol: name for name, symbol in CURATED_SYMBOLS.items()}
+    curated_order = {symbol: i for i, symbol in enumerate(CURATED_SYMBOLS.values())}
+
+    records = []
+    for s in exchange_info['symbols']:
+        if s['quoteAsset'] != 'USDT' or not s.get('isSpotTradingAllowed', True):
+            continue
+        symbol, base = s['symbol'], s['baseAsset']
+        tick_size = next((float(f['tickSize']) for f in s.get('filters', []) if f['filterType'] == 'PRICE_FILTER'), None)
+        coingecko_id, coingecko_name, rank = ranks.get(base.lower(), (None, None, None))
+        curated = symbol in curated_names
+
+        records.append(symbol_record(
+            symbol, base,
+            curated_names.get(symbol) or (f"{coingecko_name} ({base})" if coingecko_name else base),
+            COINGECKO_IDS.get(symbol) or coingecko_id,
+            curated,
+            futures_symbol=futures.get(base),
+            tick_size=tick_size,
+            status=s['status'],
+            market_cap_rank=rank
+        ))
+
+    # Curated coins Binance no longer lists at all stay selectable (and redirectable)
+    listed = {r['symbol'] for r in records}
+    for symbol, name in curated_names.items():
+        if symbol not in listed:
+            records.append(symbol_record(symbol, symbol[:-len('USDT')], name, COINGECKO_IDS.get(symbol), True,
+                                         status='DELISTED'))
+
+    # Curated coins first (in their order), then by market cap rank, then alphabetically
+    records.sort(key=lambda r: (curated_order.get(r['symbol'], len(curated_order)),
+                                r['market_cap_rank'] or float('inf'), r['symbol']))
+    return SymbolRegistry(records, built_at=time.time())
+
+@process_resource(ttl=SYMBOL_REGISTRY_MAX_AGE)
+def get_symbol_registry():
     """
-    Fetch data WITHOUT CACHE - for debugging and forcing fresh data
+    Symbol registry for this process: loaded from disk, rebuilt from the exchanges when
+    older than a day, and falling back to the curated coins if nothing else is available.
+    """
+    registry = SymbolRegistry.load(SYMBOL_REGISTRY_PATH)
+    if registry is not None and registry.age < SYMBOL_REGISTRY_MAX_AGE:
+        return registry
+
+    if client is not None:
+        try:
+            fresh = build_symbol_registry()
+            fresh.save(SYMBOL_REGISTRY_PATH)
+            print(f"✅ Symbol registry built with {len(fresh.records)} USDT pairs")
+            return fresh
+        except Exception as e:
+            print(f"⚠️ Error building symbol registry: {e}")
+
+    return registry or curated_symbol_registry()
+
+# Pairs Binance renamed or migrated - a dead pair redirects here while the successor is trading
+SYMBOL_REDIRECTS = {
+    'MATICUSDT': 'POLUSDT',  # Polygon MATIC -> POL migration
+    'FTMUSDT': 'SUSDT',  # Fantom -> Sonic
+    'RNDRUSDT': 'RENDERUSDT',  # Render ticker change
+    'OCEANUSDT': 'FETUSDT',  # Ocean Protocol merged into FET (ASI alliance)
+}
+
+def symbol_listed(symbol):
+    """Whether symbol is trading on Binance spot (assumed when only the curated registry is available)"""
+    registry = get_symbol_registry()
+    if registry.built_at == 0:
+        return True
+    return registry.status(symbol) == 'TRADING'
+
+def symbol_redirect(symbol):
+    """Trading successor of a renamed/delisted pair, or None"""
+    if symbol_listed(symbol):
+        return None
+    target = SYMBOL_REDIRECTS.get(symbol)
+    return target if target and symbol_listed(target) else None
+
+def resolve_symbol(crypto_name):
+    """Binance symbol for a selector display name, following redirects of renamed pairs"""
+    symbol = SYMBOLS[crypto_name]
+    return symbol_redirect(symbol) or symbol
+
+# Coin selectors and name lookups read from the registry
+SYMBOLS = get_symbol_registry().display_symbols()
+SYMBOL_NAMES = {sym: name for name, sym in SYMBOLS.items()}
+
+def selectable_crypto_name(crypto_name, symbol=None):
+    """
+    crypto_name if the selector still offers it, else the name its stored symbol (or that
+    pair's successor) is listed under now, else Bitcoin - the registry is rebuilt while
+    sessions keep their selection
+    """
+    if crypto_name in SYMBOLS:
+        return crypto_name
+    if symbol:
+        name = SYMBOL_NAMES.get(symbol) or SYMBOL_NAMES.get(symbol_redirect(symbol))
+        if name:
+            return name
+    return 'Bitcoin (BTC)'
+
+# Live Binance WebSocket streams (combined stream endpoint, overridable for a local stand-in server)
+BINANCE_WS_URL = os.environ.get('BINANCE_WS_URL', 'wss://stream.binance.com:9443/stream')
+BINANCE_FUTURES_WS_URL = os.environ.get('BINANCE_FUTURES_WS_URL', 'wss://fstream.binance.com/stream')
+BINANCE_WS_RECONNECT_DELAY = 5  # Seconds between reconnect attempts
+LIVE_KLINE_STALE_AFTER = 30  # Seconds without updates before streamed candles are ignored
+LIVE_KLINE_BUFFER = 3  # Latest streamed candles kept per symbol/interval
+LIVE_STREAM_IDLE_AFTER = 300  # Seconds without a watch() before a feed unsubscribes a stream
+
+class BinanceStreamHub:
+    """
+    One background WebSocket connection shared by every session. Streams are added
+    with SUBSCRIBE messages on the live connection and re-subscribed after reconnects,
+    and removed with UNSUBSCRIBE once their last handler is gone; each message is
+    dispatched to the handlers registered for its stream.
+    """
+
+    def __init__(self, url):
+        self.url = url
+        self._lock = threading.Lock()
+        self._handlers = {}  # stream name -> list of callbacks
+        self._ws = None
+        self._thread = None
+        self._request_id = 0
+
+    def subscribe(self, stream, handler):
+        """Register handler for stream (e.g. 'btcusdt@kline_4h'), connecting on first use"""
+        with self._lock:
+            handlers = self._handlers.setdefault(stream, [])
+            if handler in handlers:
+                return
+            handlers.append(handler)
+            is_new = len(handlers) == 1
+
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='binance-ws', daemon=True)
+                self._thread.start()
+
+        if is_new:
+            self._send_request(self._ws, 'SUBSCRIBE', [stream])
+
+    def unsubscribe(self, stream, handler):
+        """Remove handler from stream, unsubscribing the stream when no handlers are left"""
+        with self._lock:
+            handlers = self._handlers.get(stream, [])
+            if handler not in handlers:
+                return
+            handlers.remove(handler)
+            if handlers:
+                return
+            del self._handlers[stream]
+
+        self._send_request(self._ws, 'UNSUBSCRIBE', [stream])
+
+    def _run(self):
+        while True:
+            ws = websocket.WebSocketApp(self.url, on_open=self._on_open, on_message=self._on_message,
+                                        on_error=self._on_error)
+            self._ws = ws
+            ws.run_forever()
+            self._ws = None
+            print(f"⚠️ Binance WebSocket disconnected, reconnecting in {BINANCE_WS_RECONNECT_DELAY}s")
+            time.sleep(BINANCE_WS_RECONNECT_DELAY)
+
+    def _send_request(self, ws, method, streams):
+        if ws is None or ws.sock is None or not ws.sock.connected or not streams:
+            return  # _on_open subscribes the current streams once connected
+
+        with self._lock:
+            self._request_id += 1
+            request_id = self._request_id
+        try:
+            ws.send(json.dumps({'method': method, 'params': streams, 'id': request_id}))
+        except websocket.WebSocketException as e:
+            print(f"Error sending {method} for {streams}: {e}")
+
+    def _on_open(self, ws):
+        with self._lock:
+            streams = list(self._handlers)
+        print(f"✅ Binance WebSocket connected ({len(streams)} streams)")
+        self._send_request(ws, 'SUBSCRIBE', streams)
+
+    def _on_message(self, ws, message):
+        msg = json.loads(message)
+        if 'stream' not in msg:
+            return  # SUBSCRIBE/UNSUBSCRIBE acknowledgement
+
+        with self._lock:
+            handlers = list(self._handlers.get(msg['stream'], []))
+        for handler in handlers:
+            try:
+                handler(msg['data'])
+            except Exception as e:
+                print(f"Error handling {msg['stream']} message: {e}")
+
+    def _on_error(self, ws, error):
+        print(f"Binance WebSocket error: {error}")
+
+@st.cache_resource
+def get_binance_stream_hub():
+    """Shared Binance spot WebSocket connection for all sessions in this process"""
+    return BinanceStreamHub(BINANCE_WS_URL)
+
+@st.cache_resource
+def get_binance_futures_stream_hub():
+    """Shared Binance USDⓈ-M futures WebSocket connection for all sessions in this process"""
+    return BinanceStreamHub(BINANCE_FUTURES_WS_URL)
+
+class StreamFeed:
+    """
+    Base of the shared feeds on a stream hub. Pages call watch() on every rerun, which
+    renews a lease on the streams they need; streams nobody has watched for
+    LIVE_STREAM_IDLE_AFTER seconds are unsubscribed and their state is dropped.
+    """
+
+    def __init__(self, hub):
+        self._hub = hub
+        self._lock = threading.Lock()
+        self._leases = {}  # stream -> (monotonic time of last watch, handler)
+
+    def _lease(self, stream, handler):
+        """
+        Renew the lease on stream (subscribing handler on first watch) and release idle
+        streams. Call with self._lock held; returns True if stream was just subscribed.
+        """
+        now = time.monotonic()
+        for idle, (watched, idle_handler) in list(self._leases.items()):
+            if idle != stream and now - watched > LIVE_STREAM_IDLE_AFTER:
+                del self._leases[idle]
+                self._hub.unsubscribe(idle, idle_handler)
+                self._release(idle)
+
+        is_new = stream not in self._leases
+        self._leases[stream] = (now, handler)
+        if is_new:
+            self._hub.subscribe(stream, handler)
+        return is_new
+
+    def _release(self, stream):
+        """Drop the state kept for an unsubscribed stream (called with self._lock held)"""
+
+class LiveKlineFeed(StreamFeed):
+    """
+    Latest streamed candles per symbol/interval. The open candle is updated in place on
+    every kline event; closed candles of stored intervals are also written to the kline
+    store, so the next REST tail sync has (almost) nothing left to download.
+    """
+
+    def __init__(self, hub):
+        super().__init__(hub)
+        self._candles = {}  # (symbol, interval) -> {open_time: raw kline}
+        self._updated = {}  # (symbol, interval) -> monotonic time of last event
+
+    def watch(self, symbol, interval):
+        """Subscribe to the kline stream of symbol/interval (and of its resample base, if any)"""
+        base = resample_base_interval(interval)
+        with self._lock:
+            self._lease(f"{symbol.lower()}@kline_{interval}", self._on_kline)
+            if base is not None:
+                self._lease(f"{symbol.lower()}@kline_{base}", self._on_kline)
+
+    def _release(self, stream):
+        symbol, _, interval = stream.partition('@kline_')
+        self._candles.pop((symbol.upper(), interval), None)
+        self._updated.pop((symbol.upper(), interval), None)
+
+    def _on_kline(self, event):
+        k = event['k']
+        key = (k['s'], k['i'])
+        # Same layout as a REST kline row, so the usual decoders apply
+        kline = [k['t'], k['o'], k['h'], k['l'], k['c'], k['v']]
+
+        with self._lock:
+            candles = self._candles.setdefault(key, {})
+            candles[k['t']] = kline
+            for open_time in sorted(candles)[:-LIVE_KLINE_BUFFER]:
+                del candles[open_time]
+            self._updated[key] = time.monotonic()
+
+        if k['x'] and k['i'] in INTERVAL_MS and resample_base_interval(k['i']) is None:
+            kline_store_upsert(k['s'], k['i'], [kline])
+
+    def overlay(self, df, symbol, interval):
+        """Return df with streamed candles applied: open candle replaced, newer candles appended"""
+        key = (symbol, interval)
+        with self._lock:
+            if time.monotonic() - self._updated.get(key, float('-inf')) > LIVE_KLINE_STALE_AFTER:
+                return df
+            klines = [self._candles[key][t] for t in sorted(self._candles[key])]
+
+        if df.empty:
+            return df
+
+        last_open = df['timestamp'].values[-1].astype('datetime64[ms]').astype(np.int64)
+        klines = [k for k in klines if k[0] >= last_open]
+        if not klines:
+            return df
+
+        live = kline_frame(*decode_klines(klines))
+        kept = df[df['timestamp'] < live['timestamp'].iloc[0]]
+        return pd.concat([kept, live], ignore_index=True)
+
+@st.cache_resource
+def get_live_kline_feed():
+    """Shared live kline feed on top of the Binance stream hub"""
+    return LiveKlineFeed(get_binance_stream_hub())
+
+# Local order books maintained from the diff-depth stream (see "How to manage a local order book correctly")
+ORDER_BOOK_SNAPSHOT_LIMIT = 1000  # Levels per side in the REST snapshot the stream is synced onto
+ORDER_BOOK_MAX_LEVELS = 5000  # Levels kept per side, nearest to the touch
+ORDER_BOOK_BUFFER = 500  # Stream events buffered while the snapshot is fetched
+ORDER_BOOK_SYNC_DELAY = 1.0  # Seconds of events buffered before the snapshot is requested
+ORDER_BOOK_STALE_AFTER = 10  # Seconds without updates before the local book is ignored
+ORDER_BOOK_RESYNC_MAX_DELAY = 300  # Cap of the delay between failed syncs (doubles from BINANCE_WS_RECONNECT_DELAY)
+
+def merge_book_side(prices, qtys, levels, descending):
+    """Apply (price, qty) level updates to one sorted book side; qty 0 removes the level"""
+    updates = np.asarray(levels, dtype=np.float64).reshape(-1, 2)
+    keep = ~np.isin(prices, updates[:, 0])
+    updates = updates[updates[:, 1] > 0]
+
+    prices = np.concatenate([prices[keep], updates[:, 0]])
+    qtys = np.concatenate([qtys[keep], updates[:, 1]])
+    order = np.argsort(-prices if descending else prices, kind='stable')[:ORDER_BOOK_MAX_LEVELS]
+    return prices[order], qtys[order]
+
+class LocalOrderBook:
+    """
+    Order book of one symbol as sorted numpy price/qty arrays (bids descending, asks
+    ascending). Stream events are buffered until a REST snapshot is loaded, then applied
+    in update-id order; a gap in the ids drops the book back to unsynced.
+    """
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.last_update_id = None  # None while unsynced
+        self.buffer = deque(maxlen=ORDER_BOOK_BUFFER)
+        self.updated = float('-inf')
+        self._clear()
+
+    def _clear(self):
+        empty = np.empty(0, dtype=np.float64)
+        self.bid_prices, self.bid_qtys = empty, empty
+        self.ask_prices, self.ask_qtys = empty, empty
+
+    @property
+    def synced(self):
+        return self.last_update_id is not None
+
+    def load_snapshot(self, snapshot):
+        """Replace the book with a REST snapshot and apply the buffered events that follow it"""
+        self._clear()
+        self.last_update_id = snapshot['lastUpdateId']
+        self.bid_prices, self.bid_qtys = merge_book_side(self.bid_prices, self.bid_qtys, snapshot['bids'], True)
+        self.ask_prices, self.ask_qtys = merge_book_side(self.ask_prices, self.ask_qtys, snapshot['asks'], False)
+
+        buffered, self.buffer = list(self.buffer), deque(maxlen=ORDER_BOOK_BUFFER)
+        for event in buffered:
+            if event['u'] <= self.last_update_id:
+                continue  # Already contained in the snapshot
+            if not self.apply(event):
+                return False
+        self.updated = time.monotonic()
+        return True
+
+    def apply(self, event):
+        """Apply a diff-depth event; returns False (and unsyncs) when an update was missed"""
+        if not self.synced:
+            self.buffer.append(event)
+            return True
+        if event['u'] <= self.last_update_id:
+            return True
+        if event['U'] > self.last_update_id + 1:
+            self.last_update_id = None
+            self._clear()
+            return False
+
+        self.bid_prices, self.bid_qtys = merge_book_side(self.bid_prices, self.bid_qtys, event['b'], True)
+        self.ask_prices, self.ask_qtys = merge_book_side(self.ask_prices, self.ask_qtys, event['a'], False)
+        self.last_update_id = event['u']
+        self.updated = time.monotonic()
+        return True
+
+    def depth(self, limit):
+        """Top `limit` levels per side as (n, 2) price/qty arrays"""
+        return {
+            'bids': np.column_stack([self.bid_prices[:limit], self.bid_qtys[:limit]]),
+            'asks': np.column_stack([self.ask_prices[:limit], self.ask_qtys[:limit]]),
+        }
+
+class OrderBookFeed(StreamFeed):
+    """Local order books of watched symbols, fed by <symbol>@depth@100ms on the stream hub"""
+
+    def __init__(self, hub):
+        super().__init__(hub)
+        self._books = {}  # symbol -> LocalOrderBook
+        self._syncing = set()
+        self._sync_failures = {}  # symbol -> consecutive failed syncs
+
+    def watch(self, symbol):
+        """Start maintaining the local book of symbol"""
+        with self._lock:
+            if not self._lease(f"{symbol.lower()}@depth@100ms", self._on_depth):
+                return
+            self._books[symbol] = LocalOrderBook(symbol)
+        self._resync(symbol)
+
+    def _release(self, stream):
+        symbol = stream.split('@')[0].upper()
+        self._books.pop(symbol, None)
+        self._sync_failures.pop(symbol, None)
+
+    def _resync(self, symbol):
+        with self._lock:
+            if symbol in self._syncing or symbol not in self._books:
+                return
+            self._syncing.add(symbol)
+        threading.Thread(target=self._sync, args=(symbol,), name=f'order-book-{symbol}', daemon=True).start()
+
+    def _sync(self, symbol):
+        try:
+            time.sleep(ORDER_BOOK_SYNC_DELAY)  # Let events buffer so the snapshot overlaps the stream
+            snapshot = binance_call('depth', client.get_order_book, symbol=symbol,
+                                    limit=ORDER_BOOK_SNAPSHOT_LIMIT,
+                                    weight=order_book_weight(ORDER_BOOK_SNAPSHOT_LIMIT))
+            with self._lock:
+                book = self._books.get(symbol)
+                if book is None:
+                    return  # Released while syncing
+                synced = book.load_snapshot(snapshot)
+        except Exception as e:
+            print(f"Error syncing {symbol} order book: {e}")
+            synced = False
+        finally:
+            with self._lock:
+                self._syncing.discard(symbol)
+
+        with self._lock:
+            if symbol not in self._books:
+                return  # Released while syncing
+            failures = 0 if synced else self._sync_failures.get(symbol, 0) + 1
+            self._sync_failures[symbol] = failures
+        if not synced:
+            # Back off while Binance keeps failing (or the snapshot keeps missing the stream)
+            delay = min(BINANCE_WS_RECONNECT_DELAY * 2 ** (failures - 1), ORDER_BOOK_RESYNC_MAX_DELAY)
+            print(f"⚠️ {symbol} order book sync failed {failures}x, retrying in {delay}s")
+            time.sleep(delay)
+            self._resync(symbol)
+
+    def _on_depth(self, event):
+        symbol = event['s']
+        with self._lock:
+            book = self._books.get(symbol)
+            in_sync = book is None or book.apply(event)
+        if not in_sync:
+            print(f"⚠️ {symbol} order book missed updates, resyncing")
+            self._resync(symbol)
+
+    def depth(self, symbol, limit):
+        """Top `limit` levels per side of the local book, or None if it is unsynced or stale"""
+        with self._lock:
+            book = self._books.get(symbol)
+            if book is None or not book.synced or time.monotonic() - book.updated > ORDER_BOOK_STALE_AFTER:
+                return None
+            return book.depth(limit)
+
+@st.cache_resource
+def get_order_book_feed():
+    """Shared local order books on top of the Binance stream hub"""
+    return OrderBookFeed(get_binance_stream_hub())
+
+# Trade tape per symbol: fixed-size ring buffer fed by the aggTrade stream
+TRADE_TAPE_SIZE = 5000  # Trades kept per symbol
+TRADE_TAPE_SEED_LIMIT = 1000  # REST aggTrades loaded when a symbol is first watched
+TRADE_DTYPE = np.dtype([
+    ('id', np.int64),
+    ('time', 'datetime64[ms]'),
+    ('price', np.float64),
+    ('qty', np.float64),
+    ('is_buyer_maker', np.bool_),
+])
+
+def agg_trade_records(trades):
+    """REST aggTrades or aggTrade stream payloads (same keys) as a TRADE_DTYPE array"""
+    records = np.empty(len(trades), dtype=TRADE_DTYPE)
+    records['id'] = [t['a'] for t in trades]
+    records['time'] = np.array([t['T'] for t in trades], dtype=np.int64).astype('datetime64[ms]')
+    records['price'] = np.array([t['p'] for t in trades], dtype=np.float64)
+    records['qty'] = np.array([t['q'] for t in trades], dtype=np.float64)
+    records['is_buyer_maker'] = [t['m'] for t in trades]
+    return records
+
+class TradeTape:
+    """
+    Ring buffer of the latest trades of one symbol. Every trade is written twice (slot i
+    and i + capacity), so the last n trades are always one contiguous slice and last()
+    can return a view without copying. A view stays valid until capacity - n more trades
+    have arrived.
+    """
+
+    def __init__(self, capacity=TRADE_TAPE_SIZE):
+        self.capacity = capacity
+        self._data = np.zeros(2 * capacity, dtype=TRADE_DTYPE)
+        self.count = 0  # Trades written since the last reset
+        self.last_id = -1
+
+    def append(self, records):
+        """Write trades newer than the last one in the tape, oldest first"""
+        records = records[records['id'] > self.last_id][-self.capacity:]
+        if len(records) == 0:
+            return
+        slots = (self.count + np.arange(len(records))) % self.capacity
+        self._data[slots] = records
+        self._data[slots + self.capacity] = records
+        self.count += len(records)
+        self.last_id = records['id'][-1]
+
+    def prepend(self, records):
+        """Fill in trades older than the first one in the tape (the REST seed)"""
+        current = self.last(self.capacity).copy()
+        if len(current):
+            records = records[records['id'] < current['id'][0]]
+        self.count = 0
+        self.last_id = -1
+        self.append(np.concatenate([records, current]))
+
+    def last(self, n):
+        """View over the last n trades, oldest first"""
+        n = min(n, self.count, self.capacity)
+        end = self.count % self.capacity + self.capacity
+        return self._data[end - n:end]
+
+    def max_qty(self):
+        """Largest quantity among all buffered trades (0 while empty)"""
+        trades = self.last(self.capacity)
+        return float(trades['qty'].max()) if len(trades) else 0.0
+
+class TradeTapeFeed(StreamFeed):
+    """Trade tapes of watched symbols, fed by <symbol>@aggTrade on the stream hub"""
+
+    def __init__(self, hub):
+        super().__init__(hub)
+        self._tapes = {}  # symbol -> TradeTape
+
+    def watch(self, symbol):
+        """Start recording the trades of symbol, seeded with the latest REST aggTrades"""
+        with self._lock:
+            if not self._lease(f"{symbol.lower()}@aggTrade", self._on_agg_trade):
+                return
+            self._tapes[symbol] = TradeTape()
+        threading.Thread(target=self._seed, args=(symbol,), name=f'trade-tape-{symbol}', daemon=True).start()
+
+    def _seed(self, symbol):
+        try:
+            trades = binance_call('agg_trades', client.get_aggregate_trades, symbol=symbol,
+                                  limit=TRADE_TAPE_SEED_LIMIT)
+            records = agg_trade_records(trades)
+        except Exception as e:
+            print(f"Error seeding {symbol} trade tape: {e}")
+            return
+        with self._lock:
+            tape = self._tapes.get(symbol)
+            if tape is not None:
+                tape.prepend(records)
+
+    def _release(self, stream):
+        self._tapes.pop(stream.split('@')[0].upper(), None)
+
+    def _on_agg_trade(self, event):
+        with self._lock:
+            tape = self._tapes.get(event['s'])
+            if tape is not None:
+                tape.append(agg_trade_records([event]))
+
+    def trades(self, symbol, limit):
+        """View over the last `limit` trades of symbol, or None if nothing was recorded yet"""
+        with self._lock:
+            tape = self._tapes.get(symbol)
+            if tape is None or tape.count == 0:
+                return None
+            return tape.last(limit)
+
+    def max_qty(self, symbol):
+        """Largest buffered trade quantity of symbol, or None if nothing was recorded yet"""
+        with self._lock:
+            tape = self._tapes.get(symbol)
+            if tape is None or tape.count == 0:
+                return None
+            return tape.max_qty()
+
+@st.cache_resource
+def get_trade_tape_feed():
+    """Shared trade tapes on top of the Binance stream hub"""
+    return TradeTapeFeed(get_binance_stream_hub())
+
+# Liquidations of all USDⓈ-M perpetuals from the !forceOrder@arr stream, kept for a rolling window
+LIQUIDATION_WINDOW = 24 * 3600  # Seconds of liquidations kept per symbol
+LIQUIDATION_MAX_EVENTS = 20_000  # Liquidations kept per symbol within the window
+LIQUIDATION_BINS = 50  # Price bins of the heatmap
+LIQUIDATION_PRICE_RANGE = 0.15  # Heatmap spans the current price +/- 15%
+
+class LiquidationAggregator:
+    """
+    Liquidation orders per futures symbol as (time, price, notional, is_long) rows. One
+    all-market subscription serves every symbol; heatmaps are binned on request from
+    the events inside the rolling window.
+    """
+
+    def __init__(self, hub):
+        self._lock = threading.Lock()
+        self._events = {}  # futures symbol -> deque of (time ms, avg price, notional USD, long liquidated)
+        hub.subscribe('!forceOrder@arr', self._on_force_order)
+
+    def _on_force_order(self, payload):
+        for event in payload if isinstance(payload, list) else [payload]:
+            order = event['o']
+            price = float(order['ap'])
+            notional = price * float(order['z'])
+            # A SELL liquidation order closes a long position
+            row = (order['T'], price, notional, order['S'] == 'SELL')
+
+            with self._lock:
+                events = self._events.setdefault(order['s'], deque(maxlen=LIQUIDATION_MAX_EVENTS))
+                events.append(row)
+                cutoff = row[0] - LIQUIDATION_WINDOW * 1000
+                while events and events[0][0] < cutoff:
+                    events.popleft()
+
+    def heatmap(self, futures_symbol, center_price, bins=LIQUIDATION_BINS, price_range=LIQUIDATION_PRICE_RANGE):
+        """Long/short liquidation notional per price bin around center_price, or None without events"""
+        cutoff = (time.time() - LIQUIDATION_WINDOW) * 1000
+        with self._lock:
+            rows = list(self._events.get(futures_symbol, ()))
+        if not rows:
+            return None
+
+        times, prices, notional, is_long = (np.array(column) for column in zip(*rows))
+        recent = times >= cutoff
+        if not recent.any():
+            return None
+        prices, notional, is_long = prices[recent], notional[recent], is_long[recent].astype(bool)
+
+        edges = np.linspace(center_price * (1 - price_range), center_price * (1 + price_range), bins + 1)
+        longs, _ = np.histogram(prices[is_long], bins=edges, weights=notional[is_long])
+        shorts, _ = np.histogram(prices[~is_long], bins=edges, weights=notional[~is_long])
+
+        return pd.DataFrame({
+            'price': (edges[:-1] + edges[1:]) / 2,
+            'liquidations': longs + shorts,
+            'long_liquidations': longs,
+            'short_liquidations': shorts,
+        })
+
+@st.cache_resource
+def get_liquidation_aggregator():
+    """Shared liquidation aggregator on top of the futures stream hub"""
+    return LiquidationAggregator(get_binance_futures_stream_hub())
+
+# Fetch instrumentation, exported in Prometheus text format
+METRICS_EXPORT_PATH = os.path.join(DATA_DIR, 'metrics.prom')
+METRICS_EXPORT_INTERVAL = 15  # Min seconds between metrics file writes
+METRICS_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0)  # Upstream latency, seconds
+
+def fetch_outcome(result):
+    """Classify a fetcher result - fetchers swallow their errors and return None/empty data"""
+    if result is None:
+        return 'empty'
+    if isinstance(result, (pd.DataFrame, list, dict)) and len(result) == 0:
+        return 'empty'
+    return 'ok'
+
+def payload_size(result):
+    """Approximate size of a fetcher result in bytes"""
+    if isinstance(result, pd.DataFrame):
+        return int(result.memory_usage(deep=True).sum())
+    try:
+        return len(pickle.dumps(result))
+    except Exception:
+        return 0
+
+class FetchMetrics:
+    """Process-wide counters per fetcher and provider: cache hits/misses, upstream latency, payload size, fallbacks"""
+
+    def __init__(self, latency_buckets):
+        self._lock = threading.Lock()
+        self._buckets = latency_buckets
+        self._calls = Counter()  # (function, provider, 'hit' | 'miss') -> count
+        self._outcomes = Counter()  # (function, provider, 'ok' | 'empty' | 'error') -> count
+        self._latency = {}  # (function, provider) -> [count per bucket..., +Inf count, sum]
+        self._payload = {}  # (function, provider) -> [bytes sum, count]
+        self._fallbacks = Counter()  # (function, from provider, to provider) -> count
+        self._last_export = 0.0
+
+    def record_call(self, function, provider, miss):
+        with self._lock:
+            self._calls[(function, provider, 'miss' if miss else 'hit')] += 1
+        self.maybe_export()
+
+    def record_upstream(self, function, provider, seconds, outcome, payload_bytes):
+        key = (function, provider)
+        with self._lock:
+            self._outcomes[(function, provider, outcome)] += 1
+            latency = self._latency.setdefault(key, [0] * (len(self._buckets) + 2))
+            latency[np.searchsorted(self._buckets, seconds)] += 1
+            latency[-1] += seconds
+            payload = self._payload.setdefault(key, [0, 0])
+            payload[0] += payload_bytes
+            payload[1] += 1
+
+    def record_fallback(self, function, from_provider, to_provider):
+        with self._lock:
+            self._fallbacks[(function, from_provider, to_provider)] += 1
+
+    def summary(self):
+        """Per function/provider summary table for the admin page"""
+        with self._lock:
+            keys = sorted({(f, p) for f, p, _ in self._calls} | set(self._latency))
+            rows = []
+            for function, provider in keys:
+                hits = self._calls[(function, provider, 'hit')]
+                misses = self._calls[(function, provider, 'miss')]
+                latency = self._latency.get((function, provider), [0] * (len(self._buckets) + 2))
+                upstream_calls = sum(latency[:-1])
+                payload = self._payload.get((function, provider), [0, 0])
+                rows.append({
+                    'function': function,
+                    'provider': provider,
+                    'hits': hits,
+                    'misses': misses,
+                    'hit_ratio': hits / (hits + misses) if hits + misses else None,
+                    'upstream_calls': upstream_calls,
+                    'errors': self._outcomes[(function, provider, 'error')],
+                    'empty': self._outcomes[(function, provider, 'empty')],
+                    'avg_latency_s': latency[-1] / upstream_calls if upstream_calls else None,
+                    'avg_payload_kb': payload[0] / payload[1] / 1024 if payload[1] else None,
+                })
+            fallbacks = [{'function': f, 'from': a, 'to': b, 'count': n}
+                         for (f, a, b), n in sorted(self._fallbacks.items())]
+        return pd.DataFrame(rows), pd.DataFrame(fallbacks)
+
+    def to_prometheus(self):
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = []
+
+        def family(name, kind, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            family('kryptoview_fetch_calls_total', 'counter', 'Cached fetcher calls by cache result')
+            for (function, provider, cache), n in sorted(self._calls.items()):
+                lines.append(f'kryptoview_fetch_calls_total{{function="{function}",provider="{provider}",cache="{cache}"}} {n}')
+
+            family('kryptoview_fetch_upstream_total', 'counter', 'Upstream fetches by outcome')
+            for (function, provider, outcome), n in sorted(self._outcomes.items()):
+                lines.append(f'kryptoview_fetch_upstream_total{{function="{function}",provider="{provider}",outcome="{outcome}"}} {n}')
+
+            family('kryptoview_fetch_upstream_seconds', 'histogram', 'Upstream fetch latency')
+            for (function, provider), latency in sorted(self._latency.items()):
+                labels = f'function="{function}",provider="{provider}"'
+                cumulative = np.cumsum(latency[:-1])
+                for le, n in zip(self._buckets, cumulative):
+                    lines.append(f'kryptoview_fetch_upstream_seconds_bucket{{{labels},le="{le}"}} {n}')
+                lines.append(f'kryptoview_fetch_upstream_seconds_bucket{{{labels},le="+Inf"}} {cumulative[-1]}')
+                lines.append(f'kryptoview_fetch_upstream_seconds_sum{{{labels}}} {latency[-1]:.6f}')
+                lines.append(f'kryptoview_fetch_upstream_seconds_count{{{labels}}} {cumulative[-1]}')
+
+            family('kryptoview_fetch_payload_bytes', 'summary', 'Size of upstream fetch results')
+            for (function, provider), (total, count) in sorted(self._payload.items()):
+                labels = f'function="{function}",provider="{provider}"'
+                lines.append(f'kryptoview_fetch_payload_bytes_sum{{{labels}}} {total}')
+                lines.append(f'kryptoview_fetch_payload_bytes_count{{{labels}}} {count}')
+
+            family('kryptoview_fetch_fallbacks_total', 'counter', 'Fallback activations between providers')
+            for (function, from_provider, to_provider), n in sorted(self._fallbacks.items()):
+                lines.append(f'kryptoview_fetch_fallbacks_total{{function="{function}",from="{from_provider}",to="{to_provider}"}} {n}')
+
+        return "\n".join(lines) + "\n"
+
+    def export(self, path=METRICS_EXPORT_PATH):
+        """Write the metrics file atomically (node_exporter textfile collector compatible)"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, path)
+
+    def maybe_export(self):
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_export < METRICS_EXPORT_INTERVAL:
+                return
+            self._last_export = now
+        try:
+            self.export()
+        except OSError as e:
+            print(f"Error writing metrics file: {e}")
+
+@process_resource
+def get_fetch_metrics():
+    """Shared fetch metrics for all sessions in this process"""
+    return FetchMetrics(METRICS_LATENCY_BUCKETS)
+
+# Per-thread stack of "did this call miss the cache" flags (cached fetchers can nest)
+_fetch_local = threading.local()
+
+LAST_KNOWN_GOOD_MAX_ENTRIES = 512
+
+class LastKnownGood:
+    """Last successful result per fetcher call (LRU), served while the provider's circuit is open"""
+
+    def __init__(self, max_entries):
+        self._lock = threading.Lock()
+        self._max_entries = max_entries
+        self._values = OrderedDict()
+
+    def put(self, key, value):
+        with self._lock:
+            self._values[key] = value
+            self._values.move_to_end(key)
+            while len(self._values) > self._max_entries:
+                self._values.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            return self._values.get(key)
+
+@process_resource
+def get_last_known_good():
+    """Shared last-known-good results for all sessions in this process"""
+    return LastKnownGood(LAST_KNOWN_GOOD_MAX_ENTRIES)
+
+# Cached fetchers by name, for scoped invalidation
+CACHED_FETCHERS = {}
+
+# Parameter names holding a kline interval (CHART_INTERVALS keys are interval strings too)
+INTERVAL_PARAMS = ('interval', 'tf_key', 'timeframe_key')
+CACHE_INDEX_MAX_AGE = 2 * 3600  # Longer than any fetcher TTL
+
+class CacheEntryIndex:
+    """
+    Arguments and store time of every cached fetcher entry computed in this process,
+    so entries can be invalidated per function, symbol, interval or age.
+    """
+
+    def __init__(self, max_age):
+        self._lock = threading.Lock()
+        self._max_age = max_age
+        self._entries = {}  # (function, args, kwargs) -> (bound params, stored_at)
+
+    def record(self, function, args, kwargs, params):
+        key = (function, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return
+
+        now = time.time()
+        with self._lock:
+            self._entries[key] = (params, now)
+            for k in [k for k, (_, stored_at) in self._entries.items() if now - stored_at > self._max_age]:
+                del self._entries[k]
+
+    def pop_matching(self, functions=None, symbol=None, interval=None, older_than=None):
+        """Remove and return (function, args, kwargs) of the entries matching every given filter"""
+        now = time.time()
+        matched = []
+        with self._lock:
+            for key, (params, stored_at) in self._entries.items():
+                function = key[0]
+                if functions is not None and function not in functions:
+                    continue
+                if symbol is not None and params.get('symbol') != symbol:
+                    continue
+                if interval is not None and interval not in [params.get(p) for p in INTERVAL_PARAMS]:
+                    continue
+                if older_than is not None and now - stored_at <= older_than:
+                    continue
+                matched.append(key)
+
+            for key in matched:
+                del self._entries[key]
+        return [(function, args, dict(kwargs)) for function, args, kwargs in matched]
+
+@process_resource
+def get_cache_index():
+    """Shared cache entry index for all sessions in this process"""
+    return CacheEntryIndex(CACHE_INDEX_MAX_AGE)
+
+def invalidate_cache(functions=None, symbol=None, interval=None, older_than=None):
     """
+    Invalidate cached fetcher entries by scope instead of clearing every cache in the process.
+    Filters combine: symbol/interval only match entries of fetchers taking such an argument,
+    older_than (seconds) only entries computed longer ago. Returns the number of entries dropped.
+    """
+    entries = get_cache_index().pop_matching(functions, symbol, interval, older_than)
+    for function, args, kwargs in entries:
+        fetcher = CACHED_FETCHERS.get(function)
+        if fetcher is not None:
+            fetcher.clear(*args, **kwargs)
+    return len(entries)
+
+def invalidate_page_cache(mode, symbol, chart_interval):
+    """Invalidate only what the given page shows (Refresh Data button)"""
+    if mode == "📈 Chart Analysis":
+        return (invalidate_cache(symbol=symbol, interval=chart_interval)
+                + invalidate_cache(functions=['fetch_coingecko_markets'])
+                + invalidate_cache(functions=['fetch_current_fng']))
+    elif mode == "📊 Market Overview":
+        return invalidate_cache(functions=['fetch_top_coins', 'fetch_market_dominance'])
+    elif mode == "📰 News & Trends":
+        get_news_aggregator().maybe_poll(force=True)  # Articles live in the news store, not a cache
+        return 0
+    return 0  # Calculators and Seasonality use no cached fetchers
+
+def cached_fetch(provider, cache):
+    """
+    Decorator for fetchers: wraps func in single-flight coalescing and the given cache
+    decorator (st.cache_data(...) or swr_cache(...)), and records metrics. The upstream
+    function only runs on a cache miss, which is how hits are told apart from misses.
+    """
+    def decorator(func):
+        name = func.__name__
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def upstream(*args, **kwargs):
+            misses = getattr(_fetch_local, 'misses', None)
+            if misses:
+                misses[-1] = True
+            get_cache_index().record(name, args, kwargs, signature.bind(*args, **kwargs).arguments)
+
+            key = (name, args, tuple(sorted(kwargs.items())))
+            try:
+                hash(key)
+            except TypeError:
+                key = None  # No last-known-good for unhashable arguments
+
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                get_fetch_metrics().record_upstream(name, provider, time.perf_counter() - start, 'error', 0)
+                fallback = get_last_known_good().get(key) if key is not None and provider_circuit_open(provider) else None
+                if fallback is None:
+                    raise
+                get_fetch_metrics().record_fallback(name, provider, 'last_known_good')
+                return fallback
+
+            outcome = fetch_outcome(result)
+            get_fetch_metrics().record_upstream(name, provider, time.perf_counter() - start,
+                                                outcome, payload_size(result))
+            if key is None:
+                return result
+            if outcome == 'ok':
+                get_last_known_good().put(key, result)
+            elif provider_circuit_open(provider):
+                # Provider is down - the last good result beats an empty one
+                fallback = get_last_known_good().get(key)
+                if fallback is not None:
+                    get_fetch_metrics().record_fallback(name, provider, 'last_known_good')
+                    return fallback
+            return result
+
+        cached = cache(single_flight(upstream))
+        CACHED_FETCHERS[name] = cached
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not hasattr(_fetch_local, 'misses'):
+                _fetch_local.misses = []
+            _fetch_local.misses.append(False)
+            try:
+                return cached(*args, **kwargs)
+            finally:
+                get_fetch_metrics().record_call(name, provider, _fetch_local.misses.pop())
+
+        wrapper.clear = cached.clear
+        return wrapper
+
+    return decorator
+
+def get_admin_token():
+    """Token unlocking the hidden admin page (?admin=<token>), from secrets or environment"""
+    try:
+        token = st.secrets.get("ADMIN_TOKEN", None)
+    except Exception:
+        token = None
+    return token or os.environ.get('KRYPTOVIEW_ADMIN_TOKEN')
+
+def render_admin_metrics_page():
+    """Hidden admin page with the fetch metrics of this process"""
+    metrics = get_fetch_metrics()
+    st.markdown("## 🛠️ Fetch Metrics")
+    st.caption(f"Process {os.getpid()} · metrics file: {METRICS_EXPORT_PATH}")
+
+    summary, fallbacks = metrics.summary()
+    if summary.empty:
+        st.info("No fetches recorded yet.")
+    else:
+        st.dataframe(summary, use_container_width=True, hide_index=True)
+
+    st.markdown("### Circuit breakers")
+    st.dataframe(pd.DataFrame([
+        {'provider': b.provider, 'state': b.state, 'consecutive_failures': b.failures, 'cooldown_s': b.cooldown}
+        for b in sorted(get_circuit_breakers().values(), key=lambda b: b.provider)
+    ]), use_container_width=True, hide_index=True)
+
+    st.markdown("### Fallbacks")
+    if fallbacks.empty:
+        st.caption("No fallback activations.")
+    else:
+        st.dataframe(fallbacks, use_container_width=True, hide_index=True)
+
+    prometheus_text = metrics.to_prometheus()
+    col_export, col_download = st.columns(2)
+    with col_export:
+        if st.button("💾 Write metrics file", use_container_width=True, key="admin_export_metrics"):
+            metrics.export()
+            st.success(f"Written to {METRICS_EXPORT_PATH}")
+    with col_download:
+        st.download_button("⬇️ Download metrics.prom", prometheus_text, file_name='metrics.prom',
+                           mime='text/plain', use_container_width=True, key="admin_download_metrics")
+
+    with st.expander("Prometheus text"):
+        st.code(prometheus_text, language='text')
+
+    st.markdown("### Cache")
+    col_age, col_invalidate = st.columns(2)
+    with col_age:
+        max_age_min = st.number_input("Invalidate entries older than (minutes)", min_value=0, value=10,
+                                      key="admin_invalidate_age")
+    with col_invalidate:
+        if st.button("🧹 Invalidate", use_container_width=True, key="admin_invalidate"):
+            dropped = invalidate_cache(older_than=max_age_min * 60)
+            st.success(f"Invalidated {dropped} cache entries")
+
+# Cache functions
+# CACHE_VERSION is used to bust cache when we change data fetching logic
+CACHE_VERSION = "v3_kline_store"
+
+@single_flight
+def load_chart_data(symbol, interval, limit):
+    """Load candles from Binance (through the local kline store) with CoinGecko fallback - uncached"""
     if client is None:
-        return pd.DataFrame()
+        # Try CoinGecko as fallback
+        get_fetch_metrics().record_fallback('load_chart_data', 'binance', 'coingecko')
+        return fetch_data_coingecko_fallback(symbol, limit)
 
     try:
-        print(f"🔴 NO CACHE: Fetching {limit} candles for {symbol} ({interval})")
+        if not symbol_listed(symbol):
+            raise SymbolUnavailable(f"{symbol} is not trading on Binance")
 
-        # Binance allows max 1000 candles per request
-        if limit <= 1000:
-            klines = client.get_klines(symbol=symbol, interval=interval, limit=limit)
-            print(f"📊 NO CACHE: Fetched {len(klines)} candles")
-        else:
-            # Multiple requests needed
-            all_klines = []
-            chunks_needed = (limit // 1000) + 1
-            remaining = limit
-            end_time = int(datetime.now().timestamp() * 1000)
+        df = load_candles(symbol, interval, limit)
 
-            for i in range(chunks_needed):
-                try:
-                    chunk_size = min(1000, remaining)
-                    chunk = client.get_klines(
-                        symbol=symbol,
-                        interval=interval,
-                        limit=chunk_size,
-                        endTime=end_time
-                    )
+        if df.empty:
+            get_fetch_metrics().record_fallback('load_chart_data', 'binance', 'coingecko')
+            return fetch_data_coingecko_fallback(symbol, limit)
+
+        return df
+    except (ProviderUnavailable, BinanceRateLimited, SymbolUnavailable) as e:
+        # Binance is failing fast (or dropped the pair) - stored candles beat approximated ones
+        df = load_candles(symbol, interval, limit, offline=True)
+        if not df.empty:
+            print(f"Binance unavailable ({e}), serving stored candles for {symbol} ({interval})")
+            get_fetch_metrics().record_fallback('load_chart_data', 'binance', 'kline_store')
+            return df
+        get_fetch_metrics().record_fallback('load_chart_data', 'binance', 'coingecko')
+        return fetch_data_coingecko_fallback(symbol, limit)
+    except Exception as e:
+        print(f"Binance error: {e}, trying CoinGecko fallback...")
+        get_fetch_metrics().record_fallback('load_chart_data', 'binance', 'coingecko')
+        return fetch_data_coingecko_fallback(symbol, limit)
 
-                    if not chunk:
-                        break
+def timeframe_cache_ttl(symbol, tf_key, _cache_version=CACHE_VERSION):
+    """Seconds fetch_timeframe_data results stay fresh - the cache_ttl of the interval"""
+    return CHART_INTERVALS[tf_key]['cache_ttl']
 
-                    all_klines = chunk + all_klines
-                    remaining -= len(chunk)
-                    end_time = int(chunk[0][0]) - 1
+# Stale candles are still shown while the refresh runs (the live kline feed covers the gap)
+@cached_fetch('binance', swr_cache(ttl=timeframe_cache_ttl, max_stale=600))
+def fetch_timeframe_data(symbol, tf_key, _cache_version=CACHE_VERSION):
+    """Fetch candles for a CHART_INTERVALS key, fresh for CHART_INTERVALS[tf_key]['cache_ttl'] seconds"""
+    tf_config = CHART_INTERVALS[tf_key]
+    return load_chart_data(symbol, tf_config['interval'], tf_config['limit'])
 
-                    if remaining <= 0:
-                        break
+def fetch_multi_timeframe_data(symbol, tf_keys):
+    """Fetch several CHART_INTERVALS timeframes concurrently through the cache"""
+    ctx = get_script_run_ctx()
 
-                except Exception as e:
-                    print(f"Error fetching chunk {i}: {e}")
-                    break
+    def load(tf_key):
+        # The pool is joined before the script continues, so lending it this session's context is safe
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fetch_timeframe_data(symbol, tf_key)
+
+    with ThreadPoolExecutor(max_workers=len(tf_keys)) as executor:
+        return dict(zip(tf_keys, executor.map(load, tf_keys)))
+
+# Background prefetch of likely-next chart views (process-wide budget)
+PREFETCH_WORKERS = 2
+PREFETCH_BUDGET_PER_MINUTE = 20  # Max prefetched chart loads per minute
+PREFETCH_TOP_SYMBOLS = 3  # Most-viewed symbols warmed on each navigation
+PREFETCH_MIN_WEIGHT_AVAILABLE = 0.5  # Skip prefetching when Binance weight is running low
+
+class PrefetchScheduler:
+    """
+    Warms the fetch_timeframe_data cache entries a user is likely to open next: the
+    neighbouring intervals of the current chart and the most-viewed symbols at the
+    current interval. Prefetches never take more than the per-minute budget or the
+    spare Binance request weight.
+    """
+
+    def __init__(self, workers, budget_per_minute):
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='prefetch')
+        self._budget = budget_per_minute
+        self._started = deque()  # monotonic start times of recent prefetches
+        self._scheduled = {}  # (symbol, tf_key) -> monotonic time it was last warmed or queued
+        self._views = Counter()  # symbol -> number of chart views
+
+    def observe_navigation(self, session_state, symbol, tf_key):
+        """Record a chart view when the session moved to a new symbol/interval and schedule prefetches"""
+        view = (symbol, tf_key)
+        if session_state.get('prefetch_last_view') == view:
+            return
+        session_state['prefetch_last_view'] = view
+
+        with self._lock:
+            self._views[symbol] += 1
+            top_symbols = [s for s, _ in self._views.most_common(PREFETCH_TOP_SYMBOLS + 1) if s != symbol]
+
+        tf_keys = list(CHART_INTERVALS)
+        i = tf_keys.index(tf_key)
+        candidates = [(symbol, tf_keys[j]) for j in (i - 1, i + 1) if 0 <= j < len(tf_keys)]
+        candidates += [(s, tf_key) for s in top_symbols[:PREFETCH_TOP_SYMBOLS]]
+
+        for candidate_symbol, candidate_tf in candidates:
+            self._schedule(candidate_symbol, candidate_tf)
+
+    def _schedule(self, symbol, tf_key):
+        job = (symbol, tf_key)
+
+        with self._lock:
+            now = time.monotonic()
+            while self._started and now - self._started[0] > 60:
+                self._started.popleft()
+            # Entries only stay fresh for their interval's cache_ttl, so only those are worth remembering
+            self._scheduled = {j: t for j, t in self._scheduled.items()
+                               if now - t < timeframe_cache_ttl(*j)}
+            if job in self._scheduled or len(self._started) >= self._budget:
+                return
+            if get_binance_governor().available('spot') < PREFETCH_MIN_WEIGHT_AVAILABLE:
+                return
+            self._started.append(now)
+            self._scheduled[job] = now
+
+        # Runs after the navigating session may have moved on, so no script run context -
+        # fetch_timeframe_data goes through the process-wide SWR cache
+        def warm():
+            try:
+                fetch_timeframe_data(symbol, tf_key)
+            except Exception as e:
+                print(f"Prefetch of {symbol} ({tf_key}) failed: {e}")
+
+        self._executor.submit(warm)
+
+@st.cache_resource
+def get_prefetch_scheduler():
+    """Shared prefetch scheduler for all sessions in this process"""
+    return PrefetchScheduler(PREFETCH_WORKERS, PREFETCH_BUDGET_PER_MINUTE)
 
-            klines = all_klines
-            if len(klines) > limit:
-                klines = klines[-limit:]
+def fetch_data_no_cache(symbol, interval, limit):
+    """
+    Fetch data WITHOUT CACHE - for debugging and forcing fresh data
+    """
+    if client is None:
+        return pd.DataFrame()
 
-            print(f"📊 NO CACHE: Fetched {len(klines)} candles in {chunks_needed} chunks")
+    try:
+        print(f"🔴 NO CACHE: Fetching {limit} candles for {symbol} ({interval})")
+
+        klines, _ = fetch_latest_klines(symbol, interval, limit)
+        print(f"📊 NO CACHE: Fetched {len(klines)} candles")
 
         if not klines:
             return pd.DataFrame()
 
-        df = pd.DataFrame(klines, columns=['timestamp', 'Open', 'High', 'Low', 'Close', 'Volume',
-                                           'Close_time', 'Quote_asset_volume', 'Number_of_trades',
-                                           'Taker_buy_base_volume', 'Taker_buy_quote_volume', 'Ignore'])
-        df['Close'] = df['Close'].astype(float)
-        df['High'] = df['High'].astype(float)
-        df['Low'] = df['Low'].astype(float)
-        df['Volume'] = df['Volume'].astype(float)
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        df = kline_frame(*decode_klines(klines))
 
         print(f"✅ NO CACHE: Returning {len(df)} rows from {df['timestamp'].min()} to {df['timestamp'].max()}")
         return df
@@ -675,7 +2830,7 @@ def fetch_data_no_cache(symbol, interval, limit):
         print(f"❌ NO CACHE ERROR: {e}")
         return pd.DataFrame()
 
-@st.cache_data(ttl=60)  # Changed from 600 to 60 for faster refresh
+@cached_fetch('binance', st.cache_data(ttl=60))  # Changed from 600 to 60 for faster refresh
 def fetch_data_smart(symbol, timeframe_key, _cache_version=CACHE_VERSION):
     """
     Smart data fetching based on timeframe with accurate date ranges:
@@ -698,50 +2853,31 @@ def fetch_data_smart(symbol, timeframe_key, _cache_version=CACHE_VERSION):
     config = timeframe_config.get(timeframe_key)
     if not config:
         # Default fallback
-        return fetch_data(symbol, Client.KLINE_INTERVAL_1DAY, limit=365)
+        return load_chart_data(symbol, Client.KLINE_INTERVAL_1DAY, limit=365)
 
     # Use Binance for all timeframes (more accurate)
-    return fetch_data(symbol, config['interval'], limit=config['limit'])
+    return load_chart_data(symbol, config['interval'], limit=config['limit'])
+
+def fetch_failure(message):
+    """
+    Empty frame carrying a user-facing reason in attrs['error']. Fetchers may run in
+    background refresh threads, so they leave showing the message to the page.
+    """
+    df = pd.DataFrame()
+    df.attrs['error'] = message
+    return df
 
-@st.cache_data(ttl=600)  # Cache for 10 minutes to reduce API calls
+@cached_fetch('coingecko', st.cache_data(ttl=600))  # Cache for 10 minutes to reduce API calls
 def fetch_data_coingecko_fallback(symbol, limit, days=None):
     """Fallback to CoinGecko when Binance is unavailable"""
-    # Map Binance symbols to CoinGecko IDs (comprehensive list)
-    coin_map = {
-        'BTCUSDT': 'bitcoin', 'ETHUSDT': 'ethereum', 'BNBUSDT': 'binancecoin',
-        'SOLUSDT': 'solana', 'XRPUSDT': 'ripple', 'ADAUSDT': 'cardano',
-        'AVAXUSDT': 'avalanche-2', 'DOGEUSDT': 'dogecoin', 'TRXUSDT': 'tron',
-        'DOTUSDT': 'polkadot', 'MATICUSDT': 'matic-network', 'LINKUSDT': 'chainlink',
-        'TONUSDT': 'the-open-network', 'SHIBUSDT': 'shiba-inu', 'LTCUSDT': 'litecoin',
-        'BCHUSDT': 'bitcoin-cash', 'UNIUSDT': 'uniswap', 'XLMUSDT': 'stellar',
-        'ATOMUSDT': 'cosmos', 'ETCUSDT': 'ethereum-classic', 'HBARUSDT': 'hedera-hashgraph',
-        'FILUSDT': 'filecoin', 'ARBUSDT': 'arbitrum', 'OPUSDT': 'optimism',
-        'VETUSDT': 'vechain', 'ALGOUSDT': 'algorand', 'NEARUSDT': 'near',
-        'APTUSDT': 'aptos', 'INJUSDT': 'injective-protocol', 'SUIUSDT': 'sui',
-        'RNDRUSDT': 'render-token', 'FTMUSDT': 'fantom', 'THETAUSDT': 'theta-token',
-        'XMRUSDT': 'monero', 'KASUSDT': 'kaspa', 'STXUSDT': 'blockstack',
-        'IMXUSDT': 'immutable-x', 'CROUSDT': 'crypto-com-chain', 'MNTUSDT': 'mantle',
-        'GRTUSDT': 'the-graph', 'QNTUSDT': 'quant-network', 'LDOUSDT': 'lido-dao',
-        'MKRUSDT': 'maker', 'AAVEUSDT': 'aave', 'ARUSDT': 'arweave',
-        'TIAUSDT': 'celestia', 'SEIUSDT': 'sei-network', 'RUNEUSDT': 'thorchain',
-        'AXSUSDT': 'axie-infinity', 'SANDUSDT': 'the-sandbox', 'MANAUSDT': 'decentraland',
-        'GALAUSDT': 'gala', 'ENJUSDT': 'enjincoin', 'FLOWUSDT': 'flow',
-        'CHZUSDT': 'chiliz', 'FLRUSDT': 'flare-networks', 'KAVAUSDT': 'kava',
-        'SNXUSDT': 'synthetix-network-token', 'CRVUSDT': 'curve-dao-token',
-        'COMPUSDT': 'compound-governance-token', 'SUSHIUSDT': 'sushi',
-        '1INCHUSDT': '1inch', 'ZILUSDT': 'zilliqa', 'ZECUSDT': 'zcash',
-        'DASHUSDT': 'dash', 'QTUMUSDT': 'qtum', 'RVNUSDT': 'ravencoin',
-        'ONEUSDT': 'harmony', 'CELOUSDT': 'celo', 'ANKRUSDT': 'ankr',
-        'IOTAUSDT': 'iota', 'WAVESUSDT': 'waves', 'HOTUSDT': 'holotoken',
-        'RENUSDT': 'republic-protocol', 'OMGUSDT': 'omisego', 'LRCUSDT': 'loopring',
-        'FETUSDT': 'fetch-ai', 'OCEANUSDT': 'ocean-protocol', 'NMRUSDT': 'numeraire',
-        'BANDUSDT': 'band-protocol'
-    }
-
-    coin_id = coin_map.get(symbol)
+    coin_id = get_symbol_registry().coingecko_id(symbol)
     if not coin_id:
-        st.error(f"⚠️ Symbol {symbol} not supported in fallback mode.")
-        return pd.DataFrame()
+        return fetch_failure(f"⚠️ Symbol {symbol} not supported in fallback mode.")
+
+    try:
+        get_negative_cache().check('coingecko_market_chart', symbol)
+    except SymbolUnavailable as e:
+        return fetch_failure(f"⚠️ {e}")
 
     try:
         # Use provided days or calculate from limit
@@ -763,86 +2899,138 @@ def fetch_data_coingecko_fallback(symbol, limit, days=None):
         if COINGECKO_API_KEY:
             headers['x-cg-demo-api-key'] = COINGECKO_API_KEY
 
-        # Retry logic with exponential backoff
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                response = requests.get(url, params=params, headers=headers, timeout=15)
+        # Single attempt - no sleeping in the render path, the CoinGecko circuit breaker backs off
+        try:
+            response = get_http_session().get(url, params=params, headers=headers, timeout=15)
 
-                if response.status_code == 429:  # Rate limit
-                    if attempt < max_retries - 1:
-                        time.sleep(2 ** attempt)  # Exponential backoff: 1s, 2s, 4s
-                        continue
-                    else:
-                        st.warning("⚠️ CoinGecko rate limit reached. Using cached data if available.")
-                        return pd.DataFrame()
+            if response.status_code == 429:  # Rate limit
+                return fetch_failure("⚠️ CoinGecko rate limit reached. Using cached data if available.")
 
-                response.raise_for_status()
-                data = response.json()
-                break
+            if response.status_code == 404:  # Unknown coin id
+                get_negative_cache().record_failure('coingecko_market_chart', symbol, 'coin not found')
+                return fetch_failure(f"⚠️ {symbol} not found on CoinGecko.")
 
-            except requests.exceptions.RequestException as e:
-                if attempt < max_retries - 1:
-                    time.sleep(1)
-                    continue
-                else:
-                    st.error(f"⚠️ Network error: {str(e)}")
-                    return pd.DataFrame()
+            response.raise_for_status()
+            data = response.json()
 
-        if 'prices' not in data:
-            st.error("⚠️ Invalid response from CoinGecko API.")
-            return pd.DataFrame()
+        except requests.exceptions.RequestException as e:
+            return fetch_failure(f"⚠️ Network error: {str(e)}")
 
-        # Convert to DataFrame
-        prices = data['prices']
-        volumes = data.get('total_volumes', [])
+        if 'prices' not in data:
+            return fetch_failure("⚠️ Invalid response from CoinGecko API.")
 
-        df = pd.DataFrame({
-            'timestamp': [pd.to_datetime(p[0], unit='ms') for p in prices],
-            'Close': [p[1] for p in prices],
-            'Volume': [v[1] if len(volumes) > i else 0 for i, v in enumerate(volumes)]
-        })
+        # Convert to numpy columns
+        prices = np.asarray(data['prices'], dtype=np.float64).reshape(-1, 2)
+        total_volumes = np.asarray(data.get('total_volumes', []), dtype=np.float64).reshape(-1, 2)
+        volumes = np.zeros(len(prices))
+        matched = min(len(prices), len(total_volumes))
+        volumes[:matched] = total_volumes[:matched, 1]
 
         # Approximate OHLC from close prices (not ideal but works)
-        df['Open'] = df['Close'].shift(1).fillna(df['Close'])
-        df['High'] = df['Close'] * 1.01  # Approximate
-        df['Low'] = df['Close'] * 0.99   # Approximate
+        close = prices[:, 1]
+        open_price = np.concatenate([close[:1], close[:-1]])
+        ohlc = np.column_stack([open_price, close * 1.01, close * 0.99, close])
 
         # Limit to requested number of rows
-        df = df.tail(limit)
+        df = kline_frame(prices[:, 0].astype(np.int64), ohlc, volumes).tail(limit)
 
         return df
 
     except Exception as e:
-        st.error(f"⚠️ CoinGecko fallback failed: {e}")
-        return pd.DataFrame()
+        return fetch_failure(f"⚠️ CoinGecko fallback failed: {e}")
+
+# Local Fear & Greed history: downloaded once, then only the days missing since the last stored one
+FNG_DB_PATH = os.path.join(DATA_DIR, 'fng.sqlite3')
+FNG_URL = "https://api.alternative.me/fng/"
+FNG_TIMEOUT = 10
+
+@st.cache_resource
+def init_fng_store():
+    """Create the F&G store schema once per process and return the write lock"""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    conn = sqlite3.connect(FNG_DB_PATH, timeout=30)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS fng (
+                timestamp INTEGER PRIMARY KEY,
+                value INTEGER NOT NULL,
+                value_classification TEXT
+            )
+        """)
+        conn.commit()
+    finally:
+        conn.close()
+    return threading.Lock()
+
+def fng_store_connect():
+    """Open a connection to the F&G store"""
+    init_fng_store()
+    return sqlite3.connect(FNG_DB_PATH, timeout=30)
+
+@single_flight
+def sync_fng_store():
+    """Bring the F&G store up to date (full history on first run); returns the number of rows downloaded"""
+    conn = fng_store_connect()
+    try:
+        last_day = conn.execute("SELECT MAX(timestamp) FROM fng").fetchone()[0]
+    finally:
+        conn.close()
+
+    today = int(time.time()) // 86_400 * 86_400  # F&G values are published per UTC day
+    if last_day is not None and last_day >= today:
+        return 0
+
+    # limit=0 is the full history, otherwise the missing days plus the last stored one
+    limit = 0 if last_day is None else (today - last_day) // 86_400 + 1
+    r = get_http_session().get(FNG_URL, params={'limit': limit}, timeout=FNG_TIMEOUT)
+    r.raise_for_status()
+    rows = [(int(d['timestamp']), int(d['value']), d['value_classification']) for d in r.json()['data']]
+
+    with init_fng_store():
+        conn = fng_store_connect()
+        try:
+            conn.executemany("INSERT OR REPLACE INTO fng VALUES (?, ?, ?)", rows)
+            conn.commit()
+        finally:
+            conn.close()
+    return len(rows)
+
+def fng_store_read(limit=None):
+    """Stored F&G values (the latest `limit` days, or all), oldest first"""
+    conn = fng_store_connect()
+    try:
+        rows = conn.execute(
+            "SELECT timestamp, value, value_classification FROM fng ORDER BY timestamp DESC LIMIT ?",
+            (-1 if limit is None else int(limit),)
+        ).fetchall()
+    finally:
+        conn.close()
+
+    df = pd.DataFrame(rows[::-1], columns=['timestamp', 'value', 'value_classification'])
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s')
+    return df
+
+def load_fng(limit=None):
+    """Sync the F&G store (keeping stored data if the API fails) and read from it"""
+    try:
+        sync_fng_store()
+    except Exception as e:
+        print(f"Error syncing Fear & Greed store: {e}")
+    return fng_store_read(limit)
 
-@st.cache_data(ttl=3600)
+@cached_fetch('alternative.me', st.cache_data(ttl=3600))
 def fetch_fng():
-    url = "https://api.alternative.me/fng/?limit=0"
-    try:
-        r = requests.get(url)
-        data = r.json()["data"]
-        df = pd.DataFrame(data)
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s')
-        df['value'] = pd.to_numeric(df['value'])
-        df = df.sort_values("timestamp").reset_index(drop=True)
-        return df
-    except:
-        return pd.DataFrame()
+    """Fear & Greed history from the local F&G store"""
+    return load_fng()
 
-@st.cache_data(ttl=3600)
+@cached_fetch('alternative.me', st.cache_data(ttl=600))  # Cheap: no request once today's value is stored
 def fetch_current_fng():
-    """Fetch current Fear & Greed Index"""
-    url = "https://api.alternative.me/fng/?limit=1"
-    try:
-        r = requests.get(url, timeout=5)
-        data = r.json()["data"][0]
-        value = int(data['value'])
-        classification = data['value_classification']
-        return value, classification
-    except:
+    """Fetch current Fear & Greed Index (latest stored day)"""
+    latest = load_fng(limit=1)
+    if latest.empty:
         return None, None
+    return int(latest['value'].iloc[-1]), latest['value_classification'].iloc[-1]
 
 def get_fng_color(value):
     """Get color based on Fear & Greed value"""
@@ -857,139 +3045,178 @@ def get_fng_color(value):
     else:
         return "#00FF00", "🤑"  # Extreme Greed - Green
 
-@st.cache_data(ttl=60)
-def fetch_24h_ticker(symbol):
-    """Fetch 24h ticker statistics from Binance"""
+# Binance 24h ticker fields kept in the ticker snapshot, by snapshot column
+TICKER_FIELDS = {
+    'price_change': 'priceChange',
+    'price_change_percent': 'priceChangePercent',
+    'high_price': 'highPrice',
+    'low_price': 'lowPrice',
+    'volume': 'volume',
+    'quote_volume': 'quoteVolume',
+    'open_price': 'openPrice',
+    'last_price': 'lastPrice',
+    'bid_price': 'bidPrice',
+    'ask_price': 'askPrice',
+    'trades_count': 'count',
+}
+
+@cached_fetch('binance', swr_cache(ttl=30, max_stale=300))
+def fetch_ticker_snapshot():
+    """
+    24h ticker statistics of every USDT pair in one request, as a columnar table indexed
+    by symbol. Per-symbol lookups and gainers/losers all read from this snapshot.
+    """
     if client is None:
         return None
     try:
-        ticker = client.get_ticker(symbol=symbol)
-        return {
-            'price_change': float(ticker['priceChange']),
-            'price_change_percent': float(ticker['priceChangePercent']),
-            'high_price': float(ticker['highPrice']),
-            'low_price': float(ticker['lowPrice']),
-            'volume': float(ticker['volume']),
-            'quote_volume': float(ticker['quoteVolume']),
-            'open_price': float(ticker['openPrice']),
-            'last_price': float(ticker['lastPrice']),
-            'bid_price': float(ticker['bidPrice']),
-            'ask_price': float(ticker['askPrice']),
-            'trades_count': int(ticker['count'])
-        }
+        tickers = binance_call('ticker_24hr_all', client.get_ticker)
+        raw = pd.DataFrame.from_records(tickers, columns=['symbol'] + list(TICKER_FIELDS.values()))
+        raw = raw[raw['symbol'].str.endswith('USDT')]
+
+        snapshot = pd.DataFrame(index=pd.Index(raw['symbol'].values, name='symbol'))
+        for column, field in TICKER_FIELDS.items():
+            snapshot[column] = raw[field].values.astype(np.int64 if column == 'trades_count' else np.float64)
+        return snapshot
     except Exception as e:
+        print(f"Error fetching ticker snapshot: {e}")
         return None
 
-@st.cache_data(ttl=10)
+def fetch_24h_ticker(symbol):
+    """24h ticker statistics for one symbol, from the shared ticker snapshot"""
+    snapshot = fetch_ticker_snapshot()
+    if snapshot is None or symbol not in snapshot.index:
+        return None
+
+    row = snapshot.loc[symbol]
+    ticker = {column: float(row[column]) for column in TICKER_FIELDS}
+    ticker['trades_count'] = int(row['trades_count'])
+    return ticker
+
 def fetch_order_book(symbol, limit=20):
-    """Fetch order book depth from Binance"""
+    """Order book depth: from the local streamed book once it is in sync, else a REST snapshot"""
+    if BINANCE_AVAILABLE:
+        feed = get_order_book_feed()
+        feed.watch(symbol)
+        depth = feed.depth(symbol, limit)
+        if depth is not None:
+            return depth
+    return fetch_order_book_snapshot(symbol, limit)
+
+@cached_fetch('binance', st.cache_data(ttl=10))
+def fetch_order_book_snapshot(symbol, limit=20):
+    """Fetch an order book depth snapshot from the Binance REST API"""
     if client is None:
         return None
     try:
-        depth = client.get_order_book(symbol=symbol, limit=limit)
-        bids = [[float(price), float(qty)] for price, qty in depth['bids']]
-        asks = [[float(price), float(qty)] for price, qty in depth['asks']]
-        return {'bids': bids, 'asks': asks}
+        depth = binance_call('depth', client.get_order_book, symbol=symbol, limit=limit,
+                             weight=order_book_weight(limit))
+        return {'bids': np.asarray(depth['bids'], dtype=np.float64).reshape(-1, 2),
+                'asks': np.asarray(depth['asks'], dtype=np.float64).reshape(-1, 2)}
     except Exception as e:
         return None
 
-@st.cache_data(ttl=10)
-def fetch_recent_trades(symbol, limit=20):
-    """Fetch recent trades from Binance"""
+def fetch_recent_trades(symbol, limit=1000):
+    """Recent trades (TRADE_DTYPE array, oldest first): a view over the live trade tape, else REST"""
+    if BINANCE_AVAILABLE:
+        feed = get_trade_tape_feed()
+        feed.watch(symbol)
+        trades = feed.trades(symbol, limit)
+        if trades is not None:
+            return trades
+    return fetch_recent_trades_snapshot(symbol, min(limit, TRADE_TAPE_SEED_LIMIT))
+
+def fetch_trade_size_reference(symbol):
+    """Quantity drawn at full marker size: the largest trade on the live tape (None without one)"""
+    if not BINANCE_AVAILABLE:
+        return None
+    return get_trade_tape_feed().max_qty(symbol)
+
+@cached_fetch('binance', st.cache_data(ttl=10))
+def fetch_recent_trades_snapshot(symbol, limit=20):
+    """Fetch recent aggregate trades from the Binance REST API"""
     if client is None:
         return None
     try:
-        trades = client.get_recent_trades(symbol=symbol, limit=limit)
-        return [{
-            'price': float(t['price']),
-            'qty': float(t['qty']),
-            'time': pd.to_datetime(t['time'], unit='ms'),
-            'is_buyer_maker': t['isBuyerMaker']
-        } for t in trades]
+        trades = binance_call('agg_trades', client.get_aggregate_trades, symbol=symbol, limit=limit)
+        return agg_trade_records(trades)
     except Exception as e:
         return None
 
-@st.cache_data(ttl=300)
-def fetch_coingecko_data(symbol):
-    """Fetch comprehensive data from CoinGecko API"""
-    # Map Binance symbols to CoinGecko IDs (Top coins)
-    coin_map = {
-        'BTCUSDT': 'bitcoin', 'ETHUSDT': 'ethereum', 'BNBUSDT': 'binancecoin',
-        'SOLUSDT': 'solana', 'XRPUSDT': 'ripple', 'ADAUSDT': 'cardano',
-        'AVAXUSDT': 'avalanche-2', 'DOGEUSDT': 'dogecoin', 'TRXUSDT': 'tron',
-        'DOTUSDT': 'polkadot', 'MATICUSDT': 'matic-network', 'LINKUSDT': 'chainlink',
-        'TONUSDT': 'the-open-network', 'SHIBUSDT': 'shiba-inu', 'LTCUSDT': 'litecoin',
-        'BCHUSDT': 'bitcoin-cash', 'UNIUSDT': 'uniswap', 'XLMUSDT': 'stellar',
-        'ATOMUSDT': 'cosmos', 'ETCUSDT': 'ethereum-classic', 'HBARUSDT': 'hedera-hashgraph',
-        'FILUSDT': 'filecoin', 'ARBUSDT': 'arbitrum', 'OPUSDT': 'optimism',
-        'VETUSDT': 'vechain', 'ALGOUSDT': 'algorand', 'NEARUSDT': 'near',
-        'APTUSDT': 'aptos', 'INJUSDT': 'injective-protocol', 'SUIUSDT': 'sui',
-        'RNDRUSDT': 'render-token', 'FTMUSDT': 'fantom', 'THETAUSDT': 'theta-token',
-        'XMRUSDT': 'monero', 'KASUSDT': 'kaspa', 'STXUSDT': 'blockstack',
-        'IMXUSDT': 'immutable-x', 'CROUSDT': 'crypto-com-chain', 'MNTUSDT': 'mantle',
-        'GRTUSDT': 'the-graph', 'QNTUSDT': 'quant-network', 'LDOUSDT': 'lido-dao',
-        'MKRUSDT': 'maker', 'AAVEUSDT': 'aave', 'ARUSDT': 'arweave',
-        'TIAUSDT': 'celestia', 'SEIUSDT': 'sei-network', 'RUNEUSDT': 'thorchain',
-        'AXSUSDT': 'axie-infinity', 'SANDUSDT': 'the-sandbox', 'MANAUSDT': 'decentraland',
-        'GALAUSDT': 'gala', 'ENJUSDT': 'enjincoin', 'FLOWUSDT': 'flow',
-        'CHZUSDT': 'chiliz', 'FLRUSDT': 'flare-networks', 'KAVAUSDT': 'kava',
-        'SNXUSDT': 'synthetix-network-token', 'CRVUSDT': 'curve-dao-token',
-        'COMPUSDT': 'compound-governance-token', 'SUSHIUSDT': 'sushi',
-        '1INCHUSDT': '1inch', 'ZILUSDT': 'zilliqa', 'ZECUSDT': 'zcash',
-        'DASHUSDT': 'dash', 'QTUMUSDT': 'qtum', 'RVNUSDT': 'ravencoin',
-        'ONEUSDT': 'harmony', 'CELOUSDT': 'celo', 'ANKRUSDT': 'ankr',
-        'IOTAUSDT': 'iota', 'WAVESUSDT': 'waves', 'HOTUSDT': 'holotoken',
-        'RENUSDT': 'republic-protocol', 'OMGUSDT': 'omisego', 'LRCUSDT': 'loopring',
-        'FETUSDT': 'fetch-ai', 'OCEANUSDT': 'ocean-protocol', 'NMRUSDT': 'numeraire',
-        'BANDUSDT': 'band-protocol'
-    }
-
-    coin_id = coin_map.get(symbol)
-    if not coin_id:
-        return None
+# /coins/markets fields kept in the CoinGecko markets table, by fetch_coingecko_data key
+COINGECKO_MARKET_FIELDS = {
+    'market_cap': 'market_cap',
+    'total_volume': 'total_volume',  # 24h trading volume
+    'ath': 'ath',
+    'ath_date': 'ath_date',
+    'ath_change_percentage': 'ath_change_percentage',
+    'atl': 'atl',
+    'atl_date': 'atl_date',
+    'atl_change_percentage': 'atl_change_percentage',
+    'circulating_supply': 'circulating_supply',
+    'total_supply': 'total_supply',
+    'max_supply': 'max_supply',
+    'market_cap_rank': 'market_cap_rank',
+    'price_change_percentage_1h': 'price_change_percentage_1h_in_currency',
+    'price_change_percentage_24h': 'price_change_percentage_24h_in_currency',
+    'price_change_percentage_7d': 'price_change_percentage_7d_in_currency',
+    'price_change_percentage_30d': 'price_change_percentage_30d_in_currency',
+    'price_change_percentage_1y': 'price_change_percentage_1y_in_currency',
+}
+COINGECKO_MARKETS_BATCH = 250  # Max ids per /coins/markets request
 
-    try:
-        url = f"https://api.coingecko.com/api/v3/coins/{coin_id}"
+@cached_fetch('coingecko', swr_cache(ttl=300, max_stale=3600))
+def fetch_coingecko_markets():
+    """
+    Market data of every coin in SYMBOLS from batched /coins/markets requests (250 ids
+    each), as a table indexed by CoinGecko id
+    """
+    registry = get_symbol_registry()
+    coin_ids = sorted({registry.coingecko_id(symbol) for symbol in SYMBOLS.values()} - {None})
 
-        # Add API key to headers if available
-        headers = {}
-        if COINGECKO_API_KEY:
-            headers['x-cg-demo-api-key'] = COINGECKO_API_KEY
+    # Add API key to headers if available
+    headers = {}
+    if COINGECKO_API_KEY:
+        headers['x-cg-demo-api-key'] = COINGECKO_API_KEY
 
-        r = requests.get(url, headers=headers, timeout=10)
-        data = r.json()
+    rows = []
+    try:
+        for i in range(0, len(coin_ids), COINGECKO_MARKETS_BATCH):
+            r = get_http_session().get("https://api.coingecko.com/api/v3/coins/markets", params={
+                'vs_currency': 'usd',
+                'ids': ','.join(coin_ids[i:i + COINGECKO_MARKETS_BATCH]),
+                'per_page': COINGECKO_MARKETS_BATCH,
+                'page': 1,
+                'price_change_percentage': '1h,24h,7d,30d,1y'
+            }, headers=headers, timeout=15)
+            r.raise_for_status()
+            rows.extend(r.json())
+    except Exception as e:
+        # A partial table would hide coins until the next refresh - keep the last complete one instead
+        print(f"Error fetching CoinGecko markets: {e}")
+        return None
 
-        market_data = data['market_data']
+    return pd.DataFrame.from_records(rows, columns=['id'] + list(COINGECKO_MARKET_FIELDS.values())).set_index('id')
 
-        return {
-            'market_cap': market_data['market_cap']['usd'],
-            'total_volume': market_data.get('total_volume', {}).get('usd', 0),  # 24h trading volume
-            'ath': market_data['ath']['usd'],
-            'ath_date': market_data['ath_date']['usd'],
-            'ath_change_percentage': market_data['ath_change_percentage']['usd'],
-            'atl': market_data['atl']['usd'],
-            'atl_date': market_data['atl_date']['usd'],
-            'atl_change_percentage': market_data['atl_change_percentage']['usd'],
-            'circulating_supply': market_data.get('circulating_supply'),
-            'total_supply': market_data.get('total_supply'),
-            'max_supply': market_data.get('max_supply'),
-            'market_cap_rank': data.get('market_cap_rank'),
-            'price_change_percentage_1h': market_data.get('price_change_percentage_1h_in_currency', {}).get('usd'),
-            'price_change_percentage_24h': market_data.get('price_change_percentage_24h'),
-            'price_change_percentage_7d': market_data.get('price_change_percentage_7d'),
-            'price_change_percentage_30d': market_data.get('price_change_percentage_30d'),
-            'price_change_percentage_1y': market_data.get('price_change_percentage_1y'),
-        }
-    except Exception as e:
+def fetch_coingecko_data(symbol):
+    """CoinGecko market data for one symbol, from the batched markets table"""
+    coin_id = get_symbol_registry().coingecko_id(symbol)
+    markets = fetch_coingecko_markets()
+    if not coin_id or markets is None or coin_id not in markets.index:
         return None
 
-@st.cache_data(ttl=300)
+    row = markets.loc[coin_id]
+    data = {key: None if pd.isna(row[field]) else row[field] for key, field in COINGECKO_MARKET_FIELDS.items()}
+    if data['market_cap_rank'] is not None:
+        data['market_cap_rank'] = int(data['market_cap_rank'])
+    return data
+
+@cached_fetch('coingecko', st.cache_data(ttl=300))
 def fetch_market_cap(symbol):
     """Fetch market cap from CoinGecko API (backward compatibility)"""
     data = fetch_coingecko_data(symbol)
     return data['market_cap'] if data else None
 
-@st.cache_data(ttl=600)
+@cached_fetch('coingecko', st.cache_data(ttl=600))
 def fetch_global_crypto_data():
     """Fetch global crypto market data from CoinGecko"""
     try:
@@ -1000,7 +3227,7 @@ def fetch_global_crypto_data():
         if COINGECKO_API_KEY:
             headers['x-cg-demo-api-key'] = COINGECKO_API_KEY
 
-        r = requests.get(url, headers=headers, timeout=10)
+        r = get_http_session().get(url, headers=headers, timeout=10)
         data = r.json()['data']
         return {
             'total_market_cap': data['total_market_cap']['usd'],
@@ -1011,88 +3238,359 @@ def fetch_global_crypto_data():
     except Exception as e:
         return None
 
-@st.cache_data(ttl=300)
-def fetch_crypto_news(limit=10):
-    """Fetch crypto news from CryptoCompare API with images"""
+# News: every source polled concurrently with conditional GETs into a local article store
+NEWS_DB_PATH = os.path.join(DATA_DIR, 'news.sqlite3')
+NEWS_POLL_INTERVAL = 300  # Seconds between polls of the news sources
+NEWS_FIRST_POLL_WAIT = 5  # Seconds a page waits for the very first poll when the store is empty
+NEWS_STORE_MAX_ARTICLES = 500
+NEWS_BODY_LENGTH = 200
+NEWS_THUMBNAIL_PREFETCH = 20  # Newest articles per feed whose thumbnails are generated on poll
+NEWS_SOURCES = [
+    {'name': 'CryptoCompare', 'url': 'https://min-api.cryptocompare.com/data/v2/news/?lang=EN', 'parser': 'cryptocompare'},
+    {'name': 'CoinTelegraph', 'url': 'https://cointelegraph.com/rss', 'parser': 'rss'},
+    {'name': 'CoinDesk', 'url': 'https://www.coindesk.com/arc/outboundfeeds/rss/', 'parser': 'rss'},
+    {'name': 'Decrypt', 'url': 'https://decrypt.co/feed', 'parser': 'rss'},
+]
+NEWS_ARTICLE_COLUMNS = ['title', 'url', 'source', 'published_at', 'body', 'image_url', 'categories', 'tags']
+RSS_MEDIA_NS = '{http://search.yahoo.com/mrss/}'
+
+@process_resource
+def init_news_store():
+    """Create the news store schema once per process and return the write lock"""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    conn = sqlite3.connect(NEWS_DB_PATH, timeout=30)
     try:
-        url = "https://min-api.cryptocompare.com/data/v2/news/?lang=EN"
-        response = requests.get(url, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        # Articles are keyed by a hash of their URL, so re-polled and cross-posted items dedupe
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS articles (
+                url_hash TEXT PRIMARY KEY,
+                title TEXT, url TEXT, source TEXT, published_at INTEGER,
+                body TEXT, image_url TEXT, categories TEXT, tags TEXT
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS articles_published ON articles (published_at)")
+        # Validators of the last 200 response per feed, sent back as If-None-Match / If-Modified-Since
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS feed_state (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT
+            )
+        """)
+        conn.commit()
+    finally:
+        conn.close()
+    return threading.Lock()
+
+def news_store_connect():
+    """Open a connection to the news store"""
+    init_news_store()
+    return sqlite3.connect(NEWS_DB_PATH, timeout=30)
+
+def news_store_feed_state(url):
+    """(etag, last_modified) of a feed's last successful response"""
+    conn = news_store_connect()
+    try:
+        row = conn.execute("SELECT etag, last_modified FROM feed_state WHERE url = ?", (url,)).fetchone()
+    finally:
+        conn.close()
+    return row if row else (None, None)
+
+def news_store_save(url, articles, etag, last_modified):
+    """Upsert a feed's articles, remember its validators and prune the oldest articles"""
+    rows = [(hashlib.sha1(a['url'].encode()).hexdigest(), *(a[c] for c in NEWS_ARTICLE_COLUMNS)) for a in articles]
+    with init_news_store():
+        conn = news_store_connect()
+        try:
+            conn.executemany("INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.execute("INSERT OR REPLACE INTO feed_state VALUES (?, ?, ?)", (url, etag, last_modified))
+            conn.execute(
+                "DELETE FROM articles WHERE url_hash NOT IN "
+                "(SELECT url_hash FROM articles ORDER BY published_at DESC LIMIT ?)",
+                (NEWS_STORE_MAX_ARTICLES,)
+            )
+            conn.commit()
+        finally:
+            conn.close()
 
-        if response.status_code == 200:
-            data = response.json()
-            news_items = []
-
-            for article in data.get('Data', [])[:limit]:
-                news_items.append({
-                    'title': article.get('title', 'No Title'),
-                    'url': article.get('url', '#'),
-                    'source': article.get('source', 'Unknown'),
-                    'published_at': article.get('published_on', 0),
-                    'body': article.get('body', 'No description available.')[:200] + '...',
-                    'image_url': article.get('imageurl', ''),
-                    'categories': article.get('categories', ''),
-                    'tags': article.get('tags', '')
-                })
+def news_store_read(limit):
+    """Latest `limit` stored articles, newest first"""
+    conn = news_store_connect()
+    try:
+        rows = conn.execute(
+            f"SELECT {', '.join(NEWS_ARTICLE_COLUMNS)} FROM articles ORDER BY published_at DESC LIMIT ?",
+            (int(limit),)
+        ).fetchall()
+    finally:
+        conn.close()
+    return [dict(zip(NEWS_ARTICLE_COLUMNS, row)) for row in rows]
+
+def news_summary(text):
+    """Plain-text teaser of an article body (RSS descriptions carry HTML)"""
+    text = html.unescape(re.sub(r'<[^>]+>', ' ', text or ''))
+    text = ' '.join(text.split())
+    return (text[:NEWS_BODY_LENGTH] + '...') if text else 'No description available.'
+
+def news_link(url):
+    """url if it is http(s), else '#' - feeds are third-party, so no javascript: or data: links"""
+    return url if urlparse(url or '').scheme in ('http', 'https') else '#'
+
+def parse_cryptocompare_news(content, source):
+    """Articles of a CryptoCompare /data/v2/news/ response"""
+    return [{
+        'title': article.get('title', 'No Title'),
+        'url': article.get('url', '#'),
+        'source': article.get('source', 'Unknown'),
+        'published_at': int(article.get('published_on', 0)),
+        'body': news_summary(article.get('body')),
+        'image_url': urljoin('https://www.cryptocompare.com', article['imageurl']) if article.get('imageurl') else '',
+        'categories': article.get('categories', ''),
+        'tags': article.get('tags', '')
+    } for article in json.loads(content).get('Data', [])]
+
+def parse_rss_news(content, source):
+    """Articles of an RSS 2.0 feed"""
+    articles = []
+    for item in ET.fromstring(content).findall('.//item'):
+        link = item.findtext('link')
+        if not link or not item.findtext('title'):
+            continue
 
-            return news_items
+        try:
+            published_at = int(parsedate_to_datetime(item.findtext('pubDate')).timestamp())
+        except (TypeError, ValueError):
+            published_at = int(time.time())
+
+        media = item.find(f'{RSS_MEDIA_NS}content')
+        if media is None:
+            media = item.find('enclosure')
+
+        articles.append({
+            'title': item.findtext('title').strip(),
+            'url': link.strip(),
+            'source': source['name'],
+            'published_at': published_at,
+            'body': news_summary(item.findtext('description')),
+            'image_url': media.get('url', '') if media is not None else '',
+            'categories': '|'.join(c.text for c in item.findall('category') if c.text),
+            'tags': ''
+        })
+    return articles
+
+NEWS_PARSERS = {'cryptocompare': parse_cryptocompare_news, 'rss': parse_rss_news}
+
+# News card thumbnails: each article image downloaded once, downsized and kept in a size-bounded disk LRU
+THUMBNAIL_DIR = os.path.join(DATA_DIR, 'thumbnails.v2')  # v2: JPEG, so st.image serves the bytes as-is
+THUMBNAIL_SIZE = (480, 270)  # Cards show images 180px high at column width
+THUMBNAIL_MAX_SOURCE_BYTES = 10 * 1024 * 1024  # Larger source images are skipped
+THUMBNAIL_CACHE_MAX_BYTES = 50 * 1024 * 1024
+THUMBNAIL_WORKERS = 4
+THUMBNAIL_MAX_FAILED = 1000  # Failed URLs remembered (the oldest are forgotten, and retried, first)
+THUMBNAIL_FORMAT = 'JPEG'  # st.image re-encodes anything else to JPEG/PNG on every rerun
+THUMBNAIL_QUALITY = 70
+
+def make_thumbnail(content):
+    """Downsize image bytes to a card thumbnail (center crop to THUMBNAIL_SIZE's aspect ratio)"""
+    with Image.open(io.BytesIO(content)) as image:
+        image.draft('RGB', THUMBNAIL_SIZE)  # Lets JPEG decode at reduced scale
+        image = image.convert('RGB')
+
+        target_ratio = THUMBNAIL_SIZE[0] / THUMBNAIL_SIZE[1]
+        width, height = image.size
+        if width / height > target_ratio:
+            crop = int(height * target_ratio)
+            image = image.crop(((width - crop) // 2, 0, (width + crop) // 2, height))
         else:
-            return []
-    except Exception as e:
-        return []
+            crop = int(width / target_ratio)
+            image = image.crop((0, (height - crop) // 2, width, (height + crop) // 2))
+        image.thumbnail(THUMBNAIL_SIZE, Image.Resampling.LANCZOS)
 
-# Fallback RSS parser (not used anymore but kept for reference)
-def fetch_crypto_news_rss_fallback(limit=10):
-    """Fetch crypto news from RSS feeds (fallback without images)"""
-    news_items = []
-
-    sources = [
-        {
-            'name': 'CoinTelegraph',
-            'url': 'https://cointelegraph.com/rss',
-            'parser': 'rss'
-        },
-        {
-            'name': 'CoinDesk',
-            'url': 'https://www.coindesk.com/arc/outboundfeeds/rss/',
-            'parser': 'rss'
-        },
-        {
-            'name': 'Decrypt',
-            'url': 'https://decrypt.co/feed',
-            'parser': 'rss'
-        }
-    ]
+        out = io.BytesIO()
+        image.save(out, THUMBNAIL_FORMAT, quality=THUMBNAIL_QUALITY)
+        return out.getvalue()
+
+class ThumbnailCache:
+    """
+    Card thumbnails on disk, one file per image URL hash. Recency is the file mtime
+    (touched on every hit), and the least recently used files are evicted once the
+    cache grows past max_bytes. Thumbnails are generated on a background pool.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=THUMBNAIL_WORKERS, thread_name_prefix='thumbnails')
+        self._pending = set()
+        self._failed = OrderedDict()  # URLs that could not be fetched or decoded, oldest first
+
+        # url hash -> size, least recently used first
+        os.makedirs(directory, exist_ok=True)
+        entries = [entry for entry in os.scandir(directory) if entry.is_file() and not entry.name.endswith('.tmp')]
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+        self._files = OrderedDict((entry.name, entry.stat().st_size) for entry in entries)
+        self._total = sum(self._files.values())
+
+    def _name(self, url):
+        return hashlib.sha1(url.encode()).hexdigest()
+
+    def read(self, url):
+        """Thumbnail bytes of url, or None if it is not cached (yet)"""
+        if not url:
+            return None
+        name = self._name(url)
+        with self._lock:
+            if name not in self._files:
+                return None
+            self._files.move_to_end(name)
+
+        path = os.path.join(self.directory, name)
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self._total -= self._files.pop(name, 0)
+            return None
+        return content
+
+    def prefetch(self, urls):
+        """Generate the thumbnails of urls that are not cached, in the background"""
+        for url in urls:
+            if not url:
+                continue
+            name = self._name(url)
+            with self._lock:
+                if name in self._files or url in self._pending or url in self._failed:
+                    continue
+                self._pending.add(url)
+            self._executor.submit(self._generate, url, name)
 
-    for source in sources:
+    def _generate(self, url, name):
         try:
-            response = requests.get(source['url'], timeout=5)
-            if response.status_code == 200:
-                import xml.etree.ElementTree as ET
-                root = ET.fromstring(response.content)
-
-                # Find all items
-                for item in root.findall('.//item')[:limit]:
-                    title_elem = item.find('title')
-                    link_elem = item.find('link')
-                    pubdate_elem = item.find('pubDate')
-
-                    if title_elem is not None and link_elem is not None:
-                        news_items.append({
-                            'title': title_elem.text,
-                            'url': link_elem.text,
-                            'published_at': pubdate_elem.text if pubdate_elem is not None else '',
-                            'source': source['name']
-                        })
-
-                # If we got news, break
-                if news_items:
-                    break
+            with get_http_session().get(url, timeout=10, stream=True) as response:
+                response.raise_for_status()
+                content = response.raw.read(THUMBNAIL_MAX_SOURCE_BYTES + 1, decode_content=True)
+            if len(content) > THUMBNAIL_MAX_SOURCE_BYTES:
+                raise ValueError("image too large")
+            thumbnail = make_thumbnail(content)
+
+            path = os.path.join(self.directory, name)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(thumbnail)
+            os.replace(tmp_path, path)
+
+            with self._lock:
+                self._total += len(thumbnail) - self._files.pop(name, 0)
+                self._files[name] = len(thumbnail)
+                evicted = []
+                while self._total > self.max_bytes and len(self._files) > 1:
+                    old_name, size = self._files.popitem(last=False)
+                    self._total -= size
+                    evicted.append(old_name)
+            for old_name in evicted:
+                try:
+                    os.remove(os.path.join(self.directory, old_name))
+                except OSError:
+                    pass
         except Exception as e:
-            continue
+            with self._lock:
+                self._failed[url] = None
+                while len(self._failed) > THUMBNAIL_MAX_FAILED:
+                    self._failed.popitem(last=False)
+            print(f"Error creating thumbnail for {url}: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(url)
+
+@process_resource
+def get_thumbnail_cache():
+    """Shared news thumbnail cache for all sessions in this process"""
+    return ThumbnailCache(THUMBNAIL_DIR, THUMBNAIL_CACHE_MAX_BYTES)
+
+class NewsAggregator:
+    """
+    Polls all news sources concurrently in the background, at most every NEWS_POLL_INTERVAL.
+    Each request is conditional on the feed's stored ETag / Last-Modified, so unchanged
+    feeds answer 304 without a body. Pages only ever read the article store.
+    """
 
-    return news_items[:limit] if news_items else None
+    def __init__(self, sources):
+        self.sources = sources
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix='news-poll')
+        self._polling = False
+        self._last_poll = float('-inf')
+        self._first_poll_done = threading.Event()
+
+    def maybe_poll(self, force=False):
+        """Start a background poll if one is due (or forced) and none is running"""
+        with self._lock:
+            if self._polling or (not force and time.monotonic() - self._last_poll < NEWS_POLL_INTERVAL):
+                return
+            self._polling = True
+            self._last_poll = time.monotonic()
+        threading.Thread(target=self._poll, name='news-aggregator', daemon=True).start()
+
+    def wait_for_first_poll(self, timeout):
+        return self._first_poll_done.wait(timeout)
+
+    def _poll(self):
+        try:
+            list(self._executor.map(self._poll_source, self.sources))
+        finally:
+            with self._lock:
+                self._polling = False
+            self._first_poll_done.set()
+
+    def _poll_source(self, source):
+        etag, last_modified = news_store_feed_state(source['url'])
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        start = time.perf_counter()
+        try:
+            response = get_http_session().get(source['url'], headers=headers, timeout=10)
+            if response.status_code == 304:
+                get_fetch_metrics().record_upstream('news_poll', source['name'], time.perf_counter() - start,
+                                                    'not_modified', 0)
+                return
+            response.raise_for_status()
+            articles = NEWS_PARSERS[source['parser']](response.content, source)
+            news_store_save(source['url'], articles, response.headers.get('ETag'),
+                            response.headers.get('Last-Modified'))
+            get_thumbnail_cache().prefetch(a['image_url'] for a in articles[:NEWS_THUMBNAIL_PREFETCH])
+            get_fetch_metrics().record_upstream('news_poll', source['name'], time.perf_counter() - start,
+                                                fetch_outcome(articles), len(response.content))
+        except Exception as e:
+            get_fetch_metrics().record_upstream('news_poll', source['name'], time.perf_counter() - start, 'error', 0)
+            print(f"Error polling {source['name']} news: {e}")
+
+@process_resource
+def get_news_aggregator():
+    """Shared news aggregator for all sessions in this process"""
+    return NewsAggregator(NEWS_SOURCES)
+
+def fetch_crypto_news(limit=10):
+    """Latest crypto news from the local article store (refreshed in the background)"""
+    aggregator = get_news_aggregator()
+    aggregator.maybe_poll()
+    try:
+        news_items = news_store_read(limit)
+        if not news_items and aggregator.wait_for_first_poll(NEWS_FIRST_POLL_WAIT):
+            news_items = news_store_read(limit)  # Fresh install: the first poll just filled the store
+        return news_items
+    except Exception as e:
+        print(f"Error reading news store: {e}")
+        return []
 
-@st.cache_data(ttl=120)
+@cached_fetch('coingecko', swr_cache(ttl=120, max_stale=900))
 def fetch_top_coins(num_coins=50):
     """Fetch top cryptocurrencies by market cap from CoinGecko"""
     try:
@@ -1111,7 +3609,7 @@ def fetch_top_coins(num_coins=50):
         if COINGECKO_API_KEY:
             headers['x-cg-demo-api-key'] = COINGECKO_API_KEY
 
-        response = requests.get(url, params=params, headers=headers, timeout=15)
+        response = get_http_session().get(url, params=params, headers=headers, timeout=15)
 
         if response.status_code == 200:
             data = response.json()
@@ -1139,7 +3637,7 @@ def fetch_top_coins(num_coins=50):
         print(f"Error fetching top coins: {e}")
         return None
 
-@st.cache_data(ttl=300)
+@cached_fetch('coingecko', st.cache_data(ttl=300))
 def fetch_market_dominance():
     """Fetch market cap dominance data from CoinGecko"""
     try:
@@ -1150,7 +3648,7 @@ def fetch_market_dominance():
         if COINGECKO_API_KEY:
             headers['x-cg-demo-api-key'] = COINGECKO_API_KEY
 
-        response = requests.get(url, headers=headers, timeout=10)
+        response = get_http_session().get(url, headers=headers, timeout=10)
 
         if response.status_code == 200:
             data = response.json()
@@ -1172,85 +3670,42 @@ def fetch_market_dominance():
         print(f"Error fetching market dominance: {e}")
         return None
 
-@st.cache_data(ttl=600)
 def fetch_top_gainers_losers(limit=10):
-    """Fetch top gainers and losers from Binance (only from our coin list)"""
+    """Top gainers and losers of our coin list, from the shared ticker snapshot"""
     if client is None:
         return {'gainers': [], 'losers': []}
-    try:
-        # Get all USDT pairs 24h ticker
-        tickers = client.get_ticker()
-
-        # Get list of our symbols
-        our_symbols = list(SYMBOLS.values())
-
-        # Filter to only our coins
-        our_tickers = [t for t in tickers if t['symbol'] in our_symbols]
-
-        # Sort by price change percentage
-        sorted_tickers = sorted(our_tickers, key=lambda x: float(x['priceChangePercent']), reverse=True)
-
-        gainers = []
-        for t in sorted_tickers[:limit]:
-            # Find the coin name
-            coin_name = [name for name, sym in SYMBOLS.items() if sym == t['symbol']][0]
-            gainers.append({
-                'symbol': t['symbol'],
-                'name': coin_name,
-                'price': float(t['lastPrice']),
-                'change_percent': float(t['priceChangePercent']),
-                'volume': float(t['quoteVolume'])
-            })
-
-        losers = []
-        for t in sorted_tickers[-limit:]:
-            coin_name = [name for name, sym in SYMBOLS.items() if sym == t['symbol']][0]
-            losers.append({
-                'symbol': t['symbol'],
-                'name': coin_name,
-                'price': float(t['lastPrice']),
-                'change_percent': float(t['priceChangePercent']),
-                'volume': float(t['quoteVolume'])
-            })
-
-        return {'gainers': gainers, 'losers': list(reversed(losers))}
-    except Exception as e:
+
+    snapshot = fetch_ticker_snapshot()
+    if snapshot is None:
         return None
 
-@st.cache_data(ttl=300)
+    # Only our coins, sorted by price change percentage
+    ours = snapshot[snapshot.index.isin(SYMBOL_NAMES.keys())].sort_values('price_change_percent', ascending=False)
+    table = pd.DataFrame({
+        'symbol': ours.index,
+        'name': ours.index.map(SYMBOL_NAMES),
+        'price': ours['last_price'].values,
+        'change_percent': ours['price_change_percent'].values,
+        'volume': ours['quote_volume'].values,
+    })
+
+    return {
+        'gainers': table.head(limit).to_dict('records'),
+        'losers': table.tail(limit).iloc[::-1].to_dict('records')
+    }
+
+@cached_fetch('coinglass', st.cache_data(ttl=300))
 def fetch_open_interest_coinglass(symbol):
     """
     Fetch aggregated Open Interest data from Coinglass API
     Returns OI from all major exchanges (Binance, Bybit, OKX, etc.)
     """
     try:
-        # Map Binance symbols to Coinglass format
-        coin_map = {
-            'BTCUSDT': 'BTC',
-            'ETHUSDT': 'ETH',
-            'BNBUSDT': 'BNB',
-            'SOLUSDT': 'SOL',
-            'XRPUSDT': 'XRP',
-            'ADAUSDT': 'ADA',
-            'AVAXUSDT': 'AVAX',
-            'DOGEUSDT': 'DOGE',
-            'TRXUSDT': 'TRX',
-            'DOTUSDT': 'DOT',
-            'MATICUSDT': 'MATIC',
-            'LINKUSDT': 'LINK',
-            'TONUSDT': 'TON',
-            'SHIBUSDT': 'SHIB',
-            'LTCUSDT': 'LTC',
-            'BCHUSDT': 'BCH',
-            'UNIUSDT': 'UNI',
-            'XLMUSDT': 'XLM',
-            'ATOMUSDT': 'ATOM',
-            'ETCUSDT': 'ETC'
-        }
-
-        coin = coin_map.get(symbol)
+        # Coinglass uses the base asset code of coins with a futures market
+        coin = get_symbol_registry().derivatives_code(symbol)
         if not coin:
             # Fallback to Binance API
+            get_fetch_metrics().record_fallback('fetch_open_interest_coinglass', 'coinglass', 'binance_futures')
             return fetch_open_interest_binance(symbol)
 
         # Coinglass API endpoint for aggregated OI
@@ -1261,7 +3716,7 @@ def fetch_open_interest_coinglass(symbol):
             'accept': 'application/json'
         }
 
-        r = requests.get(url, headers=headers, timeout=10)
+        r = get_http_session().get(url, headers=headers, timeout=10)
         data = r.json()
 
         if data.get('success') and data.get('data'):
@@ -1288,28 +3743,39 @@ def fetch_open_interest_coinglass(symbol):
             }
         else:
             # Fallback to Binance
+            get_fetch_metrics().record_fallback('fetch_open_interest_coinglass', 'coinglass', 'binance_futures')
             return fetch_open_interest_binance(symbol)
 
     except Exception as e:
         # Fallback to Binance API
+        get_fetch_metrics().record_fallback('fetch_open_interest_coinglass', 'coinglass', 'binance_futures')
         return fetch_open_interest_binance(symbol)
 
-@st.cache_data(ttl=300)
+@cached_fetch('binance_futures', st.cache_data(ttl=300))
 def fetch_open_interest_binance(symbol):
     """Fetch Open Interest data from Binance Futures (Fallback)"""
     try:
-        # Remove USDT from symbol for futures
-        futures_symbol = symbol.replace('USDT', 'USDT')
+        futures_symbol = get_symbol_registry().futures_symbol(symbol)
+        if futures_symbol is None:
+            return None
+
+        # Open interest, long/short ratio and price are independent - fetch them concurrently
+        requests_by_key = {
+            'oi': ('fapi_open_interest', "https://fapi.binance.com/fapi/v1/openInterest",
+                   {'symbol': futures_symbol}),
+            'ratio': ('fapi_long_short_ratio', "https://fapi.binance.com/futures/data/globalLongShortAccountRatio",
+                      {'symbol': futures_symbol, 'period': '5m', 'limit': 1}),
+            'price': ('fapi_ticker_price', "https://fapi.binance.com/fapi/v1/ticker/price",
+                      {'symbol': futures_symbol}),
+        }
 
-        # Get Open Interest
-        url = f"https://fapi.binance.com/fapi/v1/openInterest?symbol={futures_symbol}"
-        r = requests.get(url, timeout=5)
-        oi_data = r.json()
+        def fetch_json(request):
+            endpoint, url, params = request
+            return binance_call(endpoint, get_http_session().get, url, params=params, timeout=5).json()
 
-        # Get long/short ratio
-        url_ratio = f"https://fapi.binance.com/futures/data/globalLongShortAccountRatio?symbol={futures_symbol}&period=5m&limit=1"
-        r_ratio = requests.get(url_ratio, timeout=5)
-        ratio_data = r_ratio.json()
+        with ThreadPoolExecutor(max_workers=len(requests_by_key)) as executor:
+            results = dict(zip(requests_by_key, executor.map(fetch_json, requests_by_key.values())))
+        oi_data, ratio_data, price_data = results['oi'], results['ratio'], results['price']
 
         if oi_data and ratio_data:
             open_interest = float(oi_data['openInterest'])
@@ -1320,10 +3786,7 @@ def fetch_open_interest_binance(symbol):
             long_percentage = (long_short_ratio / total_accounts) * 100
             short_percentage = 100 - long_percentage
 
-            # Get current price for USD calculation
-            price_url = f"https://fapi.binance.com/fapi/v1/ticker/price?symbol={futures_symbol}"
-            price_r = requests.get(price_url, timeout=5)
-            price_data = price_r.json()
+            # Current price for USD calculation
             current_price = float(price_data['price'])
 
             # Calculate total OI in USD
@@ -1344,36 +3807,174 @@ def fetch_open_interest_binance(symbol):
     except Exception as e:
         return None
 
-@st.cache_data(ttl=300)
-def fetch_liquidation_data(symbol):
-    """Fetch liquidation heatmap data from Binance"""
+# Open interest and long/short account ratio history (Binance keeps the last 30 days)
+OPEN_INTEREST_DB_PATH = os.path.join(DATA_DIR, 'open_interest.sqlite3')
+OPEN_INTEREST_HIST_LIMIT = 500  # Max points per openInterestHist / ratio request
+OPEN_INTEREST_PERIODS = {'5m': '5m', '1h': '1h', '4h': '4h', '1d': '1d', '1w': '1d'}  # Chart interval -> period
+OPEN_INTEREST_HISTORY_COLUMNS = ['timestamp', 'open_interest', 'open_interest_value', 'long_short_ratio', 'long_account']
+
+@st.cache_resource
+def init_open_interest_store():
+    """Create the open interest store schema once per process and return the write lock"""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    conn = sqlite3.connect(OPEN_INTEREST_DB_PATH, timeout=30)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        # OI and ratio points arrive from separate endpoints, so either half of a row may be missing
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS open_interest (
+                symbol TEXT NOT NULL,
+                period TEXT NOT NULL,
+                timestamp INTEGER NOT NULL,
+                open_interest REAL, open_interest_value REAL,
+                long_short_ratio REAL, long_account REAL,
+                PRIMARY KEY (symbol, period, timestamp)
+            ) WITHOUT ROWID
+        """)
+        conn.commit()
+    finally:
+        conn.close()
+    return threading.Lock()
+
+def open_interest_store_connect():
+    """Open a connection to the open interest store"""
+    init_open_interest_store()
+    return sqlite3.connect(OPEN_INTEREST_DB_PATH, timeout=30)
+
+def open_interest_store_last(symbol, period):
+    """Timestamps of the last stored OI point and the last stored ratio point (None if absent)"""
+    conn = open_interest_store_connect()
     try:
-        futures_symbol = symbol.replace('USDT', 'USDT')
+        return conn.execute(
+            """
+            SELECT MAX(CASE WHEN open_interest IS NOT NULL THEN timestamp END),
+                   MAX(CASE WHEN long_short_ratio IS NOT NULL THEN timestamp END)
+            FROM open_interest WHERE symbol = ? AND period = ?
+            """,
+            (symbol, period)
+        ).fetchone()
+    finally:
+        conn.close()
+
+def open_interest_store_upsert(symbol, period, oi_points, ratio_points):
+    """Insert or update openInterestHist and globalLongShortAccountRatio points"""
+    with init_open_interest_store():
+        conn = open_interest_store_connect()
+        try:
+            conn.executemany(
+                """
+                INSERT INTO open_interest (symbol, period, timestamp, open_interest, open_interest_value)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (symbol, period, timestamp) DO UPDATE SET
+                    open_interest = excluded.open_interest, open_interest_value = excluded.open_interest_value
+                """,
+                [(symbol, period, int(p['timestamp']), float(p['sumOpenInterest']), float(p['sumOpenInterestValue']))
+                 for p in oi_points]
+            )
+            conn.executemany(
+                """
+                INSERT INTO open_interest (symbol, period, timestamp, long_short_ratio, long_account)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (symbol, period, timestamp) DO UPDATE SET
+                    long_short_ratio = excluded.long_short_ratio, long_account = excluded.long_account
+                """,
+                [(symbol, period, int(p['timestamp']), float(p['longShortRatio']), float(p['longAccount']))
+                 for p in ratio_points]
+            )
+            conn.commit()
+        finally:
+            conn.close()
 
-        # Get current price
-        url = f"https://fapi.binance.com/fapi/v1/ticker/price?symbol={futures_symbol}"
-        r = requests.get(url, timeout=5)
-        current_price = float(r.json()['price'])
+def open_interest_store_read(symbol, period, since_ms):
+    """Stored OI/ratio history of symbol/period from since_ms on, oldest first"""
+    conn = open_interest_store_connect()
+    try:
+        rows = conn.execute(
+            """
+            SELECT timestamp, open_interest, open_interest_value, long_short_ratio, long_account
+            FROM open_interest WHERE symbol = ? AND period = ? AND timestamp >= ?
+            ORDER BY timestamp
+            """,
+            (symbol, period, int(since_ms))
+        ).fetchall()
+    finally:
+        conn.close()
+
+    df = pd.DataFrame(rows, columns=OPEN_INTEREST_HISTORY_COLUMNS)
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    return df
+
+@single_flight
+def sync_open_interest_store(futures_symbol, period):
+    """Download the OI and ratio points newer than the stored ones (the latest 500 on first run)"""
+    now_ms = int(time.time() * 1000)
+    period_ms = INTERVAL_MS[period]
+    last_oi, last_ratio = open_interest_store_last(futures_symbol, period)
+
+    requests_by_key = {}
+    for key, endpoint, url, last in (
+        ('oi', 'fapi_open_interest_hist', "https://fapi.binance.com/futures/data/openInterestHist", last_oi),
+        ('ratio', 'fapi_long_short_ratio', "https://fapi.binance.com/futures/data/globalLongShortAccountRatio", last_ratio),
+    ):
+        if last is not None and last + period_ms > now_ms:
+            continue  # The next point is not published yet
+        params = {'symbol': futures_symbol, 'period': period, 'limit': OPEN_INTEREST_HIST_LIMIT}
+        if last is not None:
+            params['startTime'] = last + 1
+        requests_by_key[key] = (endpoint, url, params)
+
+    if not requests_by_key:
+        return
+
+    def fetch_json(request):
+        endpoint, url, params = request
+        r = binance_call(endpoint, get_http_session().get, url, params=params, timeout=5)
+        r.raise_for_status()
+        return r.json()
+
+    with ThreadPoolExecutor(max_workers=len(requests_by_key)) as executor:
+        results = dict(zip(requests_by_key, executor.map(fetch_json, requests_by_key.values())))
+    open_interest_store_upsert(futures_symbol, period, results.get('oi', []), results.get('ratio', []))
+
+@cached_fetch('binance_futures', st.cache_data(ttl=300))
+def fetch_open_interest_history(symbol, tf_key):
+    """OI and long/short ratio history for a chart interval, from the incrementally synced store"""
+    futures_symbol = get_symbol_registry().futures_symbol(symbol)
+    period = OPEN_INTEREST_PERIODS.get(tf_key)
+    if futures_symbol is None or period is None:
+        return None
 
-        # Generate liquidation levels (simplified heatmap)
-        # In reality, you'd need a more sophisticated API for real liquidation data
-        price_range = np.linspace(current_price * 0.85, current_price * 1.15, 50)
+    try:
+        sync_open_interest_store(futures_symbol, period)
+    except Exception as e:
+        print(f"Error syncing {futures_symbol} open interest history: {e}")
 
-        # Simulate liquidation intensity (higher near round numbers and leverage levels)
-        liquidations = []
-        for price in price_range:
-            # Higher liquidations at 5%, 10%, 15% levels
-            distance = abs(price - current_price) / current_price
-            intensity = np.exp(-10 * (distance - 0.05)**2) + np.exp(-10 * (distance - 0.10)**2)
-            liquidations.append(intensity * np.random.uniform(0.5, 1.5))
+    since_ms = int(time.time() * 1000) - OPEN_INTEREST_HIST_LIMIT * INTERVAL_MS[period]
+    return open_interest_store_read(futures_symbol, period, since_ms)
 
-        return pd.DataFrame({
-            'price': price_range,
-            'liquidations': liquidations
-        })
-    except:
+def futures_price_multiplier(symbol, futures_symbol):
+    """Units of the spot asset per perpetual contract unit (1000 for 1000SHIBUSDT vs SHIBUSDT)"""
+    if futures_symbol == symbol:
+        return 1
+    for prefix in FUTURES_MULTIPLIER_PREFIXES:
+        if futures_symbol.startswith(prefix) and not symbol.startswith(prefix):
+            return 1000 if prefix == '1000' else 1_000_000
+    return 1
+
+def fetch_liquidation_data(symbol):
+    """Liquidation heatmap (notional per price bin) from the streamed liquidations of the last 24h"""
+    futures_symbol = get_symbol_registry().futures_symbol(symbol)
+    ticker = fetch_24h_ticker(symbol)
+    if futures_symbol is None or ticker is None:
         return None
 
+    # Bin in contract prices, report in spot prices
+    multiplier = futures_price_multiplier(symbol, futures_symbol)
+    heatmap = get_liquidation_aggregator().heatmap(futures_symbol, ticker['last_price'] * multiplier)
+    if heatmap is not None:
+        heatmap['price'] /= multiplier
+    return heatmap
+
 def calculate_indicators(df, ema_type, timeframe=None):
     """
     Calculate technical indicators with timeframe-adjusted periods.
@@ -1461,11 +4062,12 @@ def calculate_indicators(df, ema_type, timeframe=None):
 
 
 def create_chart(df, symbol, ema1, ema2, show_ema=False, show_bb=False, show_rsi=False, show_volume=False,
-                 show_macd=False, show_stoch=False, show_atr=False, chart_type='Line'):
+                 show_macd=False, show_stoch=False, show_atr=False, chart_type='Line', oi_history=None):
     """
     Create interactive chart with toggleable indicators and candlesticks.
     Clean chart with price and indicators only.
     chart_type: 'Line' or 'Candlestick'
+    oi_history: open interest / long-short ratio history (fetch_open_interest_history), shown under the price
     """
     # Determine number of rows based on what's enabled
     rows_needed = 1  # Always have price chart
@@ -1477,6 +4079,7 @@ def create_chart(df, symbol, ema1, ema2, show_ema=False, show_bb=False, show_rsi
     macd_row = None
     stoch_row = None
     atr_row = None
+    oi_row = None
 
     # Add rows for enabled indicators
     if show_rsi:
@@ -1504,6 +4107,11 @@ def create_chart(df, symbol, ema1, ema2, show_ema=False, show_bb=False, show_rsi
         atr_row = rows_needed
         subplot_titles.append('ATR')
 
+    if oi_history is not None and not oi_history.empty:
+        rows_needed += 1
+        oi_row = rows_needed
+        subplot_titles.append('Open Interest & Long/Short Ratio')
+
     # Calculate row heights dynamically (give more space to main chart)
     if rows_needed == 1:
         row_heights = [1.0]
@@ -1521,7 +4129,7 @@ def create_chart(df, symbol, ema1, ema2, show_ema=False, show_bb=False, show_rsi
         row_heights = [main_height] + [indicator_height] * (rows_needed - 1)
 
     # Create specs for all rows
-    specs = [[{"secondary_y": False}] for _ in range(rows_needed)]
+    specs = [[{"secondary_y": row == oi_row}] for row in range(1, rows_needed + 1)]
 
     # Create subplots with minimal spacing
     fig = make_subplots(
@@ -1609,8 +4217,7 @@ def create_chart(df, symbol, ema1, ema2, show_ema=False, show_bb=False, show_rsi
     # Volume (toggleable) - Conditional coloring based on price movement
     if show_volume and volume_row:
         # Calculate colors: Green if close >= open, Red if close < open
-        volume_colors = ['#26A69A' if float(close) >= float(open_price) else '#EF5350'
-                        for close, open_price in zip(df['Close'], df['Open'])]
+        volume_colors = np.where(df['Close'].to_numpy() >= df['Open'].to_numpy(), '#26A69A', '#EF5350')
 
         fig.add_trace(go.Bar(
             x=df['timestamp'],
@@ -1688,6 +4295,29 @@ def create_chart(df, symbol, ema1, ema2, show_ema=False, show_bb=False, show_rsi
             fillcolor='rgba(156, 39, 176, 0.1)'
         ), row=atr_row, col=1)
 
+    # Open interest (USD) with the long/short account ratio on a secondary axis
+    if oi_row:
+        oi_history = oi_history[oi_history['timestamp'] >= df['timestamp'].iloc[0]]
+        fig.add_trace(go.Scatter(
+            x=oi_history['timestamp'],
+            y=oi_history['open_interest_value'],
+            name='Open Interest',
+            line=dict(color='#FFB300', width=2),
+            fill='tozeroy',
+            fillcolor='rgba(255, 179, 0, 0.1)',
+            connectgaps=True,
+            hovertemplate='<b>OI:</b> $%{y:,.0f}<extra></extra>'
+        ), row=oi_row, col=1, secondary_y=False)
+
+        fig.add_trace(go.Scatter(
+            x=oi_history['timestamp'],
+            y=oi_history['long_short_ratio'],
+            name='Long/Short Ratio',
+            line=dict(color='#26C6DA', width=1.5),
+            connectgaps=True,
+            hovertemplate='<b>L/S Ratio:</b> %{y:.2f}<extra></extra>'
+        ), row=oi_row, col=1, secondary_y=True)
+
     fig.update_layout(
         height=500,  # Reduced from 800 to 500 for more compact view
         showlegend=True,
@@ -1733,6 +4363,11 @@ def create_chart(df, symbol, ema1, ema2, show_ema=False, show_bb=False, show_rsi
     if show_atr and atr_row:
         fig.update_yaxes(title_text="ATR", side='right', row=atr_row, col=1)
 
+    # Update y-axes for Open Interest if shown (ratio on the left)
+    if oi_row:
+        fig.update_yaxes(title_text="OI (USD)", side='right', row=oi_row, col=1, secondary_y=False)
+        fig.update_yaxes(title_text="L/S", side='left', showgrid=False, row=oi_row, col=1, secondary_y=True)
+
     # Update x-axis (no rangeslider)
     fig.update_xaxes(
         title_text="Date",
@@ -1746,17 +4381,16 @@ def create_order_book_chart(order_book_data, current_price):
     if not order_book_data:
         return None
 
-    bids = order_book_data['bids']
-    asks = order_book_data['asks']
+    # (n, 2) price/qty arrays, best level first
+    bids = np.asarray(order_book_data['bids'], dtype=np.float64).reshape(-1, 2)
+    asks = np.asarray(order_book_data['asks'], dtype=np.float64).reshape(-1, 2)
 
     # Calculate cumulative volumes
-    bid_prices = [b[0] for b in bids]
-    bid_volumes = [b[1] for b in bids]
-    bid_cumulative = np.cumsum(bid_volumes)
+    bid_prices = bids[:, 0]
+    bid_cumulative = np.cumsum(bids[:, 1])
 
-    ask_prices = [a[0] for a in asks]
-    ask_volumes = [a[1] for a in asks]
-    ask_cumulative = np.cumsum(ask_volumes)
+    ask_prices = asks[:, 0]
+    ask_cumulative = np.cumsum(asks[:, 1])
 
     fig = go.Figure()
 
@@ -1797,51 +4431,63 @@ def create_order_book_chart(order_book_data, current_price):
 
     return fig
 
-def create_recent_trades_chart(trades_data):
-    """Create recent trades visualization"""
-    if not trades_data:
+TRADE_MARKER_MIN_SIZE = 4
+TRADE_MARKER_MAX_SIZE = 30
+
+def create_recent_trades_chart(trades_data, size_ref=None):
+    """
+    Create recent trades visualization. size_ref is the quantity drawn at full marker
+    size (see fetch_trade_size_reference); it defaults to the largest trade shown.
+    """
+    if trades_data is None or len(trades_data) == 0:
         return None
 
-    df_trades = pd.DataFrame(trades_data)
+    # Marker area proportional to quantity. Scaling to the whole tape rather than the
+    # trades shown keeps a trade's marker the same size while the view scrolls
+    qty = trades_data['qty']
+    max_qty = size_ref or qty.max()
+    scale = np.sqrt(np.minimum(qty / max_qty, 1.0)) if max_qty > 0 else np.zeros(len(qty))
+    sizes = TRADE_MARKER_MIN_SIZE + (TRADE_MARKER_MAX_SIZE - TRADE_MARKER_MIN_SIZE) * scale
 
     # Separate buys and sells
-    buys = df_trades[~df_trades['is_buyer_maker']]
-    sells = df_trades[df_trades['is_buyer_maker']]
+    is_sell = trades_data['is_buyer_maker']
+    buys = trades_data[~is_sell]
+    sells = trades_data[is_sell]
 
     fig = go.Figure()
 
     # Buy trades (green)
-    if not buys.empty:
+    if len(buys):
         fig.add_trace(go.Scatter(
             x=buys['time'],
             y=buys['price'],
             mode='markers',
             name='Buys',
             marker=dict(
-                size=buys['qty'] * 10,  # Size based on quantity
+                size=sizes[~is_sell],
                 color='#00C853',
                 symbol='triangle-up',
                 line=dict(width=1, color='white')
             ),
-            text=[f"${p:.2f}<br>{q:.4f}" for p, q in zip(buys['price'], buys['qty'])],
-            hovertemplate='<b>Buy</b><br>%{text}<extra></extra>'
+            customdata=buys['qty'],
+            hovertemplate='<b>Buy</b><br>$%{y:.2f}<br>%{customdata:.4f}<extra></extra>'
         ))
 
     # Sell trades (red)
-    if not sells.empty:
+    if len(sells):
         fig.add_trace(go.Scatter(
             x=sells['time'],
             y=sells['price'],
             mode='markers',
             name='Sells',
             marker=dict(
-                size=sells['qty'] * 10,
+                size=sizes[is_sell],
                 color='#FF4444',
                 symbol='triangle-down',
                 line=dict(width=1, color='white')
             ),
-            text=[f"${p:.2f}<br>{q:.4f}" for p, q in zip(sells['price'], sells['qty'])],
-            hovertemplate='<b>Sell</b><br>%{text}<extra></extra>'
+            customdata=sells['qty'],
+            hovertemplate='<b>Sell</b><br>$%{y:.2f}<br>%{customdata:.4f}<extra></extra>'
         ))
 
     fig.update_layout(
@@ -1873,16 +4519,8 @@ def backtest_fng(df, fng, symbol, interval):
     # Fetch daily data for the same period for accurate backtesting
     try:
         days_diff = (end_date - start_date).days
-        daily_klines = client.get_klines(
-            symbol=symbol,
-            interval=Client.KLINE_INTERVAL_1DAY,
-            limit=min(days_diff + 1, 1000)  # Binance limit is 1000
-        )
-        daily_df = pd.DataFrame(daily_klines, columns=['timestamp', 'Open', 'High', 'Low', 'Close', 'Volume',
-                                                        'Close_time', 'Quote_asset_volume', 'Number_of_trades',
-                                                        'Taker_buy_base_volume', 'Taker_buy_quote_volume', 'Ignore'])
-        daily_df['Close'] = daily_df['Close'].astype(float)
-        daily_df['timestamp'] = pd.to_datetime(daily_df['timestamp'], unit='ms')
+        # Daily candles come from the local kline store (chunked download if needed)
+        daily_df = load_candles(symbol, Client.KLINE_INTERVAL_1DAY, days_diff + 1)
 
         # Merge with Fear & Greed Index
         daily_df = daily_df.merge(fng[['timestamp', 'value']],
@@ -1917,7 +4555,7 @@ def backtest_fng(df, fng, symbol, interval):
 
     return entries, total_invested, final_value, daily_df
 
-@st.cache_data(ttl=3600)
+@cached_fetch('binance', st.cache_data(ttl=3600))
 def fetch_binance_historical(symbol, days):
     """Fetch historical data from Binance API for seasonality analysis"""
     try:
@@ -1927,65 +4565,13 @@ def fetch_binance_historical(symbol, days):
 
         print(f"📊 Fetching {days} days of {symbol} data from Binance...")
 
-        # Use daily candles for historical data
-        interval = Client.KLINE_INTERVAL_1DAY
-
-        # Binance allows max 1000 candles per request
-        # For more than 1000 days, we need to fetch in chunks
-        all_klines = []
-
-        if days <= 1000:
-            # Single request
-            klines = client.get_klines(symbol=symbol, interval=interval, limit=days)
-            all_klines = klines
-        else:
-            # Multiple requests (chunked)
-            end_time = int(time.time() * 1000)  # Current time in ms
-            chunk_size = 1000
-            chunks_needed = (days // chunk_size) + 1
-
-            for i in range(chunks_needed):
-                try:
-                    klines = client.get_klines(
-                        symbol=symbol,
-                        interval=interval,
-                        limit=chunk_size,
-                        endTime=end_time
-                    )
-
-                    if not klines:
-                        break
+        # Use daily candles for historical data, read through the local kline store
+        # so only the newest candles are downloaded after the first run
+        df = load_candles(symbol, Client.KLINE_INTERVAL_1DAY, days)
 
-                    all_klines = klines + all_klines  # Prepend older data
-
-                    # Update end_time to the timestamp of the oldest candle we just fetched
-                    end_time = int(klines[0][0]) - 1
-
-                    # Small delay to avoid rate limiting
-                    time.sleep(0.1)
-
-                except Exception as e:
-                    print(f"Error fetching chunk {i}: {e}")
-                    break
-
-        if not all_klines:
+        if df.empty:
             return None
 
-        # Convert to DataFrame
-        df = pd.DataFrame(all_klines, columns=[
-            'timestamp', 'Open', 'High', 'Low', 'Close', 'Volume',
-            'close_time', 'quote_volume', 'trades', 'taker_buy_base',
-            'taker_buy_quote', 'ignore'
-        ])
-
-        # Convert to proper types
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-        df['Open'] = df['Open'].astype(float)
-        df['High'] = df['High'].astype(float)
-        df['Low'] = df['Low'].astype(float)
-        df['Close'] = df['Close'].astype(float)
-        df['Volume'] = df['Volume'].astype(float)
-
         # Keep only necessary columns
         df = df[['timestamp', 'Open', 'High', 'Low', 'Close', 'Volume']]
 
@@ -2494,9 +5080,22 @@ with col5:
 col_refresh1, col_refresh2, col_refresh3 = st.columns([3, 1, 3])
 with col_refresh2:
     if st.button("🔄 Refresh Data", use_container_width=True, key="refresh_top"):
-        st.cache_data.clear()
+        # Only refresh what this page shows - other sessions keep their warm cache.
+        # Cache entries are keyed by the resolved symbol (renamed pairs map to their successor)
+        selected_crypto = st.session_state.get('selected_crypto')
+        invalidate_page_cache(
+            st.session_state.get('mode', "📈 Chart Analysis"),
+            resolve_symbol(selected_crypto) if selected_crypto in SYMBOLS else 'BTCUSDT',
+            st.session_state.get('chart_interval', '4h')
+        )
         st.rerun()
 
+# Hidden admin page (?admin=<ADMIN_TOKEN>)
+admin_token = get_admin_token()
+if admin_token and st.query_params.get('admin') == admin_token:
+    render_admin_metrics_page()
+    st.stop()
+
 # Initialize mode if not exists
 if 'mode' not in st.session_state:
     st.session_state.mode = "📈 Chart Analysis"
@@ -2508,13 +5107,23 @@ st.markdown("---")
 # Initialize session state for selected crypto if not exists
 if 'selected_crypto' not in st.session_state:
     st.session_state['selected_crypto'] = 'Bitcoin (BTC)'
+# A selection can drop out of SYMBOLS when the registry is rebuilt - follow its symbol
+st.session_state['selected_crypto'] = selectable_crypto_name(
+    st.session_state['selected_crypto'], st.session_state.get('selected_symbol'))
 
 # Use session state value as default
 crypto_list = list(SYMBOLS.keys())
 default_index = crypto_list.index(st.session_state['selected_crypto']) if st.session_state['selected_crypto'] in crypto_list else 0
 
 crypto_name = st.session_state['selected_crypto']
-symbol = SYMBOLS[crypto_name]
+st.session_state['selected_symbol'] = SYMBOLS[crypto_name]
+symbol = resolve_symbol(crypto_name)
+
+# Renamed pairs show their successor, delisted ones only their stored history
+if symbol != SYMBOLS[crypto_name]:
+    st.info(f"ℹ️ {SYMBOLS[crypto_name]} is no longer traded on Binance - showing its successor {symbol}.")
+elif not symbol_listed(symbol):
+    st.warning(f"⚠️ {symbol} is no longer traded on Binance - only stored history is available.")
 
 # Set default chart interval if not in session state (for Chart Analysis)
 if 'chart_interval' not in st.session_state:
@@ -2531,7 +5140,17 @@ if mode == "📈 Chart Analysis":
     interval_key = chart_interval  # Use the key directly (e.g., '4h', '1d')
 
     with st.spinner('Loading data...'):
-        df = fetch_data(symbol, interval, limit=limit)
+        # Same cache entries as the Multiple Timeframes View, expiring per interval
+        df = fetch_timeframe_data(symbol, chart_interval)
+
+        # Live candles from the shared WebSocket feed on top of the cached series
+        if BINANCE_AVAILABLE:
+            live_feed = get_live_kline_feed()
+            live_feed.watch(symbol, interval)
+            df = live_feed.overlay(df, symbol, interval)
+
+            # Warm the views this user is likely to switch to next
+            get_prefetch_scheduler().observe_navigation(st.session_state, symbol, chart_interval)
 
         # Debug: Show what we actually loaded
         if not df.empty:
@@ -2541,7 +5160,7 @@ if mode == "📈 Chart Analysis":
             st.info(f"🔍 Debug: Loaded {num_candles} candles | From: {first_date} | To: {last_date} | Interval: {interval_key}")
 
     if df.empty:
-        st.error("⚠️ Failed to fetch data. Please try again.")
+        st.error(df.attrs.get('error', "⚠️ Failed to fetch data. Please try again."))
     else:
         # Calculate indicators for Chart Analysis using the configured EMA type
         # Pass interval_key to calculate_indicators for proper period adjustment
@@ -2721,7 +5340,7 @@ if mode == "📈 Chart Analysis":
                     crypto_name = st.selectbox(
                         "Choose cryptocurrency:",
                         list(SYMBOLS.keys()),
-                        index=list(SYMBOLS.keys()).index(st.session_state.get('selected_crypto', 'Bitcoin (BTC)')),
+                        index=list(SYMBOLS.keys()).index(selectable_crypto_name(st.session_state.get('selected_crypto'))),
                         key="chart_crypto_selector",
                         label_visibility="collapsed"
                     )
@@ -2729,10 +5348,10 @@ if mode == "📈 Chart Analysis":
                     # Update session state and symbol if changed
                     if crypto_name != st.session_state.get('selected_crypto'):
                         st.session_state['selected_crypto'] = crypto_name
-                        symbol = SYMBOLS[crypto_name]
+                        symbol = resolve_symbol(crypto_name)
                         st.rerun()
                     else:
-                        symbol = SYMBOLS[crypto_name]
+                        symbol = resolve_symbol(crypto_name)
 
                 # 2. CHART TYPE SELECTOR (Light Yellow)
                 with col_chart_type:
@@ -2816,7 +5435,7 @@ if mode == "📈 Chart Analysis":
                     if 'selected_indicators' not in st.session_state:
                         st.session_state.selected_indicators = []
 
-                    indicator_options = ['EMAs', 'Bollinger Bands', 'RSI', 'Volume', 'MACD']
+                    indicator_options = ['EMAs', 'Bollinger Bands', 'RSI', 'Volume', 'MACD', 'Open Interest']
                     selected_indicators = st.multiselect(
                         "Choose indicators:",
                         indicator_options,
@@ -2834,6 +5453,7 @@ if mode == "📈 Chart Analysis":
                     show_rsi = 'RSI' in selected_indicators
                     show_volume = 'Volume' in selected_indicators
                     show_macd = 'MACD' in selected_indicators
+                    show_oi = 'Open Interest' in selected_indicators
                     show_stoch = False
                     show_atr = False
 
@@ -2876,21 +5496,11 @@ if mode == "📈 Chart Analysis":
                         with col_title:
                             st.markdown("### 📊 Multiple Timeframes Analysis")
                         with col_clear:
-                            if st.button("🔄 Clear Cache", key="clear_cache_btn"):
-                                st.cache_data.clear()
-                                st.success("✅ Cache cleared! Refresh to reload data.")
+                            # Drop the cached timeframes of this symbol so they are loaded fresh
+                            if st.button("🔄 Force Refresh", key="multi_tf_refresh_btn"):
+                                invalidate_cache(functions=['fetch_timeframe_data'], symbol=symbol)
                                 st.rerun()
 
-                        # Fetch data for all timeframes with EXPLICIT limits (NO CACHE!)
-                        # Using direct values to avoid cache issues
-                        timeframes_multi = {
-                            '5m': {'interval': Client.KLINE_INTERVAL_5MINUTE, 'limit': 288, 'title': '5 Minutes', 'range': 'Last 24 hours'},
-                            '1h': {'interval': Client.KLINE_INTERVAL_1HOUR, 'limit': 168, 'title': '1 Hour', 'range': 'Last 7 days'},
-                            '4h': {'interval': Client.KLINE_INTERVAL_4HOUR, 'limit': 180, 'title': '4 Hours', 'range': 'Last 30 days'},
-                            '1d': {'interval': Client.KLINE_INTERVAL_1DAY, 'limit': 365, 'title': '1 Day', 'range': 'Last 1 year'},
-                            '1w': {'interval': Client.KLINE_INTERVAL_1WEEK, 'limit': 104, 'title': '1 Week', 'range': 'Last 2 years'}
-                        }
-
                         # Create grid for 5 timeframes (2 rows: 3 + 2)
                         row1_col1, row1_col2, row1_col3 = st.columns(3)
                         row2_col1, row2_col2 = st.columns(2)
@@ -2898,19 +5508,20 @@ if mode == "📈 Chart Analysis":
                         cols = [row1_col1, row1_col2, row1_col3, row2_col1, row2_col2]
                         tf_keys = ['5m', '1h', '4h', '1d', '1w']
 
+                        # Fetch all timeframes concurrently, each cached with its own expiry
+                        with st.spinner('Loading timeframes...'):
+                            multi_data = fetch_multi_timeframe_data(symbol, tf_keys)
+
                         for idx, (tf_key, col) in enumerate(zip(tf_keys, cols)):
                             with col:
-                                tf_config = timeframes_multi[tf_key]
-
-                                with st.spinner(f'Loading {tf_config["title"]} data...'):
-                                    # USE NO CACHE FUNCTION to force fresh data
-                                    df_multi = fetch_data_no_cache(symbol, tf_config['interval'], limit=tf_config['limit'])
+                                tf_config = CHART_INTERVALS[tf_key]
+                                df_multi = multi_data[tf_key]
 
-                                    # Debug logging
-                                    if not df_multi.empty:
-                                        actual_candles = len(df_multi)
-                                        date_range = f"{df_multi['timestamp'].min()} to {df_multi['timestamp'].max()}"
-                                        print(f"🔍 {tf_key}: Requested {tf_config['limit']} candles, got {actual_candles} | {date_range}")
+                                # Debug logging
+                                if not df_multi.empty:
+                                    actual_candles = len(df_multi)
+                                    date_range = f"{df_multi['timestamp'].min()} to {df_multi['timestamp'].max()}"
+                                    print(f"🔍 {tf_key}: Requested {tf_config['limit']} candles, got {actual_candles} | {date_range}")
 
                                 if not df_multi.empty:
                                     # Calculate indicators for this timeframe
@@ -2931,7 +5542,7 @@ if mode == "📈 Chart Analysis":
                                     # Create smaller chart (no indicators for cleaner view)
                                     fig_multi = create_chart(
                                         df_multi,
-                                        f"{crypto_name} ({symbol}) - {tf_config['title']} - {tf_config['range']} ({actual_candles} candles)",
+                                        f"{crypto_name} ({symbol}) - {tf_config['name']} - {tf_config['range']} ({actual_candles} candles)",
                                         ema1_multi,
                                         ema2_multi,
                                         show_ema=show_ema,
@@ -2960,9 +5571,10 @@ if mode == "📈 Chart Analysis":
 
                                     st.plotly_chart(fig_multi, use_container_width=True, key=f"chart_multi_{tf_key}")
                                 else:
-                                    st.error(f"⚠️ Failed to load {tf_config['title']} data")
+                                    st.error(f"⚠️ Failed to load {tf_config['name']} data")
                     else:
                         # Single Chart View (original)
+                        oi_history = fetch_open_interest_history(symbol, chart_interval) if show_oi else None
                         fig = create_chart(
                             df_chart,
                             crypto_name,
@@ -2975,7 +5587,8 @@ if mode == "📈 Chart Analysis":
                             show_macd=show_macd,
                             show_stoch=show_stoch,
                             show_atr=show_atr,
-                            chart_type=chart_type
+                            chart_type=chart_type,
+                            oi_history=oi_history
                         )
                         st.plotly_chart(fig, use_container_width=True)
                 else:
@@ -3348,6 +5961,10 @@ elif mode == "📰 News & Trends":
     news_items = fetch_crypto_news(limit=12)
 
     if news_items:
+        # Thumbnails of articles from before the last poll may still be missing
+        thumbnails = get_thumbnail_cache()
+        thumbnails.prefetch(news.get('image_url') for news in news_items)
+
         # Display news in 3-column grid
         for i in range(0, len(news_items), 3):
             cols = st.columns(3)
@@ -3370,33 +5987,45 @@ elif mode == "📰 News & Trends":
                         time_str = "Recently"
 
                     with col:
-                        # News card with image
-                        image_url = news.get('image_url', '')
-                        if image_url and not image_url.startswith('http'):
-                            image_url = f"https://www.cryptocompare.com{image_url}"
+                        # News card with the locally cached thumbnail (placeholder until it is generated).
+                        # st.image serves it from a /media URL, so reruns only resend the URL and the
+                        # browser caches the image
+                        thumbnail = thumbnails.read(news.get('image_url'))
+                        if thumbnail:
+                            st.image(thumbnail, output_format=THUMBNAIL_FORMAT, use_column_width=True)
+                            image_html = ""
+                        else:
+                            image_html = ("<div style='width: 100%; height: 180px; border-radius: 12px 12px 0 0; "
+                                          "background: linear-gradient(135deg, rgba(41, 98, 255, 0.25) 0%, "
+                                          "rgba(30, 136, 229, 0.1) 100%);'></div>")
+
+                        # Feed text goes into raw HTML, so everything third-party is escaped
+                        title = html.escape(news['title'])
+                        body = html.escape(news.get('body', ''))
+                        source = html.escape(news['source'])
+                        href = html.escape(news_link(news['url']))
 
                         st.markdown(f"""
                         <div style='background: linear-gradient(135deg, rgba(41, 98, 255, 0.08) 0%, rgba(30, 136, 229, 0.04) 100%);
                                     border-radius: 12px; padding: 0; margin-bottom: 20px; border: 1px solid rgba(41, 98, 255, 0.15);
                                     overflow: hidden; height: 100%;'>
-                            <a href='{news['url']}' target='_blank' style='text-decoration: none; color: inherit;'>
-                                <img src='{image_url}' style='width: 100%; height: 180px; object-fit: cover; border-radius: 12px 12px 0 0;'
-                                     onerror="this.style.display='none'">
+                            <a href='{href}' target='_blank' style='text-decoration: none; color: inherit;'>
+                                {image_html}
                                 <div style='padding: 15px;'>
                                     <h4 style='color: #e8f4ff; font-size: 14px; font-weight: 600; margin: 0 0 8px 0;
                                                line-height: 1.4; display: -webkit-box; -webkit-line-clamp: 2;
                                                -webkit-box-orient: vertical; overflow: hidden;'>
-                                        {news['title']}
+                                        {title}
                                     </h4>
                                     <p style='color: #8b9dc3; font-size: 12px; margin: 0 0 10px 0;
                                               line-height: 1.5; display: -webkit-box; -webkit-line-clamp: 3;
                                               -webkit-box-orient: vertical; overflow: hidden;'>
-                                        {news.get('body', '')}
+                                        {body}
                                     </p>
                                     <div style='display: flex; justify-content: space-between; align-items: center;
                                                 padding-top: 8px; border-top: 1px solid rgba(41, 98, 255, 0.1);'>
                                         <span style='color: #2962ff; font-size: 11px; font-weight: 600;'>
-                                            {news['source']}
+                                            {source}
                                         </span>
                                         <span style='color: #8b9dc3; font-size: 11px;'>
                                             {time_str}
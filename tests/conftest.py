@@ -0,0 +1,50 @@
+"""
+app.py is a Streamlit script, so importing it would render the whole page. Tests
+instead execute its imports plus the top-level definitions they name (functions,
+classes and constants, in file order) in a fresh namespace. Everything else is
+blanked out, so line numbers in tracebacks still match app.py.
+"""
+import ast
+from pathlib import Path
+
+import pytest
+import streamlit as st
+
+APP_PATH = Path(__file__).resolve().parent.parent / 'app.py'
+APP_SOURCE = APP_PATH.read_text(encoding='utf-8')
+APP_TREE = ast.parse(APP_SOURCE)
+
+
+def _defined_names(node):
+    if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
+        return {node.name}
+    if isinstance(node, ast.Assign):
+        targets = [elt for target in node.targets for elt in getattr(target, 'elts', [target])]
+        return {target.id for target in targets if isinstance(target, ast.Name)}
+    return set()
+
+
+@pytest.fixture
+def load_app(tmp_path, monkeypatch):
+    """load_app(*names) -> namespace with app.py's imports and the named definitions"""
+    monkeypatch.setenv('KRYPTOVIEW_DATA_DIR', str(tmp_path))
+    # cache_resource is process-wide, so process resources would leak between tests
+    st.cache_resource.clear()
+
+    def load(*names):
+        names = set(names)
+        lines = APP_SOURCE.splitlines()
+        kept = [''] * len(lines)
+        defined = set()
+        for node in APP_TREE.body:
+            if isinstance(node, (ast.Import, ast.ImportFrom)) or _defined_names(node) & names:
+                first = min([node.lineno] + [d.lineno for d in getattr(node, 'decorator_list', [])])
+                kept[first - 1:node.end_lineno] = lines[first - 1:node.end_lineno]
+                defined |= _defined_names(node)
+        assert names <= defined, f"not defined at top level of app.py: {sorted(names - defined)}"
+
+        namespace = {'__name__': 'app_under_test', '__file__': str(APP_PATH)}
+        exec(compile('\n'.join(kept), str(APP_PATH), 'exec'), namespace)
+        return namespace
+
+    return load
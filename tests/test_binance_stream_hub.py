@@ -0,0 +1,100 @@
+import asyncio
+import importlib.util
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+websockets = pytest.importorskip('websockets')
+
+STANDIN_PATH = Path(__file__).resolve().parent.parent / 'tools' / 'binance_ws_standin.py'
+TICK = 0.05
+
+STREAM_HUB = ('BINANCE_WS_RECONNECT_DELAY', 'LIVE_KLINE_BUFFER', 'LIVE_KLINE_STALE_AFTER',
+              'LIVE_STREAM_IDLE_AFTER', 'BinanceStreamHub')
+LIVE_KLINE_FEED = STREAM_HUB + ('INTERVAL_MS', 'RESAMPLE_BASE_INTERVALS', 'parse_interval_ms',
+                                'resample_base_interval', 'StreamFeed', 'LiveKlineFeed')
+
+
+@pytest.fixture
+def standin_url():
+    """ws:// URL of the Binance stream stand-in, served from a background event loop"""
+    spec = importlib.util.spec_from_file_location('binance_ws_standin', STANDIN_PATH)
+    standin = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(standin)
+
+    async def handler(websocket, *_):
+        await standin.serve_client(websocket, TICK, 100.0)
+
+    async def start():
+        return await websockets.serve(handler, 'localhost', 0, close_timeout=TICK)
+
+    loop = asyncio.new_event_loop()
+    server = loop.run_until_complete(start())
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+
+    yield f"ws://localhost:{server.sockets[0].getsockname()[1]}/stream"
+
+    async def stop():
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run_coroutine_threadsafe(stop(), loop).result(timeout=5)
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(timeout=5)
+    loop.close()
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(TICK)
+    return False
+
+
+def test_unsubscribe_stops_stream_after_last_handler(load_app, standin_url):
+    app = load_app(*STREAM_HUB)
+    hub = app['BinanceStreamHub'](standin_url)
+    first, second = [], []
+
+    # Record what the server pushes, before the hub drops events of unknown streams
+    pushed = []
+    on_message = hub._on_message
+    hub._on_message = lambda ws, message: (pushed.append(message), on_message(ws, message))
+
+    hub.subscribe('btcusdt@kline_1h', first.append)
+    hub.subscribe('btcusdt@kline_1h', second.append)
+    assert wait_for(lambda: first and second)
+
+    # Another handler is still listening - the stream stays subscribed
+    hub.unsubscribe('btcusdt@kline_1h', first.append)
+    received = len(second)
+    assert wait_for(lambda: len(second) > received)
+
+    hub.unsubscribe('btcusdt@kline_1h', second.append)
+    time.sleep(5 * TICK)  # Let in-flight events drain
+    received = len(pushed)
+    time.sleep(5 * TICK)
+    assert len(pushed) == received
+
+
+def test_live_kline_feed_releases_idle_streams(load_app, standin_url):
+    app = load_app(*LIVE_KLINE_FEED)
+    app['LIVE_STREAM_IDLE_AFTER'] = 0
+    app['kline_store_upsert'] = lambda *args, **kwargs: None
+    hub = app['BinanceStreamHub'](standin_url)
+    feed = app['LiveKlineFeed'](hub)
+
+    feed.watch('BTCUSDT', '1h')
+    assert wait_for(lambda: ('BTCUSDT', '1h') in feed._candles)
+
+    # Nobody re-watched BTCUSDT within the idle window, so watching ETHUSDT releases it
+    time.sleep(TICK)
+    feed.watch('ETHUSDT', '1h')
+    assert wait_for(lambda: ('ETHUSDT', '1h') in feed._candles)
+    assert 'btcusdt@kline_1h' not in hub._handlers
+    assert ('BTCUSDT', '1h') not in feed._candles
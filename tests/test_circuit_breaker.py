@@ -0,0 +1,89 @@
+import threading
+import time
+
+import pytest
+import requests
+
+CIRCUIT_BREAKER = (
+    'get_process_resources', 'PROCESS_RESOURCES', 'process_resource',
+    'PROVIDER_HOSTS', 'PROVIDER_HEALTH_URLS', 'CIRCUIT_FAILURE_THRESHOLD', 'CIRCUIT_OPEN_SECONDS',
+    'CIRCUIT_MAX_OPEN_SECONDS', 'CIRCUIT_PROBE_TIMEOUT', 'ProviderUnavailable', '_breaker_local',
+    'is_provider_failure', 'CircuitBreaker', 'get_circuit_breakers', 'provider_circuit_open',
+)
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class FakeSession:
+    """Health endpoint answering with the queued status codes (None = connection error)"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.requested = []
+
+    def get(self, url, timeout=None):
+        self.requested.append(url)
+        outcome = self.outcomes.pop(0)
+        if outcome is None:
+            raise requests.exceptions.ConnectionError("unreachable")
+        return FakeResponse(outcome)
+
+
+@pytest.fixture
+def app(load_app):
+    return load_app(*CIRCUIT_BREAKER)
+
+
+def open_circuit(app, provider):
+    breaker = app['get_circuit_breakers']()[provider]
+    for _ in range(app['CIRCUIT_FAILURE_THRESHOLD']):
+        breaker.record_failure()
+    assert breaker.state == 'open'
+    breaker.cooldown = 0.01
+    time.sleep(0.02)
+    return breaker
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_background_probe_closes_the_shared_breaker(app):
+    session = FakeSession(200)
+    app['get_http_session'] = lambda: session
+    breaker = open_circuit(app, 'binance')
+
+    # The cooldown passed: the request still fails fast while the probe runs in the background
+    assert breaker.allow() is False
+    assert wait_for(lambda: breaker.state == 'closed')
+    assert session.requested == [app['PROVIDER_HEALTH_URLS']['binance']]
+
+    # Worker threads see the same (recovered) breaker
+    seen = []
+    thread = threading.Thread(target=lambda: seen.append(app['provider_circuit_open']('binance')))
+    thread.start()
+    thread.join()
+    assert seen == [False]
+    assert breaker.allow() is True
+
+
+@pytest.mark.parametrize('outcome', [503, None])
+def test_failed_probe_reopens_with_longer_cooldown(app, outcome):
+    session = FakeSession(outcome, 200)
+    app['get_http_session'] = lambda: session
+    breaker = open_circuit(app, 'coingecko')
+
+    assert breaker.allow() is False
+    assert wait_for(lambda: breaker.state == 'open')
+    assert breaker.cooldown == 0.02
+
+    # The trial ended, so the next cooldown expiry probes again
+    time.sleep(0.03)
+    assert breaker.allow() is False
+    assert wait_for(lambda: breaker.state == 'closed')
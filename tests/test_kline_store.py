@@ -0,0 +1,75 @@
+import threading
+import time
+
+import pytest
+
+KLINE_STORE = (
+    'get_process_resources', 'PROCESS_RESOURCES', 'process_resource',
+    'SingleFlight', 'get_single_flight', 'single_flight',
+    'DATA_DIR', 'KLINE_DB_PATH', 'INTERVAL_MS', 'KLINE_FETCH_WORKERS', 'KLINE_COLUMNS',
+    'decode_klines', 'kline_frame', 'init_kline_store', 'kline_store_connect', 'kline_store_upsert',
+    'kline_store_coverage', 'kline_store_read', 'fetch_klines_range', 'fetch_latest_klines', 'load_klines',
+)
+
+HOUR_MS = 3_600_000
+
+
+class FakeClient:
+    """Hourly candles since `listed_ms`; the first request starting before `fail_before_ms` raises"""
+
+    def __init__(self, listed_ms, fail_before_ms=None):
+        self.listed_ms = listed_ms
+        self.fail_before_ms = fail_before_ms
+        self.lock = threading.Lock()
+
+    def get_klines(self, symbol, interval, limit=500, startTime=None, endTime=None):
+        with self.lock:
+            if self.fail_before_ms is not None and startTime is not None and startTime < self.fail_before_ms:
+                self.fail_before_ms = None
+                raise ConnectionError("window failed")
+
+        now_ms = int(time.time() * 1000)
+        end = min(endTime if endTime is not None else now_ms, now_ms)
+        first = max(self.listed_ms, -(-(startTime or 0) // HOUR_MS) * HOUR_MS)
+        opens = list(range(first, end + 1, HOUR_MS))
+        opens = opens[:limit] if startTime is not None else opens[-limit:]
+        return [[t, '1', '2', '0.5', '1.5', '10', t + HOUR_MS - 1] for t in opens]
+
+
+@pytest.fixture
+def app(load_app):
+    app = load_app(*KLINE_STORE)
+    app['binance_call'] = lambda endpoint, func, *args, weight=None, **kwargs: func(*args, **kwargs)
+    return app
+
+
+def history_start(app, symbol, interval):
+    return app['kline_store_coverage'](symbol, interval, 0)[2]
+
+
+def test_short_complete_download_records_listing_date(app):
+    now_ms = int(time.time() * 1000)
+    app['client'] = FakeClient(listed_ms=now_ms - 1500 * HOUR_MS)
+
+    df = app['load_klines']('NEWUSDT', '1h', 2500)
+
+    assert 1400 < len(df) < 2500
+    assert history_start(app, 'NEWUSDT', '1h') == int(df['timestamp'].iloc[0].value // 1_000_000)
+
+
+def test_failed_window_does_not_record_listing_date(app):
+    now_ms = int(time.time() * 1000)
+    # Listed long ago, but the oldest of the three 1000-candle windows fails
+    client = FakeClient(listed_ms=now_ms - 10_000 * HOUR_MS, fail_before_ms=now_ms - 2000 * HOUR_MS)
+    app['client'] = client
+
+    df = app['load_klines']('BTCUSDT', '1h', 2500)
+
+    assert len(df) < 2500
+    assert history_start(app, 'BTCUSDT', '1h') is None
+
+    # The store does not cover the window yet, so the next call downloads it again
+    df = app['load_klines']('BTCUSDT', '1h', 2500)
+
+    assert len(df) == 2500
+    assert history_start(app, 'BTCUSDT', '1h') is None
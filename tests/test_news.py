@@ -0,0 +1,10 @@
+NEWS = ('news_link',)
+
+
+def test_only_http_links_are_kept(load_app):
+    app = load_app(*NEWS)
+    assert app['news_link']('https://example.com/a?b=1') == 'https://example.com/a?b=1'
+    assert app['news_link']('http://example.com') == 'http://example.com'
+    for url in ('javascript:alert(1)', 'data:text/html,<script>', '//example.com', '', None):
+        assert app['news_link'](url) == '#'
+
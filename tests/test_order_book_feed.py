@@ -0,0 +1,47 @@
+import threading
+import time
+import types
+
+ORDER_BOOK_FEED = (
+    'BINANCE_WS_RECONNECT_DELAY', 'LIVE_STREAM_IDLE_AFTER', 'ORDER_BOOK_SNAPSHOT_LIMIT', 'ORDER_BOOK_MAX_LEVELS',
+    'ORDER_BOOK_BUFFER', 'ORDER_BOOK_SYNC_DELAY', 'ORDER_BOOK_STALE_AFTER', 'ORDER_BOOK_RESYNC_MAX_DELAY',
+    'order_book_weight', 'merge_book_side', 'LocalOrderBook', 'StreamFeed', 'OrderBookFeed',
+)
+
+
+class FakeHub:
+    def subscribe(self, stream, handler):
+        pass
+
+    def unsubscribe(self, stream, handler):
+        pass
+
+
+def test_failed_snapshots_back_off_until_released(load_app):
+    app = load_app(*ORDER_BOOK_FEED)
+    feed = app['OrderBookFeed'](FakeHub())
+    retry_delays = []
+    done = threading.Event()
+
+    def sleep(seconds):
+        if seconds == app['ORDER_BOOK_SYNC_DELAY']:
+            return
+        retry_delays.append(seconds)
+        if len(retry_delays) == 8:
+            with feed._lock:
+                feed._books.pop('BTCUSDT')  # Nobody watches it any more
+            done.set()
+
+    def binance_call(*args, **kwargs):
+        raise ConnectionError("depth unavailable")
+
+    app['time'] = types.SimpleNamespace(sleep=sleep, monotonic=time.monotonic)
+    app['binance_call'] = binance_call
+    app['client'] = types.SimpleNamespace(get_order_book=None)
+
+    feed.watch('BTCUSDT')
+    assert done.wait(timeout=5)
+    time.sleep(0.1)
+
+    assert retry_delays == [5, 10, 20, 40, 80, 160, 300, 300]
+    assert not feed._syncing
@@ -0,0 +1,30 @@
+import threading
+import time
+
+SINGLE_FLIGHT = ('get_process_resources', 'PROCESS_RESOURCES', 'process_resource',
+                 'SingleFlight', 'get_single_flight', 'single_flight')
+
+
+def test_worker_threads_share_one_call(load_app):
+    app = load_app(*SINGLE_FLIGHT)
+    release = threading.Event()
+    calls = []
+
+    @app['single_flight']
+    def load(symbol):
+        calls.append(symbol)
+        release.wait(timeout=5)
+        return symbol.lower()
+
+    # Plain threads, like the fetch pools - no script run context attached
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(load('BTCUSDT'))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.2)  # Let every thread reach the in-flight call
+    release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert calls == ['BTCUSDT']
+    assert results == ['btcusdt'] * 8
@@ -0,0 +1,44 @@
+import time
+
+SWR_CACHE = ('get_process_resources', 'PROCESS_RESOURCES', 'process_resource', 'SWR_REFRESH_WORKERS',
+             'StaleWhileRevalidateCache', 'get_swr_cache', 'swr_cache')
+
+
+def test_stale_value_is_served_while_refreshing(load_app):
+    app = load_app(*SWR_CACHE)
+    calls = []
+    ttls = {'fast': 0.05, 'slow': 60}
+
+    @app['swr_cache'](ttl=lambda key: ttls[key], max_stale=60)
+    def fetch(key):
+        calls.append(key)
+        return f"{key}-{len(calls)}"
+
+    assert fetch('fast') == 'fast-1'
+    assert fetch('slow') == 'slow-2'
+    time.sleep(0.1)
+
+    # Only the entry with the short ttl went stale: served as-is, refreshed in the background
+    assert fetch('slow') == 'slow-2'
+    assert fetch('fast') == 'fast-1'
+    deadline = time.monotonic() + 5
+    value = fetch('fast')
+    while value == 'fast-1' and time.monotonic() < deadline:
+        time.sleep(0.01)
+        value = fetch('fast')
+    assert value == 'fast-3'
+    assert calls[:3] == ['fast', 'slow', 'fast']
+
+
+def test_clear_drops_entries(load_app):
+    app = load_app(*SWR_CACHE)
+    calls = []
+
+    @app['swr_cache'](ttl=60, max_stale=60)
+    def fetch(key):
+        calls.append(key)
+        return len(calls)
+
+    assert fetch('a') == 1
+    fetch.clear('a')
+    assert fetch('a') == 2
@@ -0,0 +1,58 @@
+import hashlib
+import io
+
+import requests
+import urllib3
+from PIL import Image
+
+THUMBNAIL_CACHE = ('DATA_DIR', 'THUMBNAIL_DIR', 'THUMBNAIL_SIZE', 'THUMBNAIL_MAX_SOURCE_BYTES',
+                   'THUMBNAIL_CACHE_MAX_BYTES', 'THUMBNAIL_WORKERS', 'THUMBNAIL_MAX_FAILED', 'THUMBNAIL_FORMAT',
+                   'THUMBNAIL_QUALITY', 'make_thumbnail', 'ThumbnailCache')
+
+
+class ImageSession:
+    """Serves the same image bytes for every URL"""
+
+    def __init__(self, content):
+        self.content = content
+
+    def get(self, url, **kwargs):
+        response = requests.models.Response()
+        response.status_code = 200
+        response.raw = urllib3.HTTPResponse(io.BytesIO(self.content), preload_content=False)
+        return response
+
+
+class UnreachableSession:
+    def get(self, url, **kwargs):
+        raise ConnectionError(f"{url} unreachable")
+
+
+def test_generated_thumbnails_are_jpeg(load_app, tmp_path):
+    app = load_app(*THUMBNAIL_CACHE)
+    source = io.BytesIO()
+    Image.new('RGBA', (1200, 600), (255, 0, 0, 128)).save(source, 'PNG')
+    url = 'https://example.com/a.png'
+    app['get_http_session'] = lambda: ImageSession(source.getvalue())
+    cache = app['ThumbnailCache'](str(tmp_path), max_bytes=1024 * 1024)
+
+    assert cache.read(url) is None
+    cache._generate(url, hashlib.sha1(url.encode()).hexdigest())
+
+    # st.image passes JPEG bytes through unchanged, anything else is re-encoded per rerun
+    with Image.open(io.BytesIO(cache.read(url))) as thumbnail:
+        assert thumbnail.format == 'JPEG'
+        assert thumbnail.size == app['THUMBNAIL_SIZE']
+
+
+def test_failed_urls_are_bounded(load_app, tmp_path):
+    app = load_app(*THUMBNAIL_CACHE)
+    app['THUMBNAIL_MAX_FAILED'] = 3
+    app['get_http_session'] = UnreachableSession
+    cache = app['ThumbnailCache'](str(tmp_path), max_bytes=1024)
+
+    urls = [f'https://example.com/{i}.jpg' for i in range(5)]
+    for url in urls:
+        cache._generate(url, hashlib.sha1(url.encode()).hexdigest())
+
+    assert list(cache._failed) == urls[2:]
@@ -0,0 +1,33 @@
+import numpy as np
+
+TRADE_TAPE = ('TRADE_TAPE_SIZE', 'TRADE_DTYPE', 'agg_trade_records', 'TradeTape',
+              'TRADE_MARKER_MIN_SIZE', 'TRADE_MARKER_MAX_SIZE', 'create_recent_trades_chart')
+
+
+def agg_trades(first_id, quantities):
+    return [{'a': first_id + i, 'T': 1_700_000_000_000 + i, 'p': '100', 'q': str(q), 'm': i % 2 == 1}
+            for i, q in enumerate(quantities)]
+
+
+def marker_sizes(fig):
+    sizes = np.concatenate([np.asarray(trace.marker.size, dtype=float) for trace in fig.data])
+    return np.sort(sizes)
+
+
+def test_marker_sizes_follow_the_tape_not_the_view(load_app):
+    app = load_app(*TRADE_TAPE)
+    tape = app['TradeTape'](capacity=100)
+    tape.append(app['agg_trade_records'](agg_trades(0, [50.0] + [1.0] * 59)))
+
+    assert tape.max_qty() == 50.0
+
+    # The big trade scrolled out of the last 10, but 1.0 still draws at the same size
+    view = tape.last(10)
+    sizes = marker_sizes(app['create_recent_trades_chart'](view, size_ref=tape.max_qty()))
+    expected = app['TRADE_MARKER_MIN_SIZE'] + (
+        app['TRADE_MARKER_MAX_SIZE'] - app['TRADE_MARKER_MIN_SIZE']) * np.sqrt(1.0 / 50.0)
+    assert np.allclose(sizes, expected)
+
+    # Without a reference the largest trade shown gets the full size
+    sizes = marker_sizes(app['create_recent_trades_chart'](view))
+    assert np.allclose(sizes, app['TRADE_MARKER_MAX_SIZE'])
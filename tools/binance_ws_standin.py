@@ -0,0 +1,120 @@
+"""
+Local stand-in for the Binance combined WebSocket stream endpoint.
+
+Accepts SUBSCRIBE/UNSUBSCRIBE requests like wss://stream.binance.com:9443/stream and
+pushes synthetic <symbol>@kline_<interval> events (random walk, candles closing on
+interval boundaries), so the live kline feed can be exercised without Binance (the
+stream hub tests run it in-process):
+
+    pip install websockets
+    python tools/binance_ws_standin.py --port 8765
+    BINANCE_WS_URL=ws://localhost:8765/stream streamlit run app.py
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import websockets
+
+INTERVAL_MS = {
+    '1m': 60_000, '3m': 3 * 60_000, '5m': 5 * 60_000, '15m': 15 * 60_000, '30m': 30 * 60_000,
+    '1h': 3_600_000, '2h': 2 * 3_600_000, '4h': 4 * 3_600_000, '6h': 6 * 3_600_000,
+    '8h': 8 * 3_600_000, '12h': 12 * 3_600_000, '1d': 86_400_000, '3d': 3 * 86_400_000,
+    '1w': 7 * 86_400_000,
+}
+WEEK_ORIGIN_MS = 4 * 86_400_000  # Binance weeks open on Monday 00:00 UTC
+
+
+class KlineSimulator:
+    """Random-walk candle for one symbol/interval stream"""
+
+    def __init__(self, symbol, interval, price):
+        self.symbol = symbol.upper()
+        self.interval = interval
+        self.price = price
+        self.candle = None
+
+    def _open_time(self, now_ms):
+        interval_ms = INTERVAL_MS[self.interval]
+        origin = WEEK_ORIGIN_MS if self.interval == '1w' else 0
+        return (now_ms - origin) // interval_ms * interval_ms + origin
+
+    def tick(self, now_ms):
+        """Return the kline events for this tick (a closing event first on a boundary)"""
+        events = []
+        open_time = self._open_time(now_ms)
+
+        if self.candle is not None and self.candle['t'] != open_time:
+            self.candle['x'] = True
+            events.append(self._event(now_ms))
+            self.candle = None
+
+        self.price *= 1 + random.gauss(0, 0.0005)
+        if self.candle is None:
+            self.candle = {
+                't': open_time, 'T': open_time + INTERVAL_MS[self.interval] - 1,
+                's': self.symbol, 'i': self.interval,
+                'o': self.price, 'h': self.price, 'l': self.price, 'c': self.price,
+                'v': 0.0, 'x': False,
+            }
+        self.candle['h'] = max(self.candle['h'], self.price)
+        self.candle['l'] = min(self.candle['l'], self.price)
+        self.candle['c'] = self.price
+        self.candle['v'] += random.uniform(0, 5)
+        events.append(self._event(now_ms))
+        return events
+
+    def _event(self, now_ms):
+        k = dict(self.candle)
+        for field in ('o', 'h', 'l', 'c', 'v'):
+            k[field] = f"{k[field]:.8f}"  # Binance sends prices and volumes as strings
+        return {'e': 'kline', 'E': now_ms, 's': self.symbol, 'k': k}
+
+
+async def serve_client(websocket, tick_seconds, start_price):
+    streams = {}
+
+    async def pump():
+        while True:
+            now_ms = int(time.time() * 1000)
+            for stream, sim in list(streams.items()):
+                for event in sim.tick(now_ms):
+                    await websocket.send(json.dumps({'stream': stream, 'data': event}))
+            await asyncio.sleep(tick_seconds)
+
+    pump_task = asyncio.create_task(pump())
+    try:
+        async for message in websocket:
+            request = json.loads(message)
+            for stream in request.get('params', []):
+                if request.get('method') == 'UNSUBSCRIBE':
+                    streams.pop(stream, None)
+                    continue
+                symbol, _, interval = stream.partition('@kline_')
+                if interval in INTERVAL_MS and stream not in streams:
+                    streams[stream] = KlineSimulator(symbol, interval, start_price)
+            await websocket.send(json.dumps({'result': None, 'id': request.get('id')}))
+    except websockets.ConnectionClosed:
+        pass
+    finally:
+        pump_task.cancel()
+
+
+async def main(args):
+    async def handler(websocket, *_):
+        await serve_client(websocket, args.tick, args.price)
+
+    async with websockets.serve(handler, args.host, args.port):
+        print(f"Binance WS stand-in listening on ws://{args.host}:{args.port}/stream")
+        await asyncio.Future()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--tick', type=float, default=0.5, help='Seconds between kline updates')
+    parser.add_argument('--price', type=float, default=100.0, help='Start price of every stream')
+    asyncio.run(main(parser.parse_args()))